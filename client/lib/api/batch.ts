@@ -0,0 +1,22 @@
+import apiClient from "./client";
+import { BatchOperation, BatchResponse } from "@/types/batch";
+import { logger } from "@/lib/utils";
+
+/**
+ * Run several campaign/payout operations in one request
+ * @param operations - Operations, run in order
+ * @param atomic - Roll everything back if one operation fails
+ * @returns Promise<BatchResponse> - One result per operation that ran
+ */
+export const runBatch = async (
+    operations: BatchOperation[],
+    atomic = false
+): Promise<BatchResponse> => {
+    try {
+        const response = await apiClient.post('/batch/', { operations, atomic });
+        return response.data;
+    } catch (error) {
+        logger.error('Failed to run batch:', error);
+        throw error;
+    }
+};
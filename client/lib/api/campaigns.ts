@@ -1,15 +1,38 @@
 import apiClient from "./client";
-import { Campaign, CampaignSearchFilters } from "@/types/campaign";
+import {
+    Campaign,
+    CampaignChanges,
+    CampaignPayout,
+    CampaignEvent,
+    CampaignPage,
+    CampaignSearchFilters,
+} from "@/types/campaign";
+import { BulkDeleteResult, Job } from "@/types/job";
 import { logger } from "@/lib/utils";
 
+/**
+ * Headers making a POST safe to retry
+ * @param idempotencyKey - Same value for every retry of one user action
+ */
+const idempotencyHeaders = (idempotencyKey?: string) =>
+    idempotencyKey ? { headers: { 'Idempotency-Key': idempotencyKey } } : undefined;
+
 /**
  * Create a new campaign
  * @param campaign - Partial campaign data
+ * @param idempotencyKey - Optional key; retries with it return the first result
  * @returns Promise<Campaign> - Created campaign
  */
-export const createCampaign = async (campaign: Partial<Campaign>): Promise<Campaign> => {
+export const createCampaign = async (
+    campaign: Partial<Campaign>,
+    idempotencyKey?: string
+): Promise<Campaign> => {
     try {
-        const response = await apiClient.post('/campaigns/', campaign);
+        const response = await apiClient.post(
+            '/campaigns/',
+            campaign,
+            idempotencyHeaders(idempotencyKey)
+        );
         return response.data;
     } catch (error) {
         logger.error('Failed to create campaign:', error);
@@ -32,9 +55,10 @@ export const getCampaigns = async (filters?: CampaignSearchFilters): Promise<Cam
             params.append('is_running', filters.is_running.toString());
         }
         if (filters?.search) params.append('search', filters.search);
+        // Streamed by the server in chunks; the JSON is the same
+        params.append('stream', 'true');
 
-        const queryString = params.toString();
-        const url = queryString ? `/campaigns?${queryString}` : '/campaigns';
+        const url = `/campaigns?${params.toString()}`;
 
         const response = await apiClient.get(url);
         return response.data;
@@ -44,6 +68,70 @@ export const getCampaigns = async (filters?: CampaignSearchFilters): Promise<Cam
     }
 };
 
+/**
+ * Get one page of campaigns with optional filters
+ * @param page - 1-based page number
+ * @param pageSize - Campaigns per page (max 500)
+ * @param filters - Optional search filters
+ * @returns Promise<CampaignPage> - Campaigns of the page and the (possibly estimated) total
+ */
+export const getCampaignsPage = async (
+    page: number,
+    pageSize: number,
+    filters?: CampaignSearchFilters
+): Promise<CampaignPage> => {
+    try {
+        const params: Record<string, string | number> = { page, page_size: pageSize };
+        if (filters?.title) params.title = filters.title;
+        if (filters?.landing_page_url) params.landing_page_url = filters.landing_page_url;
+        if (filters?.is_running !== null && filters?.is_running !== undefined) {
+            params.is_running = filters.is_running.toString();
+        }
+        if (filters?.search) params.search = filters.search;
+
+        const response = await apiClient.get('/campaigns/', { params });
+        return response.data;
+    } catch (error) {
+        logger.error('Failed to fetch campaigns page:', error);
+        throw error;
+    }
+};
+
+/**
+ * Get campaigns changed or deleted since a sync cursor
+ * @param since - Cursor from the previous call; omit for a full sync
+ * @returns Promise<CampaignChanges> - Changes, next cursor and has_more flag
+ */
+export const getCampaignChanges = async (since?: string): Promise<CampaignChanges> => {
+    try {
+        const response = await apiClient.get('/campaigns/changes/', {
+            params: since ? { since } : undefined,
+        });
+        return response.data;
+    } catch (error) {
+        logger.error('Failed to fetch campaign changes:', error);
+        throw error;
+    }
+};
+
+/**
+ * Subscribe to the account's campaign change notifications (Server-Sent Events)
+ * @param onEvent - Called with each event, e.g. { action: "campaign.updated", campaign_id: 1 }
+ * @returns Function closing the stream
+ */
+export const subscribeToCampaignEvents = (
+    onEvent: (event: CampaignEvent) => void
+): (() => void) => {
+    const baseURL = apiClient.defaults.baseURL;
+    const token = localStorage.getItem("access_token") ?? "";
+    const source = new EventSource(
+        `${baseURL}/campaigns/events/?token=${encodeURIComponent(token)}`
+    );
+    source.onmessage = (message) => onEvent(JSON.parse(message.data));
+    source.onerror = (error) => logger.error('Campaign event stream error:', error);
+    return () => source.close();
+};
+
 /**
  * Search campaigns (alias for getCampaigns for backward compatibility)
  * @param filters - Optional search filters
@@ -53,6 +141,25 @@ export const searchCampaigns = async (filters?: CampaignSearchFilters): Promise<
     return getCampaigns(filters);
 };
 
+/**
+ * Get the payouts of several campaigns in one request
+ * @param campaignIds - Campaign IDs (at most 100)
+ * @returns Promise<Record<string, CampaignPayout[]>> - Payouts keyed by campaign ID
+ */
+export const getPayoutsForCampaigns = async (
+    campaignIds: number[]
+): Promise<Record<string, CampaignPayout[]>> => {
+    try {
+        const response = await apiClient.get('/payouts/', {
+            params: { campaign__in: campaignIds.join(',') },
+        });
+        return response.data;
+    } catch (error) {
+        logger.error('Failed to fetch payouts:', error);
+        throw error;
+    }
+};
+
 /**
  * Get a campaign by ID
  * @param id - Campaign ID
@@ -114,6 +221,52 @@ export const deleteCampaign = async (id: number): Promise<void> => {
     }
 };
 
+/**
+ * Delete several campaigns at once
+ * @param ids - Campaign IDs
+ * @param idempotencyKey - Optional key; retries with it return the first result
+ * @returns Promise<number> - Number of deleted campaigns
+ */
+export const bulkDeleteCampaigns = async (
+    ids: number[],
+    idempotencyKey?: string
+): Promise<number> => {
+    try {
+        const response = await apiClient.post(
+            '/campaigns/bulk-delete/',
+            { ids },
+            idempotencyHeaders(idempotencyKey)
+        );
+        return response.data.deleted;
+    } catch (error) {
+        logger.error('Failed to delete campaigns:', error);
+        throw error;
+    }
+};
+
+/**
+ * Queue the deletion of several campaigns as a background job
+ * @param ids - Campaign IDs
+ * @param idempotencyKey - Optional key; retries with it return the same job
+ * @returns Promise<Job> - The queued job; poll it with getJob
+ */
+export const bulkDeleteCampaignsInBackground = async (
+    ids: number[],
+    idempotencyKey?: string
+): Promise<Job<BulkDeleteResult>> => {
+    try {
+        const response = await apiClient.post(
+            '/campaigns/bulk-delete/',
+            { ids, background: true },
+            idempotencyHeaders(idempotencyKey)
+        );
+        return response.data;
+    } catch (error) {
+        logger.error('Failed to queue campaign deletion:', error);
+        throw error;
+    }
+};
+
 /**
  * Toggle campaign running status
  * @param id - Campaign ID
@@ -0,0 +1,18 @@
+import apiClient from "./client";
+import { Job } from "@/types/job";
+import { logger } from "@/lib/utils";
+
+/**
+ * Get a background job's status, progress and result
+ * @param id - Job ID
+ * @returns Promise<Job> - The job
+ */
+export const getJob = async <Result = unknown>(id: number): Promise<Job<Result>> => {
+    try {
+        const response = await apiClient.get(`/jobs/${id}/`);
+        return response.data;
+    } catch (error) {
+        logger.error(`Failed to fetch job ${id}:`, error);
+        throw error;
+    }
+};
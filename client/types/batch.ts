@@ -0,0 +1,19 @@
+/**
+ * Batch API types
+ */
+
+export interface BatchOperation {
+    method: 'GET' | 'POST' | 'PUT' | 'PATCH' | 'DELETE';
+    path: string; // e.g. /api/campaigns/; "$0.id" refers to the first result's id
+    body?: unknown;
+}
+
+export interface BatchResult {
+    status: number;
+    body: unknown;
+}
+
+export interface BatchResponse {
+    results: BatchResult[];
+    rolled_back?: boolean;
+}
@@ -7,6 +7,12 @@ export interface Campaign {
     title: string;
     landing_page_url: string;
     is_running: boolean;
+    // Scheduled start/stop; each is cleared once the scheduler applies it
+    start_at?: Date | null;
+    end_at?: Date | null;
+    // Last landing page check; null until the checker has seen the page
+    landing_page_ok?: boolean | null;
+    landing_page_checked_at?: Date | null;
     payouts: CampaignPayout[];
     created_at: Date;
     updated_at: Date;
@@ -22,6 +28,29 @@ export interface CampaignPayout {
     updated_at: Date;
 }
 
+export interface CampaignChanges {
+    campaigns: Campaign[];
+    deleted: { id: number; deleted_at: Date }[];
+    cursor: string;
+    has_more: boolean;
+}
+
+export interface CampaignPage {
+    // Estimated above the server's threshold when count_is_approximate
+    count: number;
+    count_is_approximate: boolean;
+    next: string | null;
+    previous: string | null;
+    results: Campaign[];
+}
+
+export interface CampaignEvent {
+    // e.g. campaign.updated, payout.deleted; "resync" when events were missed
+    action: string;
+    campaign_id?: number;
+    payout_id?: number | null;
+}
+
 export interface CampaignSearchFilters {
     title?: string;
     landing_page_url?: string;
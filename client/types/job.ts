@@ -0,0 +1,26 @@
+/**
+ * Background job types
+ */
+
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface Job<Result = unknown> {
+    id: number;
+    url: string; // Poll this for status and progress
+    kind: string;
+    status: JobStatus;
+    progress: number;
+    total: number | null;
+    attempts: number;
+    max_attempts: number;
+    result: Result | null;
+    error: string;
+    created_at: string;
+    started_at: string | null;
+    finished_at: string | null;
+}
+
+export interface BulkDeleteResult {
+    deleted: number;
+    payouts_deleted: number;
+}
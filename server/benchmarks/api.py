@@ -0,0 +1,237 @@
+"""
+Latency/throughput benchmark for the REST API.
+
+Seeds a throwaway test database with a configurable data volume and drives
+the real URLconf through DRF's test client, so results include routing,
+middleware, authentication, serialization and the database queries.
+
+Usage (from the ``server`` directory):
+
+    python -m benchmarks.api --campaigns 2000 --iterations 200 \\
+        --output bench.json
+    python -m benchmarks.api --output new.json --baseline bench.json
+
+The configured database engine is used (``DB_ENGINE``); a test database is
+created and destroyed around the run, so real data is never touched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .common import (
+    ScenarioResult,
+    django_setup,
+    print_results,
+    report_comparison,
+    report_errors,
+    write_results,
+)
+
+PASSWORD = "Password123!"
+COUNTRIES = ["US", "CA", "GB", "DE", "FR", "FI", "SE", "ES", "IT", "NL"]
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def seed(accounts: int, campaigns: int, payouts: int) -> Any:
+    """
+    Create benchmark data and return the account the API is driven as.
+
+    The benchmark account owns ``campaigns`` campaigns; every other account
+    owns the same number so that per-account filtering is exercised against
+    a realistically shared table.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    from accounts.models import Account
+    from campaigns.models import Campaign, CampaignPayout
+
+    password_hash = make_password(PASSWORD)
+    users = Account.objects.bulk_create(
+        Account(
+            username=f"bench{i}@example.com",
+            email=f"bench{i}@example.com",
+            password=password_hash,
+        )
+        for i in range(accounts)
+    )
+    rng = random.Random(42)
+    for user in users:
+        created = Campaign.objects.bulk_create(
+            (
+                Campaign(
+                    account=user,
+                    title=f"Campaign {i}",
+                    landing_page_url=f"https://example.com/landing/{i}",
+                    is_running=rng.random() < 0.6,
+                )
+                for i in range(campaigns)
+            ),
+            batch_size=1000,
+        )
+        CampaignPayout.objects.bulk_create(
+            (
+                CampaignPayout(
+                    campaign=campaign,
+                    country=country,
+                    amount=rng.randint(100, 10000) / 100,
+                    currency=rng.choice(["EUR", "USD"]),
+                )
+                for campaign in created
+                for country in rng.sample(COUNTRIES, payouts)
+            ),
+            batch_size=1000,
+        )
+    return users[0]
+
+
+def build_scenarios(user: Any) -> Dict[str, Callable[[int], Request]]:
+    """Map scenario names to functions producing the i-th request."""
+    from campaigns.models import Campaign
+
+    campaign_ids = list(
+        Campaign.objects.filter(account=user).values_list("id", flat=True)[:100]
+    )
+    update_id = campaign_ids[0]
+    payout_campaign = campaign_ids[-1]
+
+    def campaign_body(title: str) -> Dict[str, Any]:
+        return {
+            "title": title,
+            "landing_page_url": "https://example.com/bench",
+            "is_running": True,
+            "payouts": [
+                {"country": "US", "amount": 10.5, "currency": "USD"},
+                {"country": "FI", "amount": 9.25, "currency": "EUR"},
+            ],
+        }
+
+    return {
+        "campaigns_list": lambda i: ("get", "/api/campaigns/", None),
+        "campaigns_search": lambda i: (
+            "get",
+            f"/api/campaigns/?search=Campaign%20{i % 50}&is_running=true",
+            None,
+        ),
+        "campaigns_create": lambda i: (
+            "post",
+            "/api/campaigns/",
+            campaign_body(f"Bench created {i}"),
+        ),
+        "campaigns_update": lambda i: (
+            "put",
+            f"/api/campaigns/{update_id}/",
+            campaign_body(f"Bench updated {i}"),
+        ),
+        "payouts_list": lambda i: (
+            "get",
+            f"/api/payouts/?campaign={payout_campaign}",
+            None,
+        ),
+        "signin": lambda i: (
+            "post",
+            "/api/signin/",
+            {"email": user.email, "password": PASSWORD},
+        ),
+        "profile": lambda i: ("get", "/api/profile/", None),
+    }
+
+
+def run_scenario(
+    client: Any, name: str, make_request: Callable[[int], Request], args: Any
+) -> ScenarioResult:
+    """Issue warmup plus measured requests for one scenario."""
+    for i in range(args.warmup):
+        method, path, body = make_request(-1 - i)
+        getattr(client, method)(path, body, format="json")
+
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for i in range(args.iterations):
+        method, path, body = make_request(i)
+        t0 = time.perf_counter()
+        response = getattr(client, method)(path, body, format="json")
+        latencies.append(time.perf_counter() - t0)
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - started
+    return ScenarioResult.from_samples(name, latencies, elapsed, errors=errors)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--accounts", type=int, default=5)
+    parser.add_argument(
+        "--campaigns", type=int, default=500, help="Campaigns per account"
+    )
+    parser.add_argument(
+        "--payouts", type=int, default=3, help="Payouts per campaign (max 10)"
+    )
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        help="Run only the named scenario (repeatable)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench-api.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier result file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Relative slowdown tolerated before flagging a regression",
+    )
+    args = parser.parse_args(argv)
+
+    django_setup()
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    logging.disable(logging.INFO)
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    # Throttling would cap the run at 1000 requests per hour per user
+    no_cache = override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    no_cache.enable()
+    try:
+        user = seed(args.accounts, args.campaigns, min(args.payouts, 10))
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        scenarios = build_scenarios(user)
+        selected = args.scenarios or list(scenarios)
+        results = [run_scenario(client, n, scenarios[n], args) for n in selected]
+        vendor = connection.vendor
+    finally:
+        no_cache.disable()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    print_results(results)
+    params = {**vars(args), "output": str(args.output), "db_vendor": vendor}
+    params["baseline"] = str(args.baseline) if args.baseline else None
+    payload = write_results(args.output, "api", params, results)
+    print(f"\nResults written to {args.output}")
+    # Timings of failed requests are no measurement: fail the run too
+    regressed = report_comparison(payload, args.baseline, args.tolerance)
+    return report_errors(results) or regressed
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Provides latency summaries, peak RSS sampling and the JSON result format
+with its compare-to-baseline mode, so every benchmark in this package
+produces results that can be tracked over time in the same way.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import resource
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Metrics where a higher value is better; everything else is a latency
+HIGHER_IS_BETTER = {"rps"}
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps")
+
+
+def django_setup() -> None:
+    """Configure Django for a standalone benchmark process."""
+    import os
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+    django.setup()
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of samples using linear interpolation.
+
+    Args:
+        samples: Measured values (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The interpolated percentile, or 0.0 for an empty sample set
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+@dataclass
+class ScenarioResult:
+    """Summary of one benchmark scenario."""
+
+    name: str
+    requests: int
+    errors: int
+    elapsed_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    rps: float
+    peak_rss_mb: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_samples(
+        cls,
+        name: str,
+        latencies_s: List[float],
+        elapsed_s: float,
+        errors: int = 0,
+        **extra: Any,
+    ) -> "ScenarioResult":
+        """Build a result from per-operation latencies in seconds."""
+        latencies_ms = [sample * 1000 for sample in latencies_s]
+        count = len(latencies_ms)
+        return cls(
+            name=name,
+            requests=count,
+            errors=errors,
+            elapsed_s=round(elapsed_s, 4),
+            p50_ms=round(percentile(latencies_ms, 50), 3),
+            p95_ms=round(percentile(latencies_ms, 95), 3),
+            p99_ms=round(percentile(latencies_ms, 99), 3),
+            mean_ms=round(sum(latencies_ms) / count, 3) if count else 0.0,
+            rps=round(count / elapsed_s, 2) if elapsed_s else 0.0,
+            peak_rss_mb=round(peak_rss_mb(), 2),
+            extra=extra,
+        )
+
+
+def environment_metadata() -> Dict[str, Any]:
+    """Describe the machine and code revision the results came from."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False,
+        ).stdout.strip()
+    except OSError:
+        revision = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git_revision": revision or None,
+    }
+
+
+def write_results(
+    path: Path, benchmark: str, params: Dict[str, Any], results: List[ScenarioResult]
+) -> Dict[str, Any]:
+    """Write benchmark results to a JSON file and return the payload."""
+    payload = {
+        "benchmark": benchmark,
+        "meta": environment_metadata(),
+        "params": params,
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    return payload
+
+
+def compare_results(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare two result payloads scenario by scenario.
+
+    Args:
+        current: Payload produced by write_results for this run
+        baseline: Payload from an earlier run
+        tolerance: Allowed relative slowdown before flagging, e.g. 0.1 for 10%
+
+    Returns:
+        One row per scenario/metric with the relative change and a
+        regression flag
+    """
+    rows = []
+    for name, scenario in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), scenario.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append(
+                {
+                    "scenario": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change_pct": round(change * 100, 2),
+                    "regression": worse > tolerance,
+                }
+            )
+    return rows
+
+
+def print_results(results: List[ScenarioResult]) -> None:
+    """Print a fixed-width table of scenario results."""
+    header = (
+        f"{'scenario':<28}{'reqs':>7}{'err':>5}{'p50 ms':>10}"
+        f"{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'rss MiB':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.name:<28}{r.requests:>7}{r.errors:>5}{r.p50_ms:>10.2f}"
+            f"{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{r.rps:>10.1f}{r.peak_rss_mb:>10.1f}"
+        )
+
+
+def report_errors(results: List[ScenarioResult]) -> int:
+    """
+    Print the scenarios whose requests failed.
+
+    Returns:
+        Process exit code: 1 if any scenario had errors
+    """
+    failed = [r for r in results if r.errors]
+    for r in failed:
+        print(f"\n{r.name}: {r.errors} of {r.requests} requests failed")
+    return 1 if failed else 0
+
+
+def report_comparison(
+    current: Dict[str, Any], baseline_path: Optional[Path], tolerance: float
+) -> int:
+    """
+    Print the comparison against a baseline file.
+
+    Returns:
+        Process exit code: 1 if any metric regressed beyond tolerance
+    """
+    if baseline_path is None:
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    rows = compare_results(current, baseline, tolerance)
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\nCompared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"  {row['scenario']:<28}{row['metric']:<8}"
+            f"{row['baseline']:>10}{row['current']:>10}"
+            f"{row['change_pct']:>+9.1f}%  {flag}"
+        )
+    return 1 if regressions else 0
@@ -0,0 +1,136 @@
+"""
+Rendering benchmark for large campaign list responses.
+
+Serializes an in-memory list of campaigns with their payouts through
+``CampaignListSerializer`` once, then measures how long each renderer
+takes to turn that payload into bytes: DRF's stdlib ``JSONRenderer``,
+``ORJSONRenderer`` and ``MessagePackRenderer``. No database is needed.
+The orjson output is checked to be byte-identical to DRF's first.
+
+Usage (from the ``server`` directory):
+
+    python -m benchmarks.renderers --campaigns 5000 --output bench-render.json
+    python -m benchmarks.renderers --output new.json --baseline bench-render.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, List, Optional
+
+from .common import (
+    ScenarioResult,
+    django_setup,
+    print_results,
+    report_comparison,
+    write_results,
+)
+
+COUNTRIES = ["US", "CA", "GB", "DE", "FR", "FI", "SE", "ES", "IT", "NL"]
+
+
+def build_payload(campaigns: int, payouts: int) -> Any:
+    """Serialized campaign list as the list endpoint would render it."""
+    from django.utils import timezone
+
+    from campaigns.models import Campaign, CampaignPayout
+    from campaigns.serializers import CampaignListSerializer
+
+    now = timezone.now()
+    objects = []
+    for i in range(campaigns):
+        campaign = Campaign(
+            id=i + 1,
+            account_id=1,
+            title=f"Campaign {i} – ünïcode",
+            landing_page_url=f"https://example.com/landing/{i}",
+            is_running=i % 3 != 0,
+            created_at=now,
+            updated_at=now,
+        )
+        # Stands in for prefetch_related("payouts")
+        campaign._prefetched_objects_cache = {
+            "payouts": [
+                CampaignPayout(
+                    id=i * payouts + j + 1,
+                    campaign_id=campaign.id,
+                    country=COUNTRIES[j % len(COUNTRIES)],
+                    amount=Decimal(f"{(i * 7 + j) % 10000}.{j:02d}"),
+                    currency="EUR" if j % 2 else "USD",
+                    created_at=now,
+                    updated_at=now,
+                )
+                for j in range(payouts)
+            ]
+        }
+        objects.append(campaign)
+    return CampaignListSerializer(objects, many=True).data
+
+
+def run_scenario(name: str, renderer: Any, payload: Any, args: Any) -> ScenarioResult:
+    for _ in range(args.warmup):
+        renderer.render(payload)
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        t0 = time.perf_counter()
+        content = renderer.render(payload)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return ScenarioResult.from_samples(
+        name, latencies, elapsed, response_bytes=len(content)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument(
+        "--payouts", type=int, default=3, help="Payouts per campaign (max 10)"
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=Path("bench-render.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier result file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Relative slowdown tolerated before flagging a regression",
+    )
+    args = parser.parse_args(argv)
+
+    django_setup()
+    from rest_framework.renderers import JSONRenderer
+
+    from server.renderers import MessagePackRenderer, ORJSONRenderer
+
+    payload = build_payload(args.campaigns, min(args.payouts, 10))
+    if ORJSONRenderer().render(payload) != JSONRenderer().render(payload):
+        print("ORJSONRenderer output differs from JSONRenderer", file=sys.stderr)
+        return 1
+
+    renderers = {
+        "render_json_stdlib": JSONRenderer(),
+        "render_json_orjson": ORJSONRenderer(),
+        "render_msgpack": MessagePackRenderer(),
+    }
+    results = [
+        run_scenario(name, renderer, payload, args)
+        for name, renderer in renderers.items()
+    ]
+
+    print_results(results)
+    params = {**vars(args), "output": str(args.output)}
+    params["baseline"] = str(args.baseline) if args.baseline else None
+    payload = write_results(args.output, "renderers", params, results)
+    print(f"\nResults written to {args.output}")
+    return report_comparison(payload, args.baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Concurrent read/write throughput benchmark for the SQLite profiles.
+
+Each profile runs in a fresh process against its own temporary database
+file. Worker threads emulate request handling: every operation is wrapped
+in the request_started/request_finished signals, so connection reuse
+(``CONN_MAX_AGE``) behaves as it does under gunicorn's threaded workers.
+Writes read before they write inside one transaction, the pattern that
+fails with "database is locked" under deferred transactions.
+
+Usage (from the ``server`` directory):
+
+    python -m benchmarks.sqlite_concurrency --threads 16 --ops 200 \\
+        --output bench-sqlite.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .common import ScenarioResult, print_results, report_comparison, write_results
+
+PROFILES = ("basic", "tuned")
+
+
+def run_worker(args: Any) -> Dict[str, Any]:
+    """Benchmark the profile selected through the environment."""
+    from .common import django_setup
+
+    django_setup()
+    from django.core.management import call_command
+    from django.core.signals import request_finished, request_started
+    from django.db import OperationalError, transaction
+
+    from campaigns.models import Campaign, CampaignPayout
+
+    from .api import seed
+
+    call_command("migrate", verbosity=0)
+    seed(accounts=args.accounts, campaigns=args.campaigns, payouts=2)
+    account_ids = list(Campaign.objects.values_list("account_id", flat=True).distinct())
+
+    lock = threading.Lock()
+    samples: Dict[str, List[float]] = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+
+    def read(rng: random.Random) -> None:
+        list(
+            Campaign.objects.filter(account_id=rng.choice(account_ids))
+            .prefetch_related("payouts")
+            .order_by("-created_at")[:50]
+        )
+
+    def write(rng: random.Random, thread: int, index: int) -> None:
+        account_id = rng.choice(account_ids)
+        title = f"Concurrent {thread}-{index}"
+        with transaction.atomic():
+            if Campaign.objects.filter(account_id=account_id, title=title).exists():
+                return
+            campaign = Campaign.objects.create(
+                account_id=account_id,
+                title=title,
+                landing_page_url="https://example.com/bench",
+            )
+            CampaignPayout.objects.bulk_create(
+                [
+                    CampaignPayout(campaign=campaign, country=c, amount=1)
+                    for c in ("US", "FI")
+                ]
+            )
+
+    def worker(thread: int) -> None:
+        rng = random.Random(thread)
+        for index in range(args.ops):
+            kind = "read" if rng.random() < args.read_ratio else "write"
+            request_started.send(sender=None)
+            t0 = time.perf_counter()
+            try:
+                read(rng) if kind == "read" else write(rng, thread, index)
+                failed = False
+            except OperationalError:
+                failed = True
+            elapsed = time.perf_counter() - t0
+            request_finished.send(sender=None)
+            with lock:
+                samples[kind].append(elapsed)
+                errors[kind] += failed
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    results = [
+        ScenarioResult.from_samples(
+            f"{os.environ['SQLITE_PROFILE']}_{kind}",
+            samples[kind],
+            elapsed,
+            errors=errors[kind],
+            threads=args.threads,
+        )
+        for kind in ("read", "write")
+    ]
+    return {"results": [result.__dict__ for result in results]}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200, help="Operations per thread")
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    parser.add_argument("--accounts", type=int, default=8)
+    parser.add_argument(
+        "--campaigns", type=int, default=500, help="Seeded campaigns per account"
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        dest="profiles",
+        choices=PROFILES,
+        help="Profile to run (repeatable, default: all)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench-sqlite.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return 0
+
+    results = []
+    for profile in args.profiles or PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "DB_ENGINE": "sqlite",
+                "SQLITE_PROFILE": profile,
+                "SQLITE_NAME": str(Path(tmp) / "bench.sqlite3"),
+            }
+            forwarded = [a for a in (argv or sys.argv[1:]) if a != "--worker"]
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.sqlite_concurrency", "--worker"]
+                + forwarded,
+                capture_output=True,
+                text=True,
+                env=env,
+                check=False,
+            )
+        if completed.returncode:
+            print(completed.stderr, file=sys.stderr)
+            return completed.returncode
+        payload = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.extend(ScenarioResult(**item) for item in payload["results"])
+
+    print_results(results)
+    params = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("output", "baseline", "worker")
+    }
+    payload = write_results(args.output, "sqlite_concurrency", params, results)
+    print(f"\nResults written to {args.output}")
+    return report_comparison(payload, args.baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
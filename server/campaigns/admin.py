@@ -1,34 +1,222 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.forms.models import InlineForeignKeyField, construct_instance
+from django.utils import timezone
 
+from server.pagination import EstimatedCountPaginator
+
+from .audit import diff, payout_snapshot, record_change
+from .events import publish_change
 from .models import Campaign, CampaignPayout
 
 
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Filter on a foreign key through the admin's autocomplete widget.
+
+    Unlike the default related filter it never lists the related table,
+    only the selected object is loaded.
+    """
+
+    template = "admin/campaigns/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f"{field_path}__{field.target_field.name}__exact"
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(field, model_admin.admin_site),
+            required=False,
+        )
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def rendered_widget(self):
+        value = self.lookup_val[-1] if self.lookup_val else None
+        return self.form_field.widget.render(self.lookup_kwarg, value)
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.lookup_val is None,
+            "query_string": changelist.get_query_string(remove=[self.lookup_kwarg]),
+            "display": "All",
+        }
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables with millions of rows.
+
+    Pages are ordered by primary key, counted with an estimate past
+    ``ESTIMATED_COUNT_THRESHOLD`` rows and never count the whole table
+    or per-filter facets.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    ordering = ("-pk",)
+    list_per_page = 20
+
+    @property
+    def media(self):
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, tuple) and issubclass(
+                list_filter[1], AutocompleteFilter
+            ):
+                field = self.model._meta.get_field(list_filter[0])
+                media += AutocompleteSelect(field, self.admin_site).media
+                media += forms.Media(js=["campaigns/admin/autocomplete_filter.js"])
+        return media
+
+
+class CampaignPayoutInlineForm(forms.ModelForm):
+    class Meta:
+        model = CampaignPayout
+        fields = ("country", "amount", "currency")
+
+    def _post_clean(self):
+        # Field validation only: CampaignPayout.clean() queries the other
+        # payouts for every row, the formset checks all rows at once instead
+        self.instance = construct_instance(self, self.instance, self._meta.fields)
+        exclude = self._get_validation_exclusions()
+        exclude.update(
+            name
+            for name, field in self.fields.items()
+            if isinstance(field, InlineForeignKeyField)
+        )
+        try:
+            self.instance.clean_fields(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+
+
+class CampaignPayoutInlineFormSet(forms.BaseInlineFormSet):
+    """Validate and save a campaign's payouts as one set."""
+
+    def clean(self):
+        super().clean()
+        countries = [
+            form.cleaned_data.get("country")
+            for form in self.forms
+            if form.cleaned_data
+            and form.instance.is_active
+            and not self._should_delete_form(form)
+        ]
+        named = [country for country in countries if country]
+        worldwide = len(countries) - len(named)
+        if worldwide and named:
+            raise ValidationError("Cannot mix worldwide and country-specific payouts")
+        if worldwide > 1 or len(named) != len(set(named)):
+            raise ValidationError("Duplicate country payouts are not allowed")
+
+    def save(self, commit=True):
+        instances = super().save(commit=False)
+        if not commit:
+            return instances
+        using = router.db_for_write(CampaignPayout, instance=self.instance)
+        payouts = CampaignPayout.objects.using(using)
+        now = timezone.now()
+        # (action, payout id, changes) as the payout API records them
+        changes = []
+        # save() would run CampaignPayout.clean() again, row by row
+        if self.deleted_objects:
+            payouts.filter(pk__in=[obj.pk for obj in self.deleted_objects]).delete()
+            changes += [
+                ("payout.deleted", obj.pk, payout_snapshot(obj))
+                for obj in self.deleted_objects
+            ]
+        if self.new_objects:
+            payouts.bulk_create(self.new_objects)
+            changes += [
+                ("payout.created", obj.pk, payout_snapshot(obj))
+                for obj in self.new_objects
+            ]
+        changed = [obj for obj, _ in self.changed_objects]
+        if changed:
+            before = {
+                payout.pk: payout_snapshot(payout)
+                for payout in payouts.filter(pk__in=[obj.pk for obj in changed])
+            }
+            for obj in changed:
+                obj.updated_at = now
+            payouts.bulk_update(
+                changed, ["country", "amount", "currency", "updated_at"]
+            )
+            changes += [
+                ("payout.updated", obj.pk, diff(before[obj.pk], payout_snapshot(obj)))
+                for obj in changed
+            ]
+        if changes:
+            self._record_changes(using, now, changes)
+        return instances
+
+    def _record_changes(self, using, now, changes):
+        # Payout changes reach sync clients through their campaign
+        Campaign.objects.using(using).filter(pk=self.instance.pk).update(updated_at=now)
+        account_id = self.instance.account_id
+        for action, payout_id, payout_changes in changes:
+            record_change(
+                action,
+                account_id=account_id,
+                campaign_id=self.instance.pk,
+                payout_id=payout_id,
+                changes=payout_changes,
+                using=using,
+            )
+            publish_change(
+                action,
+                account_id=account_id,
+                campaign_id=self.instance.pk,
+                payout_id=payout_id,
+                using=using,
+            )
+
+
 class CampaignPayoutInline(admin.TabularInline):
     """Display the campaign payouts in the campaign admin page"""
 
     model = CampaignPayout
+    form = CampaignPayoutInlineForm
+    formset = CampaignPayoutInlineFormSet
     extra = 1
     fk_name = "campaign"
     fields = ("country", "amount", "currency")
-    list_per_page = 20
 
 
 @admin.register(Campaign)
-class CampaignAdmin(admin.ModelAdmin):
+class CampaignAdmin(LargeTableAdmin):
     list_display = (
         "id",
         "account",
         "title",
         "landing_page_url",
         "is_running",
+        "landing_page_ok",
         "created_at",
         "updated_at",
     )
-    list_filter = ("account", "is_running")
+    list_filter = (
+        ("account", AutocompleteFilter),
+        "is_running",
+        "landing_page_ok",
+    )
+    list_select_related = ("account",)
     search_fields = ("title", "landing_page_url")
-    readonly_fields = ("created_at", "updated_at")
+    autocomplete_fields = ("account",)
+    readonly_fields = (
+        "landing_page_ok",
+        "landing_page_checked_at",
+        "created_at",
+        "updated_at",
+    )
     inlines = [CampaignPayoutInline]
-    list_per_page = 20
 
     fieldsets = (
         ("Campaign", {"fields": ("account", "title", "landing_page_url")}),
@@ -46,8 +234,14 @@ class CampaignAdmin(admin.ModelAdmin):
 
 
 @admin.register(CampaignPayout)
-class CampaignPayoutAdmin(admin.ModelAdmin):
-    list_display = ("campaign", "display_country", "amount", "currency")
-    list_filter = ("campaign", "country")
-    search_fields = ("campaign__title", "country__name")
-    list_per_page = 20
+class CampaignPayoutAdmin(LargeTableAdmin):
+    list_display = ("campaign_title", "display_country", "amount", "currency")
+    list_filter = (("campaign", AutocompleteFilter), "country")
+    list_select_related = ("campaign",)
+    search_fields = ("campaign__title", "=country")
+    autocomplete_fields = ("campaign",)
+
+    @admin.display(description="campaign", ordering="campaign__title")
+    def campaign_title(self, obj: CampaignPayout) -> str:
+        # Campaign.__str__ would load the account for every row
+        return obj.campaign.title
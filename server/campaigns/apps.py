@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate, post_save, pre_delete
 
 
 class CampaignsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "campaigns"
+
+    def ready(self):
+        from .sharding import reserve_id_range
+        from .signals import delete_sharded_campaigns, place_new_account
+
+        post_save.connect(place_new_account, sender=settings.AUTH_USER_MODEL)
+        pre_delete.connect(delete_sharded_campaigns, sender=settings.AUTH_USER_MODEL)
+        post_migrate.connect(reserve_id_range, sender=self)
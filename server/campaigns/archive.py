@@ -0,0 +1,168 @@
+"""
+Hot/cold archival of stopped campaigns.
+
+Campaigns that have been stopped and untouched for a while move, with
+their payouts, from the hot tables into ``ArchivedCampaign`` and
+``ArchivedCampaignPayout`` in small transactions, keeping their ids. The
+hot tables, their indexes and the default list payload then only grow
+with active data. Restoring moves rows back unchanged apart from
+``updated_at``, so a restored campaign is not archived again right away.
+Archiving leaves a ``CampaignTombstone`` for the change feed; restoring
+removes it and the bumped ``updated_at`` brings the campaign back.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from server.pagination import bump_count_version
+
+from .audit import record_change
+from .bulk import insert_raw
+from .events import publish_change
+from .filters import campaign_count_scope
+from .models import (
+    ArchivedCampaign,
+    ArchivedCampaignPayout,
+    Campaign,
+    CampaignPayout,
+    CampaignTombstone,
+)
+from .serializers import raise_for_title_conflict
+
+CAMPAIGN_FIELDS = [
+    "id",
+    "account_id",
+    "title",
+    "landing_page_url",
+    "is_running",
+    "start_at",
+    "end_at",
+    "landing_page_ok",
+    "landing_page_checked_at",
+    "created_at",
+    "updated_at",
+]
+PAYOUT_FIELDS = [
+    "id",
+    "campaign_id",
+    "country",
+    "amount",
+    "currency",
+    "is_active",
+    "created_at",
+    "updated_at",
+]
+
+
+def _copy(source, model, field_names, **extra):
+    return model(**{name: getattr(source, name) for name in field_names}, **extra)
+
+
+def _record(campaigns, action, using):
+    for campaign in campaigns:
+        record_change(action, campaign.account_id, campaign.id, {}, using=using)
+        publish_change(action, campaign.account_id, campaign.id, using=using)
+    for account_id in {campaign.account_id for campaign in campaigns}:
+        bump_count_version(campaign_count_scope(account_id), using=using)
+
+
+def archivable(using: str, cutoff: datetime):
+    """Stopped campaigns on ``using`` last modified before ``cutoff``."""
+    # Campaigns waiting for their scheduled start are not done yet
+    return Campaign.objects.using(using).filter(
+        is_running=False, start_at__isnull=True, updated_at__lt=cutoff
+    )
+
+
+def archive_campaigns(ids: Iterable[int], using: str, cutoff: datetime) -> int:
+    """
+    Move the given campaigns to the archive tables in one transaction.
+
+    Rows are locked and re-checked against ``cutoff`` first, so campaigns
+    restarted or edited since they were selected stay hot. Returns the
+    number of campaigns archived.
+    """
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        campaigns = list(
+            archivable(using, cutoff).select_for_update().filter(id__in=list(ids))
+        )
+        if not campaigns:
+            return 0
+        campaign_ids = [campaign.id for campaign in campaigns]
+        payouts = CampaignPayout.objects.using(using).filter(
+            campaign_id__in=campaign_ids
+        )
+        insert_raw(
+            ArchivedCampaign,
+            [
+                _copy(c, ArchivedCampaign, CAMPAIGN_FIELDS, archived_at=now)
+                for c in campaigns
+            ],
+            using,
+        )
+        insert_raw(
+            ArchivedCampaignPayout,
+            [_copy(p, ArchivedCampaignPayout, PAYOUT_FIELDS) for p in payouts],
+            using,
+        )
+        payouts._raw_delete(using)
+        Campaign.objects.using(using).filter(id__in=campaign_ids)._raw_delete(using)
+        CampaignTombstone.objects.using(using).bulk_create(
+            CampaignTombstone(
+                account_id=c.account_id, campaign_id=c.id, reason="archived"
+            )
+            for c in campaigns
+        )
+        _record(campaigns, "campaign.archived", using)
+    return len(campaigns)
+
+
+def restore_campaigns(ids: Iterable[int], using: str) -> List[Campaign]:
+    """
+    Move archived campaigns back to the hot tables.
+
+    Raises:
+        ValidationError: If the account created a campaign with the same
+            title since; nothing is restored then.
+    """
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        archived = list(
+            ArchivedCampaign.objects.using(using)
+            .select_for_update()
+            .filter(id__in=list(ids))
+        )
+        if not archived:
+            return []
+        archived_ids = [campaign.id for campaign in archived]
+        payouts = ArchivedCampaignPayout.objects.using(using).filter(
+            campaign_id__in=archived_ids
+        )
+        kept_fields = [name for name in CAMPAIGN_FIELDS if name != "updated_at"]
+        campaigns = [_copy(c, Campaign, kept_fields, updated_at=now) for c in archived]
+        try:
+            # A title taken since archiving is caught by the unique index
+            insert_raw(Campaign, campaigns, using)
+        except IntegrityError as exc:
+            raise_for_title_conflict(exc)
+            raise
+        insert_raw(
+            CampaignPayout,
+            [_copy(p, CampaignPayout, PAYOUT_FIELDS) for p in payouts],
+            using,
+        )
+        payouts._raw_delete(using)
+        ArchivedCampaign.objects.using(using).filter(id__in=archived_ids)._raw_delete(
+            using
+        )
+        CampaignTombstone.objects.using(using).filter(
+            campaign_id__in=archived_ids
+        ).delete()
+        _record(campaigns, "campaign.restored", using)
+    return campaigns
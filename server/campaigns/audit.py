@@ -0,0 +1,242 @@
+"""
+Asynchronous, batched audit trail of campaign and payout changes.
+
+Views record a change with ``record_change()``. The event is queued once
+the surrounding transaction commits and a background thread writes
+queued events to ``CampaignAuditEvent`` with one bulk insert per batch,
+whenever ``AUDIT_BATCH_SIZE`` events are waiting or ``AUDIT_FLUSH_INTERVAL``
+seconds have passed, and once more at interpreter shutdown. Requests
+never wait for the audit write. When the bounded queue is full, events
+are dropped and counted instead of blocking; ``audit_sink.stats()``
+reports the counters.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_AUDIT_FIELDS = ["title", "landing_page_url", "is_running"]
+PAYOUT_AUDIT_FIELDS = ["country", "amount", "currency", "is_active"]
+
+# Seconds between "events dropped" warnings
+DROP_WARNING_INTERVAL = 60.0
+
+# Queued by shutdown() to wake the flushing thread
+_WAKE_UP: Dict[str, Any] = {}
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "code"):  # django-countries Country
+        return value.code or None
+    return value
+
+
+def payout_snapshot(payout) -> Dict[str, Any]:
+    return {name: _json_value(getattr(payout, name)) for name in PAYOUT_AUDIT_FIELDS}
+
+
+def campaign_snapshot(campaign, payouts=None) -> Dict[str, Any]:
+    """Audited fields of a campaign, payouts included."""
+    if payouts is None:
+        payouts = campaign.payouts.all()
+    data = {name: getattr(campaign, name) for name in CAMPAIGN_AUDIT_FIELDS}
+    data["payouts"] = sorted(
+        (payout_snapshot(payout) for payout in payouts),
+        key=lambda payout: payout["country"] or "",
+    )
+    return data
+
+
+def diff(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """``{field: [old, new]}`` for fields whose value changed."""
+    return {
+        name: [before.get(name), value]
+        for name, value in after.items()
+        if before.get(name) != value
+    }
+
+
+def write_events(events: List[Dict[str, Any]]) -> None:
+    """Insert a batch of events on the default database."""
+    from .models import CampaignAuditEvent
+
+    CampaignAuditEvent.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+        [CampaignAuditEvent(**event) for event in events]
+    )
+
+
+class AuditSink:
+    """
+    Bounded in-process queue flushed by a background thread.
+
+    Args:
+        writer: Persists one batch of events
+        max_size: Events held before new ones are dropped
+        batch_size: Events written per insert; reaching it triggers a flush
+        flush_interval: Maximum seconds an event waits in the queue
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Dict[str, Any]]], None] = write_events,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._last_drop_warning = 0.0
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "failed": 0}
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since start, plus the current queue depth."""
+        with self._lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def emit(self, event: Dict[str, Any], background: bool = True) -> None:
+        """Queue an event without blocking; drop it if the queue is full."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count("dropped")
+            now = time.monotonic()
+            if now - self._last_drop_warning >= DROP_WARNING_INTERVAL:
+                self._last_drop_warning = now
+                logger.warning(f"Audit queue full, events dropped: {self.stats()}")
+            return
+        self._count("enqueued")
+        if background:
+            self._ensure_thread()
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive a fork: each worker process starts its own
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _take_batch(self, timeout: Optional[float]) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            try:
+                if deadline is None:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    event = self._queue.get(timeout=remaining)
+                    if event is _WAKE_UP:
+                        break
+                    batch.append(event)
+            except queue.Empty:
+                break
+        return [event for event in batch if event is not _WAKE_UP]
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            self.writer(batch)
+        except Exception:
+            self._count("failed", len(batch))
+            logger.exception(f"Failed to write {len(batch)} audit events")
+        else:
+            self._count("written", len(batch))
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                batch = self._take_batch(self.flush_interval)
+                with self._flush_lock:
+                    close_old_connections()
+                    self._write(batch)
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self) -> None:
+        """Write everything queued so far in the calling thread."""
+        with self._flush_lock:
+            while batch := self._take_batch(None):
+                self._write(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the background thread after it flushed the queue."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            try:
+                self._queue.put_nowait(_WAKE_UP)
+            except queue.Full:
+                pass  # The thread is busy writing and will see the stop flag
+            thread.join(timeout)
+        self.flush()
+        dropped = self.stats()["dropped"]
+        if dropped:
+            logger.warning(f"Audit sink dropped {dropped} events")
+
+
+audit_sink = AuditSink(
+    max_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+)
+atexit.register(audit_sink.shutdown)
+
+
+def record_change(
+    action: str,
+    account_id: int,
+    campaign_id: int,
+    changes: Dict[str, Any],
+    payout_id: Optional[int] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Queue an audit event once the current transaction on ``using`` commits."""
+    event = {
+        "action": action,
+        "account_id": account_id,
+        "campaign_id": campaign_id,
+        "payout_id": payout_id,
+        "changes": changes,
+        "occurred_at": timezone.now(),
+    }
+    transaction.on_commit(
+        lambda: audit_sink.emit(event, background=settings.AUDIT_BACKGROUND_FLUSH),
+        using=using,
+    )
@@ -0,0 +1,33 @@
+"""
+Bulk row copies between tables and databases.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Type
+
+from django.db import connections
+from django.db.models import Field, Model
+
+
+def insert_raw(
+    model: Type[Model],
+    objs: List[Model],
+    using: str,
+    fields: Optional[Sequence[Field]] = None,
+) -> None:
+    """
+    Insert ``objs`` exactly as they are, ids and timestamps included.
+
+    Unlike ``bulk_create`` no ``pre_save`` runs, so ``auto_now`` and
+    ``auto_now_add`` values are kept. Rows are split into batches the
+    backend accepts.
+    """
+    if not objs:
+        return
+    fields = list(fields or model._meta.concrete_fields)
+    batch_size = connections[using].ops.bulk_batch_size(fields, objs)
+    manager = model._base_manager.using(using)
+    for start in range(0, len(objs), batch_size):
+        end = start + batch_size
+        manager._insert(objs[start:end], fields=fields, raw=True, using=using)
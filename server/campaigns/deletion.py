@@ -0,0 +1,119 @@
+"""
+Memory-bounded deletion of campaigns and whole accounts' campaign data.
+
+``Model.delete()`` and the ``Account`` cascade go through Django's
+``Collector``, which loads every campaign and payout and sends signals
+for each. Here rows are deleted a chunk of campaign ids at a time with
+set-based ``DELETE ... WHERE id IN (...)`` statements, one short
+transaction per chunk, so memory and lock time stay bounded however
+large the account is.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .models import (
+    ArchivedCampaign,
+    ArchivedCampaignPayout,
+    Campaign,
+    CampaignPayout,
+    CampaignTombstone,
+)
+
+DELETE_CHUNK_SIZE = 1000
+
+# Called after each chunk with the ``(id, account_id)`` of its campaigns
+OnChunk = Callable[[List[Tuple[int, int]], "DeleteCounts"], None]
+
+
+@dataclass
+class DeleteCounts:
+    campaigns: int = 0
+    payouts: int = 0
+    tombstones: int = 0
+
+
+def delete_campaigns(
+    campaigns: QuerySet,
+    using: str,
+    chunk_size: int = DELETE_CHUNK_SIZE,
+    tombstone: bool = True,
+    on_chunk: Optional[OnChunk] = None,
+    counts: Optional[DeleteCounts] = None,
+) -> DeleteCounts:
+    """
+    Delete the campaigns in ``campaigns`` (hot or archived) with their payouts.
+
+    Args:
+        campaigns: Campaigns to delete; any filter on the campaign model
+        using: Database holding the campaigns
+        chunk_size: Campaigns deleted per transaction
+        tombstone: Leave tombstones so change-feed clients see deletions
+        on_chunk: Called after each committed chunk, e.g. to report progress
+        counts: Totals to add to, when several deletions are reported together
+
+    Returns:
+        Running totals of the deleted rows.
+    """
+    campaign_model = campaigns.model
+    payout_model = (
+        ArchivedCampaignPayout if campaign_model is ArchivedCampaign else CampaignPayout
+    )
+    campaigns = campaigns.using(using).order_by("id")
+    counts = counts if counts is not None else DeleteCounts()
+    last_id = 0
+    while True:
+        remaining = campaigns.filter(id__gt=last_id).values_list("id", "account_id")
+        rows = list(remaining[:chunk_size])
+        if not rows:
+            return counts
+        ids = [campaign_id for campaign_id, _ in rows]
+        with transaction.atomic(using=using):
+            counts.payouts += (
+                payout_model._base_manager.using(using)
+                .filter(campaign_id__in=ids)
+                ._raw_delete(using)
+            )
+            counts.campaigns += (
+                campaign_model._base_manager.using(using)
+                .filter(id__in=ids)
+                ._raw_delete(using)
+            )
+            if tombstone:
+                CampaignTombstone.objects.using(using).bulk_create(
+                    CampaignTombstone(account_id=account_id, campaign_id=campaign_id)
+                    for campaign_id, account_id in rows
+                )
+        last_id = ids[-1]
+        if on_chunk is not None:
+            on_chunk(rows, counts)
+
+
+def purge_account_campaigns(
+    account_id: int,
+    using: str,
+    chunk_size: int = DELETE_CHUNK_SIZE,
+    on_chunk: Optional[OnChunk] = None,
+) -> DeleteCounts:
+    """Delete all of an account's hot and archived campaigns and its tombstones."""
+    counts = DeleteCounts()
+    for model in (Campaign, ArchivedCampaign):
+        delete_campaigns(
+            model._base_manager.filter(account_id=account_id),
+            using,
+            chunk_size,
+            tombstone=False,
+            on_chunk=on_chunk,
+            counts=counts,
+        )
+    tombstones = CampaignTombstone.objects.using(using).filter(account_id=account_id)
+    while ids := list(tombstones.values_list("id", flat=True)[:chunk_size]):
+        counts.tombstones += (
+            CampaignTombstone.objects.using(using).filter(id__in=ids)._raw_delete(using)
+        )
+    return counts
@@ -0,0 +1,215 @@
+"""
+Push notifications of campaign and payout changes.
+
+Views call ``publish_change()``; once the transaction commits the event
+goes out on the configured channel, which hands it to the ``broker`` of
+every process serving subscribers. The broker fans it out in memory to
+that account's open Server-Sent Events streams (see ``streams.py``).
+
+``CAMPAIGN_EVENTS_CHANNEL`` picks the channel: ``local`` only reaches
+subscribers of the publishing process (one worker, development), while
+``postgres`` goes through LISTEN/NOTIFY on the default database so every
+worker process receives every event. Any other value is imported as a
+dotted path to a ``Channel`` subclass.
+
+Events only say what changed; clients fetch the data themselves, e.g.
+from the change feed. When events may have been lost (a slow subscriber,
+a dropped listener connection) subscribers get a ``resync`` event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 100
+
+RESYNC: Dict[str, Any] = {"action": "resync"}
+
+Deliver = Callable[[Dict[str, Any]], None]
+
+
+class Channel:
+    """
+    Carries events between processes.
+
+    Args:
+        deliver: Called with every event received, in any thread
+    """
+
+    def __init__(self, deliver: Deliver) -> None:
+        self.deliver = deliver
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        """Start receiving events; called before the first subscription."""
+
+
+class LocalChannel(Channel):
+    """Delivers events within the publishing process only."""
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self.deliver(event)
+
+
+class PostgresChannel(Channel):
+    """Sends events with NOTIFY and receives them on a LISTEN connection."""
+
+    name = "campaign_events"
+    reconnect_delay = 1.0
+
+    def __init__(self, deliver: Deliver) -> None:
+        super().__init__(deliver)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.name, json.dumps(event)])
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._listen, name="campaign-events", daemon=True
+                )
+                self._thread.start()
+
+    def _listen(self) -> None:
+        import psycopg
+
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        params.pop("cursor_factory", None)
+        connected_before = False
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {self.name}")
+                    if connected_before:
+                        # Events sent while reconnecting are lost
+                        self.deliver(RESYNC)
+                    connected_before = True
+                    for notify in connection.notifies():
+                        self.deliver(json.loads(notify.payload))
+            except psycopg.Error:
+                logger.exception("Campaign events listener disconnected")
+            time.sleep(self.reconnect_delay)
+
+
+CHANNELS = {"local": LocalChannel, "postgres": PostgresChannel}
+
+
+class Subscription:
+    """An account's event stream, consumed in the loop that created it."""
+
+    def __init__(self, account_id: Any, max_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.account_id = account_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(max_size)
+
+    def put(self, event: Dict[str, Any]) -> None:
+        """Queue an event; must run in the subscription's loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind: replace the backlog with a resync request
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> Dict[str, Any]:
+        return await self.queue.get()
+
+
+class EventBroker:
+    """In-process fan-out of channel events to account subscriptions."""
+
+    def __init__(self, channel: Optional[str] = None) -> None:
+        self._channel_name = channel
+        self._channel: Optional[Channel] = None
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[Any, Set[Subscription]] = defaultdict(set)
+
+    @property
+    def channel(self) -> Channel:
+        if self._channel is None:
+            with self._lock:
+                if self._channel is None:
+                    name = self._channel_name or settings.CAMPAIGN_EVENTS_CHANNEL
+                    channel_class = CHANNELS.get(name) or import_string(name)
+                    self._channel = channel_class(self.deliver)
+        return self._channel
+
+    def subscribe(self, account_id: Any) -> Subscription:
+        """Open a subscription; call from the loop that will consume it."""
+        self.channel.start()
+        subscription = Subscription(account_id)
+        with self._lock:
+            self._subscriptions[account_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.account_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.account_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        try:
+            self.channel.publish(event)
+        except Exception:
+            # Notifications are best effort; the change itself is committed
+            logger.exception(f"Failed to publish campaign event {event}")
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Hand a channel event to the matching subscriptions."""
+        with self._lock:
+            if event.get("account_id") is None:
+                targets = [s for subs in self._subscriptions.values() for s in subs]
+            else:
+                targets = list(self._subscriptions.get(event["account_id"], ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                self.unsubscribe(subscription)  # Its loop is closed
+
+
+broker = EventBroker()
+
+
+def publish_change(
+    action: str,
+    account_id: int,
+    campaign_id: Optional[int],
+    payout_id: Optional[int] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Notify the account's subscribers once the transaction on ``using`` commits."""
+    event = {
+        "action": action,
+        "account_id": account_id,
+        "campaign_id": campaign_id,
+        "payout_id": payout_id,
+    }
+    transaction.on_commit(lambda: broker.publish(event), using=using)
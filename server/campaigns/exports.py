@@ -0,0 +1,106 @@
+"""
+Streaming campaign exports and list responses.
+
+Exports walk the queryset with ``iterator()``, which PostgreSQL serves from
+a named server-side cursor, and prefetch payouts per chunk. Memory stays
+bounded by the chunk size however many campaigns an account has.
+
+``stream_json_list()`` does the same for the JSON list of
+``GET /api/campaigns/?stream=true``: each chunk of campaigns is
+serialized and rendered on its own and sent as part of one JSON array,
+byte for byte what the unstreamed list renders.
+
+Under ASGI both are sent through ``server.streaming.streaming_response()``,
+which keeps the handler from reading them into memory first.
+"""
+
+from __future__ import annotations
+
+import csv
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+from django.db.models import QuerySet
+
+from server.renderers import ORJSONRenderer
+
+EXPORT_CHUNK_SIZE = 2000
+# Campaigns serialized and rendered at a time by stream_json_list()
+STREAM_CHUNK_SIZE = 500
+
+EXPORT_HEADER = [
+    "id",
+    "title",
+    "landing_page_url",
+    "is_running",
+    "payouts",
+    "created_at",
+    "updated_at",
+]
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def campaign_export_rows(
+    queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[List[Any]]:
+    """
+    Yield one CSV row per campaign, payouts folded into a single column.
+
+    Args:
+        queryset: Filtered and ordered Campaign queryset
+        chunk_size: Rows fetched from the cursor per round trip
+    """
+    campaigns = queryset.prefetch_related("payouts").iterator(chunk_size=chunk_size)
+    for campaign in campaigns:
+        payouts = "; ".join(
+            f"{payout.country.code if payout.country else 'Worldwide'} "
+            f"{payout.amount} {payout.currency}"
+            for payout in campaign.payouts.all()
+        )
+        yield [
+            campaign.id,
+            campaign.title,
+            campaign.landing_page_url,
+            campaign.is_running,
+            payouts,
+            campaign.created_at.isoformat(),
+            campaign.updated_at.isoformat(),
+        ]
+
+
+def stream_csv(rows: Iterable[List[Any]], header: List[str]) -> Iterator[str]:
+    """Render rows as CSV lines lazily, header first."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_json_list(
+    queryset: QuerySet, serializer_class, chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Render ``queryset`` as one JSON array, a chunk of objects at a time.
+
+    Args:
+        queryset: Filtered and ordered queryset, payouts prefetched
+        serializer_class: Serializer of one object
+        chunk_size: Objects fetched, serialized and rendered per chunk,
+            ``STREAM_CHUNK_SIZE`` by default
+    """
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    renderer = ORJSONRenderer()
+    objects = queryset.iterator(chunk_size=chunk_size)
+    yield b"["
+    separator = b""
+    while chunk := list(islice(objects, chunk_size)):
+        content = renderer.render(serializer_class(chunk, many=True).data)
+        yield separator + content[1:-1]
+        separator = b","
+    yield b"]"
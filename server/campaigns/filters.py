@@ -1,7 +1,12 @@
 from django.db.models import Q
 from django_filters import rest_framework as filters
 
-from .models import Campaign
+from .models import ArchivedCampaign, Campaign
+
+
+def campaign_count_scope(account_id: int) -> str:
+    """Scope of the cached counts of an account's filtered campaigns."""
+    return f"campaigns:{account_id}"
 
 
 class CampaignFilter(filters.FilterSet):
@@ -15,6 +20,8 @@ class CampaignFilter(filters.FilterSet):
     )
     # Filter for is_running (boolean)
     is_running = filters.BooleanFilter(field_name="is_running")
+    # Filter for the landing page check result (boolean)
+    landing_page_ok = filters.BooleanFilter(field_name="landing_page_ok")
     # Global search filter
     search = filters.CharFilter(method="filter_search")
 
@@ -28,4 +35,11 @@ class CampaignFilter(filters.FilterSet):
 
     class Meta:
         model = Campaign
-        fields = ["title", "landing_page_url", "is_running"]
+        fields = ["title", "landing_page_url", "is_running", "landing_page_ok"]
+
+
+class ArchivedCampaignFilter(CampaignFilter):
+    """The campaign filters applied to archived campaigns"""
+
+    class Meta(CampaignFilter.Meta):
+        model = ArchivedCampaign
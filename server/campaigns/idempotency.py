@@ -0,0 +1,126 @@
+"""
+Replayable POST requests with an ``Idempotency-Key`` header.
+
+A client retrying a POST sends the same key again. The first request
+claims the key in ``IdempotencyKey`` and its response is stored there;
+a retry gets that stored response back without running the view again.
+A retry arriving while the first request is still running waits up to
+``IDEMPOTENCY_WAIT_SECONDS`` for it instead of racing it, then gets 409.
+Keys are scoped to the account, kept for ``IDEMPOTENCY_KEY_TTL_HOURS``
+and may only be reused for the same method, path and body (422
+otherwise). Server errors are not stored, so the request can be retried.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Seconds between looks at a key another request is working on
+POLL_INTERVAL = 0.05
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still in progress."
+    default_code = "idempotency_key_in_use"
+
+
+class IdempotencyKeyMismatch(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was used for a different request."
+    default_code = "idempotency_key_mismatch"
+
+
+def fingerprint(request) -> str:
+    """Hash identifying what a request asks for."""
+    digest = hashlib.sha256()
+    for part in (request.method, request.get_full_path()):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _keys():
+    return IdempotencyKey.objects.using(DEFAULT_DB_ALIAS)
+
+
+def claim(
+    account_id: int, key: str, request_fingerprint: str
+) -> Optional[IdempotencyKey]:
+    """
+    Claim ``key`` for a new request.
+
+    Returns:
+        None when the caller now owns the key and must run the request,
+        or the completed key whose stored response is to be replayed.
+
+    Raises:
+        IdempotencyKeyMismatch: The key was used for another request
+        IdempotencyKeyInUse: The first request did not finish in time
+    """
+    ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+    abandoned = timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        now = timezone.now()
+        # Expired keys and claims left by a crashed process are free again
+        _keys().filter(account_id=account_id, key=key).filter(
+            Q(expires_at__lte=now)
+            | Q(status=IdempotencyKey.IN_PROGRESS, created_at__lt=now - abandoned)
+        ).delete()
+        try:
+            with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                _keys().create(
+                    account_id=account_id,
+                    key=key,
+                    fingerprint=request_fingerprint,
+                    created_at=now,
+                    expires_at=now + ttl,
+                )
+            return None
+        except IntegrityError:
+            pass
+
+        existing = _keys().filter(account_id=account_id, key=key).first()
+        if existing is None:  # Released in the meantime
+            continue
+        if existing.fingerprint != request_fingerprint:
+            raise IdempotencyKeyMismatch()
+        if existing.status == IdempotencyKey.COMPLETED:
+            return existing
+        if time.monotonic() >= deadline:
+            raise IdempotencyKeyInUse()
+        time.sleep(POLL_INTERVAL)
+
+
+def complete(account_id: int, key: str, response_status: int, data) -> None:
+    """Store the response of the request owning ``key``."""
+    _keys().filter(account_id=account_id, key=key).update(
+        status=IdempotencyKey.COMPLETED,
+        response_status=response_status,
+        response_data=data,
+    )
+
+
+def release(account_id: int, key: str) -> None:
+    """Give ``key`` up so the request can be retried."""
+    _keys().filter(
+        account_id=account_id, key=key, status=IdempotencyKey.IN_PROGRESS
+    ).delete()
@@ -0,0 +1,68 @@
+"""
+Background jobs of the campaigns app, run by ``manage.py run_jobs``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Optional
+
+from jobs.queue import JobContext, register
+from server.pagination import bump_count_version
+
+from .audit import record_change
+from .deletion import DeleteCounts, OnChunk, delete_campaigns
+from .events import publish_change
+from .filters import CampaignFilter, campaign_count_scope
+from .models import Campaign
+from .sharding import AccountMoving, placement_for, use_shard
+
+BULK_DELETE_JOB = "campaigns.bulk_delete"
+
+
+def record_bulk_deletion(
+    account_id: int,
+    using: str,
+    on_progress: Optional[Callable[[DeleteCounts], None]] = None,
+) -> OnChunk:
+    """
+    The ``on_chunk`` callback of a bulk delete: records each deletion in
+    the audit trail, notifies subscribers and invalidates cached counts.
+    """
+
+    def on_chunk(rows, counts):
+        for campaign_id, row_account_id in rows:
+            record_change(
+                "campaign.deleted", row_account_id, campaign_id, {}, using=using
+            )
+        publish_change("campaign.bulk_deleted", account_id, None, using=using)
+        bump_count_version(campaign_count_scope(account_id), using=using)
+        if on_progress is not None:
+            on_progress(counts)
+
+    return on_chunk
+
+
+@register(BULK_DELETE_JOB)
+def bulk_delete(job: JobContext) -> Dict[str, Any]:
+    """
+    Delete an account's campaigns by ``ids`` or by the campaign ``filters``
+    of the request that queued the job.
+    """
+    placement = placement_for(job.account_id)
+    if placement.moving:
+        raise AccountMoving()  # Retried once the move is over
+    using = placement.alias
+    with use_shard(using):
+        campaigns = Campaign.objects.filter(account_id=job.account_id)
+        if "ids" in job.payload:
+            campaigns = campaigns.filter(id__in=job.payload["ids"])
+        else:
+            campaigns = CampaignFilter(job.payload["filters"], queryset=campaigns).qs
+        job.set_progress(0, campaigns.using(using).count())
+        on_chunk = record_bulk_deletion(
+            job.account_id,
+            using,
+            on_progress=lambda counts: job.set_progress(counts.campaigns),
+        )
+        counts = delete_campaigns(campaigns, using, on_chunk=on_chunk)
+    return {"deleted": counts.campaigns, "payouts_deleted": counts.payouts}
@@ -0,0 +1,290 @@
+"""
+Health checks of the landing pages of running campaigns.
+
+Every distinct landing page URL is checked once per pass, however many
+campaigns share it, and the result is kept per URL in
+``LandingPageCheck``. A URL checked less than ``max_age`` seconds ago is
+not requested again; an older one is requested with its stored ETag and
+Last-Modified, so an unchanged page answers 304 without a body. A result
+is then copied onto the campaigns using the URL whose ``landing_page_ok``
+it changes, as an ordinary campaign update: ``updated_at`` moves, so the
+change feed returns them, and the change is audited and published.
+Campaigns of accounts being resharded are left alone, as by the
+scheduler; their results are copied on the first pass after the move.
+
+The requests run on one asyncio event loop through a single HTTP client,
+whose pool keeps connections to a host open between requests. At most
+``concurrency`` requests are in flight, and at most ``per_host`` to any
+one host, so a host shared by many campaigns is not flooded. Pages are
+requested with ``HEAD`` and fall back to ``GET`` for servers that do
+not allow it; an answer below 400 (or 304) counts as healthy, a client
+or server error, a timeout or a connection failure as broken.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import httpx
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+
+from server.pagination import bump_count_version
+
+from .audit import record_change
+from .events import publish_change
+from .filters import campaign_count_scope
+from .models import Campaign, LandingPageCheck
+from .sharding import moving_accounts
+
+CHECK_CONCURRENCY = 50
+CHECK_PER_HOST = 4
+CHECK_TIMEOUT = 10.0
+CHECK_MAX_AGE = 3600
+# URLs per ``IN`` list when reading and writing results
+CHECK_CHUNK_SIZE = 500
+
+USER_AGENT = "campaign-landing-page-checker/1.0"
+
+_ERROR_LENGTH = LandingPageCheck._meta.get_field("error").max_length
+
+
+@dataclass
+class CheckResult:
+    """Answer to one landing page request."""
+
+    ok: bool
+    status_code: Optional[int] = None
+    error: str = ""
+    etag: str = ""
+    last_modified: str = ""
+
+
+@dataclass
+class CheckStats:
+    """Outcome of one checker pass."""
+
+    urls: int = 0
+    # URLs actually requested; the rest had a fresh cached result
+    requested: int = 0
+    # Requested URLs that answered 304 Not Modified
+    not_modified: int = 0
+    broken: int = 0
+    # Campaigns whose landing_page_ok changed
+    campaigns: int = 0
+
+
+async def check_urls(
+    urls: Iterable[str],
+    previous: Mapping[str, LandingPageCheck] = {},
+    concurrency: int = CHECK_CONCURRENCY,
+    per_host: int = CHECK_PER_HOST,
+    timeout: float = CHECK_TIMEOUT,
+) -> Dict[str, CheckResult]:
+    """
+    Request every URL in ``urls`` once, concurrently.
+
+    ``previous`` holds the last stored check of a URL, whose validators
+    make its request conditional.
+    """
+    urls = list(dict.fromkeys(urls))
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    slots = asyncio.Semaphore(concurrency)
+    host_slots: Dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(per_host)
+    )
+
+    async def check(client: httpx.AsyncClient, url: str) -> CheckResult:
+        try:
+            host = httpx.URL(url).host
+        except httpx.InvalidURL as exc:
+            return CheckResult(ok=False, error=_describe(exc))
+        async with host_slots[host], slots:
+            return await _check(client, url, previous.get(url))
+
+    async with httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    ) as client:
+        results = await asyncio.gather(*(check(client, url) for url in urls))
+    return dict(zip(urls, results))
+
+
+async def _check(
+    client: httpx.AsyncClient, url: str, previous: Optional[LandingPageCheck]
+) -> CheckResult:
+    headers = {}
+    if previous is not None and previous.ok:
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+    try:
+        response = await client.head(url, headers=headers)
+        if response.status_code in (405, 501):
+            # HEAD not allowed; only the status is read, not the body
+            async with client.stream("GET", url, headers=headers) as response:
+                pass
+    except httpx.HTTPError as exc:
+        return CheckResult(ok=False, error=_describe(exc))
+
+    if response.status_code == 304 and previous is not None:
+        return CheckResult(
+            ok=True,
+            status_code=304,
+            etag=response.headers.get("ETag", previous.etag),
+            last_modified=response.headers.get("Last-Modified", previous.last_modified),
+        )
+    return CheckResult(
+        ok=response.status_code < 400,
+        status_code=response.status_code,
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+    )
+
+
+def _describe(exc: Exception) -> str:
+    return (f"{type(exc).__name__}: {exc}".rstrip(": "))[:_ERROR_LENGTH]
+
+
+def _chunks(items: List[str], size: int = CHECK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def running_urls(using: str) -> List[str]:
+    """Distinct landing page URLs of the running campaigns on ``using``."""
+    return list(
+        Campaign.objects.using(using)
+        .filter(is_running=True)
+        .order_by()
+        .values_list("landing_page_url", flat=True)
+        .distinct()
+    )
+
+
+def run_checks(
+    aliases: Iterable[str],
+    concurrency: int = CHECK_CONCURRENCY,
+    per_host: int = CHECK_PER_HOST,
+    timeout: float = CHECK_TIMEOUT,
+    max_age: float = CHECK_MAX_AGE,
+) -> CheckStats:
+    """Check the landing pages of the running campaigns on ``aliases``."""
+    stats = CheckStats()
+    urls_by_alias = {alias: running_urls(alias) for alias in aliases}
+    urls = sorted({url for urls in urls_by_alias.values() for url in urls})
+    stats.urls = len(urls)
+
+    checks = LandingPageCheck.objects.using(DEFAULT_DB_ALIAS)
+    cached: Dict[str, LandingPageCheck] = {}
+    for chunk in _chunks(urls):
+        cached.update((check.url, check) for check in checks.filter(url__in=chunk))
+
+    now = timezone.now()
+    fresh_after = now - timedelta(seconds=max_age)
+    stale = [
+        url
+        for url in urls
+        if url not in cached or cached[url].checked_at <= fresh_after
+    ]
+    stats.requested = len(stale)
+    if stale:
+        results = asyncio.run(check_urls(stale, cached, concurrency, per_host, timeout))
+        updated = [
+            LandingPageCheck(
+                url=url,
+                ok=result.ok,
+                status_code=result.status_code,
+                error=result.error,
+                etag=result.etag,
+                last_modified=result.last_modified,
+                checked_at=now,
+            )
+            for url, result in results.items()
+        ]
+        checks.bulk_create(
+            updated,
+            batch_size=CHECK_CHUNK_SIZE,
+            update_conflicts=True,
+            unique_fields=["url"],
+            update_fields=[
+                "ok",
+                "status_code",
+                "error",
+                "etag",
+                "last_modified",
+                "checked_at",
+            ],
+        )
+        cached.update((check.url, check) for check in updated)
+        stats.not_modified = sum(
+            result.status_code == 304 for result in results.values()
+        )
+    stats.broken = sum(not cached[url].ok for url in urls)
+
+    # Read after the requests: a move may have started meanwhile
+    moving = moving_accounts()
+    for alias, alias_urls in urls_by_alias.items():
+        stats.campaigns += _store_results(alias, alias_urls, cached, moving)
+    return stats
+
+
+def _store_results(
+    using: str,
+    urls: List[str],
+    checks: Mapping[str, LandingPageCheck],
+    exclude_accounts: Iterable[int] = (),
+) -> int:
+    # One UPDATE per result and check time instead of one per campaign;
+    # every pass checks at a single time, so the groups stay few. Only
+    # campaigns whose result changes are written.
+    groups: Dict[tuple[bool, datetime], List[str]] = defaultdict(list)
+    for url in urls:
+        groups[checks[url].ok, checks[url].checked_at].append(url)
+    now = timezone.now()
+    updated = 0
+    for (ok, checked_at), group in groups.items():
+        for chunk in _chunks(group):
+            changed = (
+                Campaign.objects.using(using)
+                .filter(is_running=True, landing_page_url__in=chunk)
+                .exclude(landing_page_ok=ok)
+                .exclude(account_id__in=list(exclude_accounts))
+            )
+            with transaction.atomic(using=using):
+                rows = list(
+                    changed.select_for_update().values_list(
+                        "id", "account_id", "landing_page_ok"
+                    )
+                )
+                if not rows:
+                    continue
+                changed.update(
+                    landing_page_ok=ok,
+                    landing_page_checked_at=checked_at,
+                    updated_at=now,
+                )
+                for campaign_id, account_id, was_ok in rows:
+                    record_change(
+                        "campaign.updated",
+                        account_id,
+                        campaign_id,
+                        {"landing_page_ok": [was_ok, ok]},
+                        using=using,
+                    )
+                    publish_change(
+                        "campaign.updated", account_id, campaign_id, using=using
+                    )
+                for account_id in {account_id for _, account_id, _ in rows}:
+                    bump_count_version(campaign_count_scope(account_id), using=using)
+            updated += len(rows)
+    return updated
@@ -0,0 +1,81 @@
+"""
+Move long-stopped campaigns to the archive tables, batch by batch.
+
+Each batch is its own short transaction, and batches can be spaced out
+with ``--sleep`` so the job can run next to live traffic. Every shard is
+processed; accounts being resharded are skipped. With ``--interval`` the
+command keeps running and starts a new pass after each pause.
+
+Usage:
+
+    python manage.py archive_campaigns --older-than-days 90 --interval 3600
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from campaigns.archive import archivable, archive_campaigns
+from campaigns.models import AccountShard
+from campaigns.sharding import shards
+
+
+class Command(BaseCommand):
+    help = "Archive campaigns stopped and unchanged for a given number of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--sleep", type=float, default=0.0, help="Seconds to pause between batches"
+        )
+        parser.add_argument(
+            "--max-batches", type=int, help="Stop each pass after this many batches"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.0,
+            help="Repeat the pass every N seconds (0 runs once)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self._run_pass(options)
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def _run_pass(self, options):
+        cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        moving = list(
+            AccountShard.objects.using(DEFAULT_DB_ALIAS)
+            .filter(moving=True)
+            .values_list("account_id", flat=True)
+        )
+        for alias in shards():
+            archived = batches = 0
+            last_id = 0
+            while options["max_batches"] is None or batches < options["max_batches"]:
+                ids = list(
+                    archivable(alias, cutoff)
+                    .exclude(account_id__in=moving)
+                    .filter(id__gt=last_id)
+                    .order_by("id")
+                    .values_list("id", flat=True)[: options["batch_size"]]
+                )
+                if not ids:
+                    break
+                archived += archive_campaigns(ids, alias, cutoff)
+                batches += 1
+                last_id = ids[-1]
+                if options["sleep"]:
+                    time.sleep(options["sleep"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{alias}: archived {archived} campaigns in {batches} batches"
+                )
+            )
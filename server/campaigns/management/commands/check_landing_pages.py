@@ -0,0 +1,81 @@
+"""
+Check the landing pages of all running campaigns.
+
+Each distinct URL is requested once per run, concurrently and with
+conditional requests, and the result is stored on every campaign using
+it; see ``campaigns.landing_pages``. URLs checked less than
+``--max-age`` seconds ago reuse their stored result.
+
+Usage:
+
+    python manage.py check_landing_pages --concurrency 50 --per-host 4 --interval 900
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from campaigns.landing_pages import (
+    CHECK_CONCURRENCY,
+    CHECK_MAX_AGE,
+    CHECK_PER_HOST,
+    CHECK_TIMEOUT,
+    run_checks,
+)
+from campaigns.sharding import shards
+
+
+class Command(BaseCommand):
+    help = "Check the landing pages of running campaigns and store the results."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=CHECK_CONCURRENCY,
+            help="Requests in flight at once",
+        )
+        parser.add_argument(
+            "--per-host",
+            type=int,
+            default=CHECK_PER_HOST,
+            help="Requests in flight at once to a single host",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=CHECK_TIMEOUT,
+            help="Seconds before a request counts as failed",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=float,
+            default=CHECK_MAX_AGE,
+            help="Reuse results younger than N seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.0,
+            help="Run every N seconds (0 runs once)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            stats = run_checks(
+                shards(),
+                concurrency=options["concurrency"],
+                per_host=options["per_host"],
+                timeout=options["timeout"],
+                max_age=options["max_age"],
+            )
+            self.stdout.write(
+                f"Checked {stats.requested} of {stats.urls} landing pages "
+                f"({stats.not_modified} not modified), {stats.broken} broken, "
+                f"{stats.campaigns} campaigns changed "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+            if not options["interval"]:
+                return
+            time.sleep(max(0.0, options["interval"] - (time.monotonic() - started)))
@@ -0,0 +1,195 @@
+"""
+Generate synthetic accounts, campaigns and payouts for load testing.
+
+Example:
+    python manage.py generate_campaign_data --accounts 1000 \\
+        --campaigns 1000000 --workers 4
+"""
+
+import multiprocessing
+import random
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections
+from django.db.models import Max
+
+from accounts.models import Account
+from campaigns.models import Campaign, CampaignPayout
+from campaigns.synthetic import (
+    GeneratorOptions,
+    WorkChunk,
+    campaigns_per_account,
+    generate_chunk,
+    run_chunk_in_worker,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate accounts, campaigns and payouts with realistic "
+        "distributions for load testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--accounts", type=int, default=100)
+        parser.add_argument(
+            "--campaigns",
+            type=int,
+            default=100_000,
+            help="Total campaigns, spread over the accounts with a heavy tail",
+        )
+        parser.add_argument("--max-payouts", type=int, default=5)
+        parser.add_argument("--worldwide-ratio", type=float, default=0.2)
+        parser.add_argument("--usd-ratio", type=float, default=0.3)
+        parser.add_argument("--running-ratio", type=float, default=0.4)
+        parser.add_argument(
+            "--title-collision-ratio",
+            type=float,
+            default=0.3,
+            help="Share of campaigns reusing a title popular across accounts",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20_000,
+            help="Rows written per insert batch and transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Parallel writer processes (PostgreSQL only)",
+        )
+        parser.add_argument("--password", default="Password123!")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        database = options["database"]
+        connection = connections[database]
+        workers = max(options["workers"], 1)
+        if workers > 1 and connection.vendor == "sqlite":
+            self.stderr.write("SQLite serializes writers; using a single worker.")
+            workers = 1
+        if workers > 1 and not hasattr(multiprocessing, "get_context"):
+            raise CommandError("Parallel workers are not supported here.")
+
+        seed = options["seed"] if options["seed"] is not None else time.time_ns()
+        rng = random.Random(seed)
+        generator_options = GeneratorOptions(
+            max_payouts=options["max_payouts"],
+            worldwide_ratio=options["worldwide_ratio"],
+            usd_ratio=options["usd_ratio"],
+            running_ratio=options["running_ratio"],
+            title_collision_ratio=options["title_collision_ratio"],
+            batch_size=options["batch_size"],
+            seed=seed,
+        )
+
+        started = time.perf_counter()
+        account_ids = self._create_accounts(
+            options["accounts"], options["password"], database
+        )
+        plan = campaigns_per_account(account_ids, options["campaigns"], rng)
+        chunks = self._split(plan, workers, generator_options, seed, database)
+
+        self.stdout.write(
+            f"Generating {options['campaigns']} campaigns for "
+            f"{len(account_ids)} accounts with {workers} worker(s)..."
+        )
+        if workers == 1:
+            totals = [generate_chunk(chunks[0], self._progress(started))]
+        else:
+            # Children must open their own connections after the fork
+            connections.close_all()
+            context = multiprocessing.get_context("fork")
+            with context.Pool(workers) as pool:
+                totals = pool.map(run_chunk_in_worker, chunks)
+
+        if connection.vendor == "postgresql":
+            self._reset_sequences(database)
+
+        elapsed = time.perf_counter() - started
+        campaigns = sum(total[0] for total in totals)
+        payouts = sum(total[1] for total in totals)
+        rows = len(account_ids) + campaigns + payouts
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {len(account_ids)} accounts, {campaigns} campaigns and "
+                f"{payouts} payouts in {elapsed:.1f}s "
+                f"({rows / elapsed:,.0f} rows/s)"
+            )
+        )
+
+    def _create_accounts(self, count, password, database):
+        """Create accounts in bulk, hashing the shared password only once."""
+        tag = uuid.uuid4().hex[:8]
+        password_hash = make_password(password)
+        accounts = Account.objects.using(database).bulk_create(
+            (
+                Account(
+                    username=f"synthetic-{tag}-{i}@example.com",
+                    email=f"synthetic-{tag}-{i}@example.com",
+                    password=password_hash,
+                )
+                for i in range(count)
+            ),
+            batch_size=5000,
+        )
+        return [account.pk for account in accounts]
+
+    def _split(self, plan, workers, generator_options, seed, database):
+        """Partition accounts into chunks with disjoint primary key ranges."""
+        next_campaign_id = self._next_id(Campaign, database)
+        next_payout_id = self._next_id(CampaignPayout, database)
+        per_payout_block = max(generator_options.max_payouts, 1)
+
+        chunks = []
+        for index in range(workers):
+            accounts = plan[index::workers]
+            campaign_count = sum(count for _, count in accounts)
+            chunks.append(
+                WorkChunk(
+                    accounts=accounts,
+                    campaign_id_start=next_campaign_id,
+                    payout_id_start=next_payout_id,
+                    seed=seed + index,
+                    database=database,
+                    options=generator_options,
+                )
+            )
+            next_campaign_id += campaign_count
+            next_payout_id += campaign_count * per_payout_block
+        return chunks
+
+    @staticmethod
+    def _next_id(model, database):
+        current = model.objects.using(database).aggregate(top=Max("id"))["top"]
+        return (current or 0) + 1
+
+    @staticmethod
+    def _reset_sequences(database):
+        """Move id sequences past the explicitly assigned primary keys."""
+        connection = connections[database]
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [Campaign, CampaignPayout]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def _progress(self, started):
+        written = [0]
+
+        def report(campaigns, payouts):
+            written[0] += campaigns + payouts
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {written[0]:,} rows ({written[0] / elapsed:,.0f} rows/s)"
+            )
+
+        return report
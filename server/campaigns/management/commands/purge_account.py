@@ -0,0 +1,71 @@
+"""
+Delete an account and all of its campaign data in bounded chunks.
+
+Deleting an ``Account`` directly cascades through Django's collector,
+which loads every campaign and payout into memory first. This command
+deletes the hot and archived campaigns, their payouts and the account's
+tombstones chunk by chunk on every shard, reporting progress, and only
+then deletes the (now small) account itself.
+
+Usage:
+
+    python manage.py purge_account 42 --chunk-size 2000
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from campaigns.deletion import DELETE_CHUNK_SIZE, purge_account_campaigns
+from campaigns.models import AccountShard
+from campaigns.sharding import placement_for, shards
+
+
+class Command(BaseCommand):
+    help = "Delete an account with its campaigns and payouts in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("account", type=int, help="Account id to purge")
+        parser.add_argument("--chunk-size", type=int, default=DELETE_CHUNK_SIZE)
+        parser.add_argument(
+            "--keep-account",
+            action="store_true",
+            help="Only delete the campaign data, keep the account itself",
+        )
+
+    def handle(self, *args, **options):
+        account_id = options["account"]
+        accounts = get_user_model().objects.filter(pk=account_id)
+        if not accounts.exists():
+            raise CommandError(f"Account {account_id} does not exist.")
+        if placement_for(account_id).moving:
+            raise CommandError(
+                f"Account {account_id} is being resharded; purge it afterwards."
+            )
+
+        # Every shard: an aborted move may have left copies behind
+        for alias in shards():
+
+            def report(rows, counts, alias=alias):
+                if options["verbosity"] < 1:
+                    return
+                self.stdout.write(
+                    f"  {alias}: deleted {counts.campaigns} campaigns, "
+                    f"{counts.payouts} payouts"
+                )
+
+            counts = purge_account_campaigns(
+                account_id, alias, options["chunk_size"], on_chunk=report
+            )
+            self.stdout.write(
+                f"{alias}: deleted {counts.campaigns} campaigns, "
+                f"{counts.payouts} payouts and {counts.tombstones} tombstones."
+            )
+
+        if options["keep_account"]:
+            return
+        AccountShard.objects.using(DEFAULT_DB_ALIAS).filter(
+            account_id=account_id
+        ).delete()
+        accounts.delete()
+        self.stdout.write(self.style.SUCCESS(f"Account {account_id} deleted."))
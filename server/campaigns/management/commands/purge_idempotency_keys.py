@@ -0,0 +1,35 @@
+"""
+Delete idempotency keys past their expiry.
+
+Expired keys are already ignored when a request claims its key; this
+command keeps the table small. Rows are deleted in small batches.
+
+Usage:
+
+    python manage.py purge_idempotency_keys  # hourly
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from campaigns.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        keys = IdempotencyKey.objects.using(DEFAULT_DB_ALIAS)
+        expired = keys.filter(expires_at__lte=timezone.now())
+        purged = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            keys.filter(id__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
+            purged += len(ids)
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} idempotency keys"))
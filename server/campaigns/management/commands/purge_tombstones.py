@@ -0,0 +1,42 @@
+"""
+Delete campaign tombstones older than the change-feed retention.
+
+Clients whose cursor predates the retention get 410 Gone from the change
+feed and resync from the full list, so older tombstones are no longer
+needed. Rows are deleted in small batches on every shard.
+
+Usage:
+
+    python manage.py purge_tombstones
+"""
+
+from django.core.management.base import BaseCommand
+
+from campaigns.changes import tombstone_horizon
+from campaigns.models import CampaignTombstone
+from campaigns.sharding import shards
+
+
+class Command(BaseCommand):
+    help = "Delete campaign tombstones older than CAMPAIGN_TOMBSTONE_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        horizon = tombstone_horizon()
+        for alias in shards():
+            tombstones = CampaignTombstone.objects.using(alias)
+            expired = tombstones.filter(deleted_at__lt=horizon)
+            purged = 0
+            while True:
+                ids = list(
+                    expired.values_list("id", flat=True)[: options["batch_size"]]
+                )
+                if not ids:
+                    break
+                tombstones.filter(id__in=ids)._raw_delete(alias)
+                purged += len(ids)
+            self.stdout.write(
+                self.style.SUCCESS(f"{alias}: purged {purged} campaign tombstones")
+            )
@@ -0,0 +1,213 @@
+"""
+Move one account's campaign data to another shard.
+
+The account stays readable throughout: reads keep using the source shard
+until the directory flips. Writes are refused (503) from the moment the
+account is marked as moving; after a short drain for requests already in
+flight, hot and archived campaigns and their payouts are copied in id
+order with ids and timestamps preserved, followed by the account's
+campaign tombstones (the change feed's deletion log), verified, and the directory
+entry is switched to the target before the source rows are deleted.
+
+Usage:
+
+    python manage.py reshard_account 42 shard2
+"""
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from campaigns.bulk import insert_raw
+from campaigns.models import (
+    AccountShard,
+    ArchivedCampaign,
+    ArchivedCampaignPayout,
+    Campaign,
+    CampaignPayout,
+    CampaignTombstone,
+)
+from campaigns.sharding import placement_for, sharding_enabled, shards
+
+# Each campaign table with the payout table referencing it via ``campaign``
+TABLES = [(Campaign, CampaignPayout), (ArchivedCampaign, ArchivedCampaignPayout)]
+
+# Per-account tables without children
+STANDALONE_TABLES = [CampaignTombstone]
+
+
+class Command(BaseCommand):
+    help = "Move an account's campaigns and payouts to another shard."
+
+    def add_arguments(self, parser):
+        parser.add_argument("account", type=int, help="Account id to move")
+        parser.add_argument("target", help="Shard alias to move the account to")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--drain-seconds",
+            type=float,
+            default=2.0,
+            help="Wait for in-flight writes after blocking new ones",
+        )
+        parser.add_argument(
+            "--keep-source",
+            action="store_true",
+            help="Leave the copied rows on the source shard",
+        )
+
+    def handle(self, *args, **options):
+        account_id, target = options["account"], options["target"]
+        self.verbosity = options["verbosity"]
+        if not sharding_enabled():
+            raise CommandError("Sharding is not configured (DATABASE_SHARDS).")
+        if target not in shards():
+            raise CommandError(f"Unknown shard {target!r}; choose from {shards()}.")
+        if not get_user_model().objects.filter(pk=account_id).exists():
+            raise CommandError(f"Account {account_id} does not exist.")
+        source = placement_for(account_id).alias
+        if source == target:
+            raise CommandError(f"Account {account_id} already lives on {target}.")
+
+        directory = AccountShard.objects.using(DEFAULT_DB_ALIAS)
+        directory.update_or_create(
+            account_id=account_id, defaults={"alias": source, "moving": True}
+        )
+        try:
+            time.sleep(options["drain_seconds"])
+            # Rows left on the target by an aborted move are stale copies
+            self._delete_account(account_id, target, options["chunk_size"])
+            copied = [0, 0]
+            for campaign_model, payout_model in TABLES:
+                counts = self._copy(
+                    campaign_model,
+                    payout_model,
+                    account_id,
+                    source,
+                    target,
+                    options["chunk_size"],
+                )
+                copied = [copied[0] + counts[0], copied[1] + counts[1]]
+            for model in STANDALONE_TABLES:
+                self._copy_standalone(
+                    model, account_id, source, target, options["chunk_size"]
+                )
+            self._verify(account_id, source, target)
+        except BaseException:
+            directory.filter(account_id=account_id).update(moving=False)
+            raise
+
+        directory.filter(account_id=account_id).update(alias=target, moving=False)
+        self.stdout.write(
+            f"Copied {copied[0]} campaigns and {copied[1]} payouts "
+            f"from {source} to {target}."
+        )
+        if not options["keep_source"]:
+            self._delete_account(account_id, source, options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Account {account_id} now lives on {target}.")
+        )
+
+    def _copy(
+        self, campaign_model, payout_model, account_id, source, target, chunk_size
+    ):
+        campaigns_copied = payouts_copied = 0
+        last_id = 0
+        while True:
+            campaigns = list(
+                campaign_model._base_manager.using(source)
+                .filter(account_id=account_id, id__gt=last_id)
+                .order_by("id")[:chunk_size]
+            )
+            if not campaigns:
+                return campaigns_copied, payouts_copied
+            campaign_ids = [campaign.id for campaign in campaigns]
+            payouts = list(
+                payout_model._base_manager.using(source).filter(
+                    campaign_id__in=campaign_ids
+                )
+            )
+            self._check_conflicts(campaign_model, campaign_ids, target)
+            self._check_conflicts(payout_model, [p.id for p in payouts], target)
+            with transaction.atomic(using=target):
+                insert_raw(campaign_model, campaigns, target)
+                insert_raw(payout_model, payouts, target)
+            campaigns_copied += len(campaigns)
+            payouts_copied += len(payouts)
+            last_id = campaign_ids[-1]
+            if self.verbosity > 1:
+                self.stdout.write(
+                    f"  copied {campaigns_copied} "
+                    f"{campaign_model._meta.verbose_name_plural}"
+                )
+
+    def _copy_standalone(self, model, account_id, source, target, chunk_size):
+        last_id = 0
+        while True:
+            rows = list(
+                model._base_manager.using(source)
+                .filter(account_id=account_id, id__gt=last_id)
+                .order_by("id")[:chunk_size]
+            )
+            if not rows:
+                return
+            ids = [row.id for row in rows]
+            self._check_conflicts(model, ids, target)
+            with transaction.atomic(using=target):
+                insert_raw(model, rows, target)
+            last_id = ids[-1]
+
+    def _check_conflicts(self, model, ids, target):
+        taken = list(
+            model._base_manager.using(target)
+            .filter(id__in=ids)
+            .values_list("id", flat=True)[:10]
+        )
+        if taken:
+            raise CommandError(
+                f"{model._meta.verbose_name_plural} ids already used on {target}: "
+                f"{taken}. The move was aborted; the account stays on its source."
+            )
+
+    def _verify(self, account_id, source, target):
+        checks = [(model, "account_id") for model in STANDALONE_TABLES]
+        for campaign_model, payout_model in TABLES:
+            checks += [
+                (campaign_model, "account_id"),
+                (payout_model, "campaign__account_id"),
+            ]
+        for model, lookup in checks:
+            counts = [
+                model._base_manager.using(alias).filter(**{lookup: account_id}).count()
+                for alias in (source, target)
+            ]
+            if counts[0] != counts[1]:
+                raise CommandError(
+                    f"{model._meta.verbose_name_plural} count mismatch after "
+                    f"copy ({source}: {counts[0]}, {target}: {counts[1]})."
+                )
+
+    def _delete_account(self, account_id, alias, chunk_size):
+        for campaign_model, payout_model in TABLES:
+            campaigns = campaign_model._base_manager.using(alias).filter(
+                account_id=account_id
+            )
+            while True:
+                ids = list(campaigns.values_list("id", flat=True)[:chunk_size])
+                if not ids:
+                    break
+                with transaction.atomic(using=alias):
+                    payout_model._base_manager.using(alias).filter(
+                        campaign_id__in=ids
+                    )._raw_delete(alias)
+                    campaign_model._base_manager.using(alias).filter(
+                        id__in=ids
+                    )._raw_delete(alias)
+        for model in STANDALONE_TABLES:
+            rows = model._base_manager.using(alias).filter(account_id=account_id)
+            while True:
+                ids = list(rows.values_list("id", flat=True)[:chunk_size])
+                if not ids:
+                    break
+                model._base_manager.using(alias).filter(id__in=ids)._raw_delete(alias)
@@ -0,0 +1,52 @@
+"""
+Move archived campaigns back to the hot tables.
+
+Usage:
+
+    python manage.py restore_campaigns 42 --ids 1001 1002
+    python manage.py restore_campaigns 42          # every archived campaign
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from campaigns.archive import restore_campaigns
+from campaigns.models import ArchivedCampaign
+from campaigns.sharding import placement_for
+
+
+class Command(BaseCommand):
+    help = "Restore an account's archived campaigns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("account", type=int, help="Account id")
+        parser.add_argument("--ids", type=int, nargs="+", help="Campaign ids")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        placement = placement_for(options["account"])
+        if placement.moving:
+            raise CommandError("The account is being resharded, try again later.")
+        archived = ArchivedCampaign.objects.using(placement.alias).filter(
+            account_id=options["account"]
+        )
+        if options["ids"]:
+            archived = archived.filter(id__in=options["ids"])
+        ids = list(archived.order_by("id").values_list("id", flat=True))
+
+        restored = 0
+        for start in range(0, len(ids), options["batch_size"]):
+            end = start + options["batch_size"]
+            try:
+                restored += len(restore_campaigns(ids[start:end], placement.alias))
+            except serializers.ValidationError:
+                # Retry one by one so only the conflicting campaigns stay
+                for campaign_id in ids[start:end]:
+                    try:
+                        restored += len(
+                            restore_campaigns([campaign_id], placement.alias)
+                        )
+                    except serializers.ValidationError as exc:
+                        message = exc.detail["title"][0]
+                        self.stderr.write(f"Skipped {campaign_id}: {message}")
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} campaigns"))
@@ -0,0 +1,66 @@
+"""
+Start and stop campaigns at their scheduled ``start_at`` / ``end_at``.
+
+Every tick processes all shards; accounts being resharded are skipped
+until their move is done. Several instances can run side by side, see
+``campaigns.scheduling``. Each tick reports the transitions made and the
+largest lag between a campaign's scheduled time and its switch; a lag
+above ``--warn-lag`` seconds is logged as a warning.
+
+Usage:
+
+    python manage.py schedule_campaigns --interval 5
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from campaigns.scheduling import SCHEDULE_BATCH_SIZE, run_transitions
+from campaigns.sharding import moving_accounts, shards
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Start and stop campaigns whose scheduled start or end has come."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=SCHEDULE_BATCH_SIZE)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.0,
+            help="Run a tick every N seconds (0 runs once)",
+        )
+        parser.add_argument(
+            "--warn-lag",
+            type=float,
+            default=60.0,
+            help="Warn when a transition is this many seconds late",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            self._tick(options)
+            if not options["interval"]:
+                return
+            time.sleep(max(0.0, options["interval"] - (time.monotonic() - started)))
+
+    def _tick(self, options):
+        moving = moving_accounts()
+        for alias in shards():
+            stats = run_transitions(alias, options["batch_size"], moving)
+            if stats.max_lag > options["warn_lag"]:
+                logger.warning(
+                    f"Campaign transitions on {alias} lag "
+                    f"{stats.max_lag:.1f}s behind schedule"
+                )
+            if stats.transitions or options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{alias}: started {stats.started}, stopped {stats.stopped}, "
+                    f"dropped {stats.expired} expired starts, "
+                    f"max lag {stats.max_lag:.1f}s"
+                )
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+        ("campaigns", "0002_remove_campaign_campaigns_c_title_46e46a_idx_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountShard",
+            fields=[
+                (
+                    "account",
+                    models.OneToOneField(
+                        help_text="The account whose campaigns are placed",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="shard",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "alias",
+                    models.CharField(
+                        help_text="Database alias holding the account's campaigns",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "moving",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the account is being resharded",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        help_text="The date and time the placement last changed",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "account shard",
+                "verbose_name_plural": "account shards",
+            },
+        ),
+        migrations.AlterField(
+            model_name="campaign",
+            name="account",
+            field=models.ForeignKey(
+                db_constraint=False,
+                help_text="The account that owns this campaign",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="campaigns",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
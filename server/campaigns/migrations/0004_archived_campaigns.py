@@ -0,0 +1,141 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:57
+
+import django.db.models.deletion
+import django_countries.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0003_account_shards"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedCampaign",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "title",
+                    models.CharField(
+                        help_text="The title of the campaign", max_length=255
+                    ),
+                ),
+                (
+                    "landing_page_url",
+                    models.URLField(help_text="The URL of the landing page"),
+                ),
+                (
+                    "is_running",
+                    models.BooleanField(
+                        default=False, help_text="Whether the campaign is running"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        help_text="The date and time the campaign was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="The date and time the campaign was last updated"
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time the campaign was archived",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        help_text="The account that owns this campaign",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_campaigns",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "archived campaign",
+                "verbose_name_plural": "archived campaigns",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedCampaignPayout",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "country",
+                    django_countries.fields.CountryField(
+                        blank=True, max_length=2, null=True
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="The amount of the payout",
+                        max_digits=10,
+                    ),
+                ),
+                (
+                    "currency",
+                    models.CharField(
+                        choices=[("EUR", "Euro"), ("USD", "US Dollar")],
+                        default="EUR",
+                        help_text="The currency of the payout amount",
+                        max_length=3,
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Whether this payout is currently active",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        help_text="The date and time the payout was created"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        help_text="The date and time the payout was last updated"
+                    ),
+                ),
+                (
+                    "campaign",
+                    models.ForeignKey(
+                        help_text="The archived campaign this payout belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payouts",
+                        to="campaigns.archivedcampaign",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "archived campaign payout",
+                "verbose_name_plural": "archived campaign payouts",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedcampaign",
+            index=models.Index(
+                fields=["account", "archived_at"], name="campaigns_a_account_6c6889_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0004_archived_campaigns"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignAuditEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "account_id",
+                    models.BigIntegerField(
+                        help_text="The account that made the change"
+                    ),
+                ),
+                (
+                    "campaign_id",
+                    models.BigIntegerField(
+                        help_text="The campaign changed, or the payout's campaign"
+                    ),
+                ),
+                (
+                    "payout_id",
+                    models.BigIntegerField(
+                        blank=True, help_text="The payout changed, if any", null=True
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        help_text="What happened, e.g. campaign.updated", max_length=32
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Field values, or [old, new] pairs for updates",
+                    ),
+                ),
+                (
+                    "occurred_at",
+                    models.DateTimeField(
+                        help_text="The date and time the change was made"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "campaign audit event",
+                "verbose_name_plural": "campaign audit events",
+                "ordering": ["-occurred_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["account_id", "occurred_at"],
+                        name="campaigns_c_account_7b8bc7_idx",
+                    ),
+                    models.Index(
+                        fields=["campaign_id", "occurred_at"],
+                        name="campaigns_c_campaig_df6c4b_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0005_campaign_audit_events"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CampaignTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "account_id",
+                    models.BigIntegerField(
+                        help_text="The account that owned the campaign"
+                    ),
+                ),
+                (
+                    "campaign_id",
+                    models.BigIntegerField(help_text="The id of the removed campaign"),
+                ),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[("deleted", "Deleted"), ("archived", "Archived")],
+                        default="deleted",
+                        help_text="Why the campaign left the campaign list",
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="The date and time the campaign was removed",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "campaign tombstone",
+                "verbose_name_plural": "campaign tombstones",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="campaign",
+            index=models.Index(
+                fields=["account", "updated_at", "id"],
+                name="campaigns_c_account_02a84c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="campaigntombstone",
+            index=models.Index(
+                fields=["account_id", "deleted_at", "id"],
+                name="campaigns_c_account_6bd468_idx",
+            ),
+        ),
+    ]
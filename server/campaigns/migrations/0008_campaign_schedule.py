@@ -0,0 +1,63 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0007_idempotency_keys"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedcampaign",
+            name="end_at",
+            field=models.DateTimeField(
+                blank=True, help_text="When to stop the campaign", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedcampaign",
+            name="start_at",
+            field=models.DateTimeField(
+                blank=True, help_text="When to start the campaign", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="campaign",
+            name="end_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When to stop the campaign; cleared once it is stopped",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="campaign",
+            name="start_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When to start the campaign; cleared once it is started",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="campaign",
+            index=models.Index(
+                condition=models.Q(("is_running", False), ("start_at__isnull", False)),
+                fields=["start_at"],
+                name="campaign_pending_start_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="campaign",
+            index=models.Index(
+                condition=models.Q(("end_at__isnull", False), ("is_running", True)),
+                fields=["end_at"],
+                name="campaign_pending_end_idx",
+            ),
+        ),
+    ]
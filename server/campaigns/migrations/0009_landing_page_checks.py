@@ -0,0 +1,113 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0008_campaign_schedule"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LandingPageCheck",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "url",
+                    models.URLField(
+                        help_text="The checked landing page URL", unique=True
+                    ),
+                ),
+                (
+                    "ok",
+                    models.BooleanField(
+                        help_text="Whether the page answered with a non-error status"
+                    ),
+                ),
+                (
+                    "status_code",
+                    models.PositiveSmallIntegerField(
+                        blank=True,
+                        help_text="The HTTP status of the last answer",
+                        null=True,
+                    ),
+                ),
+                (
+                    "error",
+                    models.CharField(
+                        blank=True,
+                        help_text="Why the check got no answer",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "etag",
+                    models.CharField(
+                        blank=True, help_text="The page's ETag", max_length=255
+                    ),
+                ),
+                (
+                    "last_modified",
+                    models.CharField(
+                        blank=True,
+                        help_text="The page's Last-Modified header",
+                        max_length=64,
+                    ),
+                ),
+                (
+                    "checked_at",
+                    models.DateTimeField(
+                        help_text="The date and time the URL was last checked"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "landing page check",
+                "verbose_name_plural": "landing page checks",
+            },
+        ),
+        migrations.AddField(
+            model_name="archivedcampaign",
+            name="landing_page_checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the landing page was last checked",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedcampaign",
+            name="landing_page_ok",
+            field=models.BooleanField(
+                blank=True, help_text="The last landing page check result", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="campaign",
+            name="landing_page_checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the landing page was last checked",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="campaign",
+            name="landing_page_ok",
+            field=models.BooleanField(
+                blank=True,
+                help_text="Whether the landing page answered the last check",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:38
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+
+def rename_duplicate_titles(apps, schema_editor):
+    """
+    Titles used to be unique per account only with the same case; keep the
+    oldest campaign of each case-insensitive duplicate and suffix the others
+    with their id so the unique index can be built.
+    """
+    Campaign = apps.get_model("campaigns", "Campaign")
+    using = schema_editor.connection.alias
+    campaigns = Campaign.objects.using(using)
+    duplicates = (
+        campaigns.values("account_id", lower_title=Lower("title"))
+        .annotate(count=Count("id"), first_id=Min("id"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        for group in duplicates:
+            renamed = (
+                campaigns.alias(lower_title=Lower("title"))
+                .filter(
+                    account_id=group["account_id"], lower_title=group["lower_title"]
+                )
+                .exclude(id=group["first_id"])
+            )
+            for campaign in renamed:
+                suffix = f" ({campaign.id})"
+                campaign.title = campaign.title[: 255 - len(suffix)] + suffix
+                campaign.updated_at = now
+                campaign.save(update_fields=["title", "updated_at"])
+
+
+class AddConstraintConcurrently(migrations.AddConstraint):
+    """
+    On PostgreSQL, build the constraint's unique index with ``CREATE UNIQUE
+    INDEX CONCURRENTLY`` so writes to the table go on during the build.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        # A build interrupted earlier leaves an invalid index behind
+        schema_editor.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS %s"
+            % schema_editor.quote_name(self.constraint.name)
+        )
+        statement = self.constraint.create_sql(model, schema_editor)
+        statement.template = statement.template.replace(
+            "CREATE UNIQUE INDEX", "CREATE UNIQUE INDEX CONCURRENTLY", 1
+        )
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("campaigns", "0009_landing_page_checks"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_titles, migrations.RunPython.noop),
+        AddConstraintConcurrently(
+            model_name="campaign",
+            constraint=models.UniqueConstraint(
+                models.F("account"),
+                django.db.models.functions.text.Lower("title"),
+                name="unique_campaign_account_title",
+                violation_error_message="A campaign with this title already exists",
+            ),
+        ),
+    ]
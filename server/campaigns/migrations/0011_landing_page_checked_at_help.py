@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("campaigns", "0010_campaign_title_unique"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedcampaign",
+            name="landing_page_checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the landing page check result last changed",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="campaign",
+            name="landing_page_checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the landing page check result last changed",
+                null=True,
+            ),
+        ),
+    ]
@@ -8,10 +8,16 @@ Campaign and CampaignPayout models with their business logic.
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 from django_countries.fields import CountryField
+from rest_framework.utils.encoders import JSONEncoder
 
 from accounts.models import Account
 
+CAMPAIGN_TITLE_CONSTRAINT = "unique_campaign_account_title"
+CAMPAIGN_TITLE_TAKEN = "A campaign with this title already exists"
+
 
 class Campaign(models.Model):
     """
@@ -25,6 +31,10 @@ class Campaign(models.Model):
         title: The title/name of the campaign
         landing_page_url: The URL where users will be directed
         is_running: Whether the campaign is currently active
+        start_at: When the scheduler starts the campaign, if set
+        end_at: When the scheduler stops the campaign, if set
+        landing_page_ok: Whether the landing page answered the last check
+        landing_page_checked_at: When the landing page check result last changed
         created_at: When the campaign was created
         updated_at: When the campaign was last modified
     """
@@ -33,6 +43,8 @@ class Campaign(models.Model):
         Account,
         on_delete=models.CASCADE,
         related_name="campaigns",
+        # Campaigns may live on a shard without the accounts table
+        db_constraint=False,
         help_text="The account that owns this campaign",
     )
     title: models.CharField = models.CharField(
@@ -44,6 +56,26 @@ class Campaign(models.Model):
     is_running: models.BooleanField = models.BooleanField(
         default=False, help_text="Whether the campaign is running"
     )
+    start_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When to start the campaign; cleared once it is started",
+    )
+    end_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When to stop the campaign; cleared once it is stopped",
+    )
+    landing_page_ok: models.BooleanField = models.BooleanField(
+        null=True,
+        blank=True,
+        help_text="Whether the landing page answered the last check",
+    )
+    landing_page_checked_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the landing page check result last changed",
+    )
     created_at: models.DateTimeField = models.DateTimeField(
         auto_now_add=True, help_text="The date and time the campaign was created"
     )
@@ -55,9 +87,33 @@ class Campaign(models.Model):
         verbose_name = "campaign"
         verbose_name_plural = "campaigns"
         ordering = ["-created_at"]
+        constraints = [
+            # Titles are unique per account regardless of case. Creates and
+            # renames rely on this instead of looking the title up first,
+            # see CampaignSerializer
+            models.UniqueConstraint(
+                F("account"),
+                Lower("title"),
+                name=CAMPAIGN_TITLE_CONSTRAINT,
+                violation_error_message=CAMPAIGN_TITLE_TAKEN,
+            ),
+        ]
         indexes = [
             models.Index(fields=["account", "is_running"]),
             models.Index(fields=["account", "title"]),
+            # Keyset path of the change feed
+            models.Index(fields=["account", "updated_at", "id"]),
+            # Only campaigns waiting for the scheduler, see campaigns.scheduling
+            models.Index(
+                fields=["start_at"],
+                condition=models.Q(is_running=False, start_at__isnull=False),
+                name="campaign_pending_start_idx",
+            ),
+            models.Index(
+                fields=["end_at"],
+                condition=models.Q(is_running=True, end_at__isnull=False),
+                name="campaign_pending_end_idx",
+            ),
         ]
 
     def __str__(self) -> str:
@@ -190,3 +246,399 @@ class CampaignPayout(models.Model):
         """Save the payout instance with validation."""
         self.clean()
         super().save(*args, **kwargs)
+
+
+class AccountShard(models.Model):
+    """
+    Directory entry placing an account's campaign data on a shard.
+
+    Entries always live on the default database. Accounts without an entry
+    keep their campaigns on ``default``.
+
+    Attributes:
+        account: The account whose campaigns are placed
+        alias: Database alias holding the account's campaigns
+        moving: Whether the account is being resharded; writes are refused
+        updated_at: When the placement last changed
+    """
+
+    account: models.OneToOneField[Account] = models.OneToOneField(
+        Account,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="shard",
+        help_text="The account whose campaigns are placed",
+    )
+    alias: models.CharField = models.CharField(
+        max_length=64, help_text="Database alias holding the account's campaigns"
+    )
+    moving: models.BooleanField = models.BooleanField(
+        default=False, help_text="Whether the account is being resharded"
+    )
+    updated_at: models.DateTimeField = models.DateTimeField(
+        auto_now=True, help_text="The date and time the placement last changed"
+    )
+
+    class Meta:
+        verbose_name = "account shard"
+        verbose_name_plural = "account shards"
+
+    def __str__(self) -> str:
+        """Return string representation of the placement."""
+        return f"{self.account_id} -> {self.alias}"
+
+
+class ArchivedCampaign(models.Model):
+    """
+    Cold copy of a stopped campaign moved out of the hot table.
+
+    Rows keep the id they had in ``Campaign`` so they can be restored
+    unchanged. See ``campaigns.archive``.
+
+    Attributes:
+        id: The id the campaign had in the hot table
+        account: The account that owns this campaign
+        title: The title/name of the campaign
+        landing_page_url: The URL where users will be directed
+        is_running: Always False; kept so restored rows round-trip
+        start_at: The scheduled start the campaign had
+        end_at: The scheduled stop the campaign had
+        landing_page_ok: The last landing page check result
+        landing_page_checked_at: When the landing page check result last changed
+        created_at: When the campaign was created
+        updated_at: When the campaign was last modified before archiving
+        archived_at: When the campaign was archived
+    """
+
+    id: models.BigIntegerField = models.BigIntegerField(primary_key=True)
+    account: models.ForeignKey[Account] = models.ForeignKey(
+        Account,
+        on_delete=models.CASCADE,
+        related_name="archived_campaigns",
+        db_constraint=False,
+        help_text="The account that owns this campaign",
+    )
+    title: models.CharField = models.CharField(
+        max_length=255, help_text="The title of the campaign"
+    )
+    landing_page_url: models.URLField = models.URLField(
+        help_text="The URL of the landing page"
+    )
+    is_running: models.BooleanField = models.BooleanField(
+        default=False, help_text="Whether the campaign is running"
+    )
+    start_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, help_text="When to start the campaign"
+    )
+    end_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, help_text="When to stop the campaign"
+    )
+    landing_page_ok: models.BooleanField = models.BooleanField(
+        null=True, blank=True, help_text="The last landing page check result"
+    )
+    landing_page_checked_at: models.DateTimeField = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the landing page check result last changed",
+    )
+    created_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the campaign was created"
+    )
+    updated_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the campaign was last updated"
+    )
+    archived_at: models.DateTimeField = models.DateTimeField(
+        auto_now_add=True, help_text="The date and time the campaign was archived"
+    )
+
+    class Meta:
+        verbose_name = "archived campaign"
+        verbose_name_plural = "archived campaigns"
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["account", "archived_at"])]
+
+    def __str__(self) -> str:
+        """Return string representation of the archived campaign."""
+        return f"{self.title} (archived)"
+
+
+class ArchivedCampaignPayout(models.Model):
+    """
+    Cold copy of a payout belonging to an archived campaign.
+
+    Attributes:
+        id: The id the payout had in the hot table
+        campaign: The archived campaign this payout belongs to
+        country: Specific country (None for worldwide)
+        amount: Payment amount
+        currency: Currency code (EUR, USD)
+        is_active: Whether this payout was active
+        created_at: When the payout was created
+        updated_at: When the payout was last modified
+    """
+
+    id: models.BigIntegerField = models.BigIntegerField(primary_key=True)
+    campaign: models.ForeignKey[ArchivedCampaign] = models.ForeignKey(
+        ArchivedCampaign,
+        on_delete=models.CASCADE,
+        related_name="payouts",
+        help_text="The archived campaign this payout belongs to",
+    )
+    country = CountryField(blank=True, null=True)
+    amount: models.DecimalField = models.DecimalField(
+        max_digits=10, decimal_places=2, help_text="The amount of the payout"
+    )
+    currency: models.CharField = models.CharField(
+        max_length=3,
+        choices=[("EUR", "Euro"), ("USD", "US Dollar")],
+        default="EUR",
+        help_text="The currency of the payout amount",
+    )
+    is_active: models.BooleanField = models.BooleanField(
+        default=True, help_text="Whether this payout is currently active"
+    )
+    created_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the payout was created"
+    )
+    updated_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the payout was last updated"
+    )
+
+    class Meta:
+        verbose_name = "archived campaign payout"
+        verbose_name_plural = "archived campaign payouts"
+        ordering = ["-created_at"]
+
+    @property
+    def is_worldwide(self) -> bool:
+        """Check if the payout is worldwide."""
+        return not self.country
+
+    @property
+    def display_country(self) -> str:
+        """Get the display name of the country."""
+        return self.country.name if self.country else "Worldwide"
+
+    def __str__(self) -> str:
+        """Return string representation of the payout."""
+        return f"{self.campaign_id} - {self.display_country} (archived)"
+
+
+class LandingPageCheck(models.Model):
+    """
+    Last health check of a landing page URL, shared by every campaign using it.
+
+    Kept on the default database and reused by ``campaigns.landing_pages``
+    until it is older than the checker's maximum age; its validators make
+    the next check a conditional request.
+
+    Attributes:
+        url: The checked landing page URL
+        ok: Whether the page answered with a non-error status
+        status_code: The HTTP status of the last answer, if any
+        error: Why the check failed without an answer, if it did
+        etag: The page's ETag, sent back as If-None-Match
+        last_modified: The page's Last-Modified, sent back as If-Modified-Since
+        checked_at: When the URL was last checked
+    """
+
+    url: models.URLField = models.URLField(
+        unique=True, help_text="The checked landing page URL"
+    )
+    ok: models.BooleanField = models.BooleanField(
+        help_text="Whether the page answered with a non-error status"
+    )
+    status_code: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        null=True, blank=True, help_text="The HTTP status of the last answer"
+    )
+    error: models.CharField = models.CharField(
+        max_length=255, blank=True, help_text="Why the check got no answer"
+    )
+    etag: models.CharField = models.CharField(
+        max_length=255, blank=True, help_text="The page's ETag"
+    )
+    last_modified: models.CharField = models.CharField(
+        max_length=64, blank=True, help_text="The page's Last-Modified header"
+    )
+    checked_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the URL was last checked"
+    )
+
+    class Meta:
+        verbose_name = "landing page check"
+        verbose_name_plural = "landing page checks"
+
+    def __str__(self) -> str:
+        """Return string representation of the check."""
+        return f"{self.url} {'ok' if self.ok else 'broken'} at {self.checked_at}"
+
+
+class CampaignTombstone(models.Model):
+    """
+    Deletion log entry telling syncing clients a campaign is gone.
+
+    Written when a campaign is deleted or archived, removed again when an
+    archived campaign is restored, and purged after
+    ``CAMPAIGN_TOMBSTONE_RETENTION_DAYS``.
+
+    Attributes:
+        account_id: The account that owned the campaign
+        campaign_id: The id of the removed campaign
+        reason: Why the campaign left the list (deleted or archived)
+        deleted_at: When the campaign was removed
+    """
+
+    account_id: models.BigIntegerField = models.BigIntegerField(
+        help_text="The account that owned the campaign"
+    )
+    campaign_id: models.BigIntegerField = models.BigIntegerField(
+        help_text="The id of the removed campaign"
+    )
+    reason: models.CharField = models.CharField(
+        max_length=16,
+        choices=[("deleted", "Deleted"), ("archived", "Archived")],
+        default="deleted",
+        help_text="Why the campaign left the campaign list",
+    )
+    deleted_at: models.DateTimeField = models.DateTimeField(
+        auto_now_add=True, help_text="The date and time the campaign was removed"
+    )
+
+    class Meta:
+        verbose_name = "campaign tombstone"
+        verbose_name_plural = "campaign tombstones"
+        indexes = [models.Index(fields=["account_id", "deleted_at", "id"])]
+
+    def __str__(self) -> str:
+        """Return string representation of the tombstone."""
+        return f"campaign {self.campaign_id} {self.reason} at {self.deleted_at}"
+
+
+class CampaignAuditEvent(models.Model):
+    """
+    Append-only record of a change to a campaign or payout.
+
+    Events are written in batches by ``campaigns.audit`` after the change
+    commits. Ids are kept as plain integers so the trail outlives deleted
+    rows and works across shards.
+
+    Attributes:
+        account_id: The account that made the change
+        campaign_id: The campaign changed, or the payout's campaign
+        payout_id: The payout changed, if the event is about a payout
+        action: What happened, e.g. ``campaign.updated``
+        changes: Field values, or ``[old, new]`` pairs for updates
+        occurred_at: When the change was made
+    """
+
+    account_id: models.BigIntegerField = models.BigIntegerField(
+        help_text="The account that made the change"
+    )
+    campaign_id: models.BigIntegerField = models.BigIntegerField(
+        help_text="The campaign changed, or the payout's campaign"
+    )
+    payout_id: models.BigIntegerField = models.BigIntegerField(
+        null=True, blank=True, help_text="The payout changed, if any"
+    )
+    action: models.CharField = models.CharField(
+        max_length=32, help_text="What happened, e.g. campaign.updated"
+    )
+    changes: models.JSONField = models.JSONField(
+        default=dict, help_text="Field values, or [old, new] pairs for updates"
+    )
+    occurred_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the change was made"
+    )
+
+    class Meta:
+        verbose_name = "campaign audit event"
+        verbose_name_plural = "campaign audit events"
+        ordering = ["-occurred_at"]
+        indexes = [
+            models.Index(fields=["account_id", "occurred_at"]),
+            models.Index(fields=["campaign_id", "occurred_at"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return string representation of the event."""
+        return f"{self.action} campaign={self.campaign_id} at {self.occurred_at}"
+
+    def save(self, *args, **kwargs) -> None:
+        """Insert the event; recorded events are never modified."""
+        if not self._state.adding:
+            raise ValueError("Audit events are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Refuse to delete recorded events."""
+        raise ValueError("Audit events are append-only")
+
+
+class IdempotencyKey(models.Model):
+    """
+    Outcome of a POST request sent with an ``Idempotency-Key`` header.
+
+    The first request with a key claims the row, later ones with the same
+    key wait for it to finish and get its stored response back. Rows are
+    kept until ``expires_at`` and then purged.
+
+    Attributes:
+        account_id: The account that sent the request
+        key: The client-chosen ``Idempotency-Key``
+        fingerprint: Hash of the method, path and body of the request
+        status: Whether the first request is still running
+        response_status: HTTP status of the stored response
+        response_data: Body of the stored response
+        created_at: When the key was claimed
+        expires_at: When the key can be reused
+    """
+
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+    account_id: models.BigIntegerField = models.BigIntegerField(
+        help_text="The account that sent the request"
+    )
+    key: models.CharField = models.CharField(
+        max_length=255, help_text="The client-chosen Idempotency-Key"
+    )
+    fingerprint: models.CharField = models.CharField(
+        max_length=64, help_text="Hash of the method, path and body of the request"
+    )
+    status: models.CharField = models.CharField(
+        max_length=16,
+        choices=[(IN_PROGRESS, "In progress"), (COMPLETED, "Completed")],
+        default=IN_PROGRESS,
+        help_text="Whether the first request is still running",
+    )
+    response_status: models.PositiveSmallIntegerField = (
+        models.PositiveSmallIntegerField(
+            null=True, blank=True, help_text="HTTP status of the stored response"
+        )
+    )
+    response_data: models.JSONField = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=JSONEncoder,
+        help_text="Body of the stored response",
+    )
+    created_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the key was claimed"
+    )
+    expires_at: models.DateTimeField = models.DateTimeField(
+        help_text="The date and time the key can be reused"
+    )
+
+    class Meta:
+        verbose_name = "idempotency key"
+        verbose_name_plural = "idempotency keys"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["account_id", "key"], name="unique_account_idempotency_key"
+            ),
+        ]
+        indexes = [models.Index(fields=["expires_at"])]
+
+    def __str__(self) -> str:
+        """Return string representation of the key."""
+        return f"{self.key} ({self.status})"
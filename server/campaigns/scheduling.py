@@ -0,0 +1,116 @@
+"""
+Scheduled starts and stops of campaigns.
+
+A stopped campaign with ``start_at`` is started once that time has come
+and a running campaign with ``end_at`` is stopped then. The applied time
+is cleared, so a campaign stopped or restarted by hand afterwards stays
+that way. A start whose ``end_at`` has already passed is dropped with it.
+
+Due campaigns are found through partial indexes holding only the
+campaigns still waiting for a transition, and switched with one
+``UPDATE`` per batch, so a tick costs in proportion to the campaigns
+actually transitioning. Batches are claimed with ``SELECT ... FOR UPDATE
+SKIP LOCKED`` where the database has it, so several schedulers can run
+at once without waiting on each other; on SQLite ``BEGIN IMMEDIATE``
+transactions run them one at a time. The ``UPDATE`` re-checks the due
+condition either way, so a campaign is switched only once.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from server.pagination import bump_count_version
+
+from .audit import record_change
+from .events import publish_change
+from .filters import campaign_count_scope
+from .models import Campaign
+
+SCHEDULE_BATCH_SIZE = 500
+
+
+@dataclass
+class TransitionStats:
+    """Outcome of one scheduler pass over a database."""
+
+    started: int = 0
+    stopped: int = 0
+    # Starts dropped because the campaign's end had passed as well
+    expired: int = 0
+    # Largest delay, in seconds, between a scheduled time and its switch
+    max_lag: float = 0.0
+
+    @property
+    def transitions(self) -> int:
+        return self.started + self.stopped + self.expired
+
+
+def due_starts(campaigns: QuerySet, now: datetime) -> QuerySet:
+    return campaigns.filter(is_running=False, start_at__isnull=False, start_at__lte=now)
+
+
+def due_stops(campaigns: QuerySet, now: datetime) -> QuerySet:
+    return campaigns.filter(is_running=True, end_at__isnull=False, end_at__lte=now)
+
+
+def run_transitions(
+    using: str,
+    batch_size: int = SCHEDULE_BATCH_SIZE,
+    exclude_accounts: Iterable[int] = (),
+    stats: Optional[TransitionStats] = None,
+) -> TransitionStats:
+    """Start and stop every campaign on ``using`` that is due."""
+    stats = stats or TransitionStats()
+    campaigns = Campaign.objects.using(using).exclude(
+        account_id__in=list(exclude_accounts)
+    )
+    for start in (True, False):
+        while _run_batch(campaigns, start, using, batch_size, stats) == batch_size:
+            pass
+    return stats
+
+
+def _run_batch(campaigns, start, using, batch_size, stats) -> int:
+    now = timezone.now()
+    field = "start_at" if start else "end_at"
+    due = due_starts(campaigns, now) if start else due_stops(campaigns, now)
+    with transaction.atomic(using=using):
+        rows = list(
+            due.order_by(field)
+            .select_for_update(skip_locked=True)
+            .values_list("id", "account_id", field, "end_at")[:batch_size]
+        )
+        if not rows:
+            return 0
+        if start:
+            expired = {row[0] for row in rows if row[3] is not None and row[3] <= now}
+            switched = [row for row in rows if row[0] not in expired]
+            stats.started += due.filter(id__in=[row[0] for row in switched]).update(
+                is_running=True, start_at=None, updated_at=now
+            )
+            stats.expired += due.filter(id__in=expired).update(
+                start_at=None, end_at=None, updated_at=now
+            )
+        else:
+            switched = rows
+            stats.stopped += due.filter(id__in=[row[0] for row in rows]).update(
+                is_running=False, end_at=None, updated_at=now
+            )
+
+        for campaign_id, account_id, due_at, _ in switched:
+            stats.max_lag = max(stats.max_lag, (now - due_at).total_seconds())
+            changes = {"is_running": [not start, start]}
+            record_change(
+                "campaign.updated", account_id, campaign_id, changes, using=using
+            )
+            publish_change("campaign.updated", account_id, campaign_id, using=using)
+        for account_id in {row[1] for row in rows}:
+            bump_count_version(campaign_count_scope(account_id), using=using)
+    return len(rows)
@@ -9,10 +9,30 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-from django.db import transaction
+from django.db import IntegrityError, router, transaction
 from rest_framework import serializers
 
-from .models import Campaign, CampaignPayout
+from .models import (
+    CAMPAIGN_TITLE_CONSTRAINT,
+    CAMPAIGN_TITLE_TAKEN,
+    ArchivedCampaign,
+    ArchivedCampaignPayout,
+    Campaign,
+    CampaignPayout,
+)
+
+
+def raise_for_title_conflict(exc: IntegrityError) -> None:
+    """
+    Turn a violation of the per-account title constraint into the field
+    error clients get for a taken title; other integrity errors propagate.
+    """
+    if CAMPAIGN_TITLE_CONSTRAINT in str(exc):
+        raise serializers.ValidationError({"title": [CAMPAIGN_TITLE_TAKEN]}) from exc
+
+
+# Campaign ids accepted by one bulk delete request
+BULK_DELETE_MAX_IDS = 10000
 
 
 class CampaignPayoutSerializer(serializers.ModelSerializer):
@@ -82,7 +102,7 @@ class CampaignPayoutSerializer(serializers.ModelSerializer):
             ValidationError: If business rules are violated
         """
         campaign = attrs.get("campaign") or (
-            self.instance.campaign if self.instance else None
+            self.instance.campaign_id if self.instance else None
         )
 
         # Skip validation during campaign creation when no campaign is set yet
@@ -144,36 +164,41 @@ class CampaignSerializer(serializers.ModelSerializer):
             "title",
             "landing_page_url",
             "is_running",
+            "start_at",
+            "end_at",
+            "landing_page_ok",
+            "landing_page_checked_at",
             "payouts",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["created_at", "updated_at"]
+        read_only_fields = [
+            "landing_page_ok",
+            "landing_page_checked_at",
+            "created_at",
+            "updated_at",
+        ]
 
-    def validate_title(self, title: str) -> str:
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Validate campaign title uniqueness per account.
+        Validate the scheduled start and end of the campaign.
 
         Args:
-            title: Campaign title to validate
+            attrs: Validated campaign data
 
         Returns:
-            Validated title
+            Validated campaign data
 
         Raises:
-            ValidationError: If title already exists for the account
+            ValidationError: If the campaign would end before it starts
         """
-        # Skip validation during campaign update if title unchanged
-        if self.instance and self.instance.title == title:
-            return title
-
-        # Check if a campaign with this title already exists for the user
-        user = self.context["request"].user
-        if Campaign.objects.filter(account=user, title=title).exists():
+        start_at = attrs.get("start_at", getattr(self.instance, "start_at", None))
+        end_at = attrs.get("end_at", getattr(self.instance, "end_at", None))
+        if start_at and end_at and end_at <= start_at:
             raise serializers.ValidationError(
-                "A campaign with this title already exists"
+                {"end_at": ["The end must be after the start."]}
             )
-        return title
+        return attrs
 
     def validate_payouts(self, payouts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -245,22 +270,27 @@ class CampaignSerializer(serializers.ModelSerializer):
         """
         payouts_data = validated_data.pop("payouts", [])
 
-        with transaction.atomic():
-            campaign = Campaign.objects.create(**validated_data)
+        try:
+            with transaction.atomic(using=router.db_for_write(Campaign)):
+                # Title uniqueness is left to the database, see Campaign.Meta
+                campaign = Campaign.objects.create(**validated_data)
 
-            # Create payouts in batch for better performance
-            payout_instances = []
-            for payout_data in payouts_data:
-                payout_data["campaign"] = campaign.id
-                serializer = CampaignPayoutSerializer(data=payout_data)
-                serializer.is_valid(raise_exception=True)
-                payout_instances.append(CampaignPayout(**serializer.validated_data))
+                # Create payouts in batch for better performance
+                payout_instances = []
+                for payout_data in payouts_data:
+                    payout_data["campaign"] = campaign.id
+                    serializer = CampaignPayoutSerializer(data=payout_data)
+                    serializer.is_valid(raise_exception=True)
+                    payout_instances.append(CampaignPayout(**serializer.validated_data))
 
-            # Bulk create for better performance
-            if payout_instances:
-                CampaignPayout.objects.bulk_create(payout_instances)
+                # Bulk create for better performance
+                if payout_instances:
+                    CampaignPayout.objects.bulk_create(payout_instances)
 
-            return campaign
+                return campaign
+        except IntegrityError as exc:
+            raise_for_title_conflict(exc)
+            raise
 
     def update(self, instance: Campaign, validated_data: Dict[str, Any]) -> Campaign:
         """
@@ -275,27 +305,35 @@ class CampaignSerializer(serializers.ModelSerializer):
         """
         payouts_data = validated_data.pop("payouts", [])
 
-        with transaction.atomic():
-            # Update campaign fields
-            for attr, value in validated_data.items():
-                setattr(instance, attr, value)
-            instance.save()
-
-            if payouts_data:
-                # Delete existing payouts
-                instance.payouts.all().delete()
-
-                # Create new payouts
-                payout_instances = []
-                for payout_data in payouts_data:
-                    payout_data["campaign"] = instance.id
-                    serializer = CampaignPayoutSerializer(data=payout_data)
-                    serializer.is_valid(raise_exception=True)
-                    payout_instances.append(CampaignPayout(**serializer.validated_data))
-
-                # Bulk create for better performance
-                if payout_instances:
-                    CampaignPayout.objects.bulk_create(payout_instances)
+        try:
+            with transaction.atomic(
+                using=router.db_for_write(Campaign, instance=instance)
+            ):
+                # Update campaign fields
+                for attr, value in validated_data.items():
+                    setattr(instance, attr, value)
+                instance.save()
+
+                if payouts_data:
+                    # Delete existing payouts
+                    instance.payouts.all().delete()
+
+                    # Create new payouts
+                    payout_instances = []
+                    for payout_data in payouts_data:
+                        payout_data["campaign"] = instance.id
+                        serializer = CampaignPayoutSerializer(data=payout_data)
+                        serializer.is_valid(raise_exception=True)
+                        payout_instances.append(
+                            CampaignPayout(**serializer.validated_data)
+                        )
+
+                    # Bulk create for better performance
+                    if payout_instances:
+                        CampaignPayout.objects.bulk_create(payout_instances)
+        except IntegrityError as exc:
+            raise_for_title_conflict(exc)
+            raise
 
         return instance
 
@@ -333,8 +371,61 @@ class CampaignListSerializer(serializers.ModelSerializer):
             "title",
             "landing_page_url",
             "is_running",
+            "start_at",
+            "end_at",
+            "landing_page_ok",
+            "landing_page_checked_at",
             "payouts",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["created_at", "updated_at"]
+        read_only_fields = [
+            "landing_page_ok",
+            "landing_page_checked_at",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class ArchivedCampaignPayoutSerializer(CampaignPayoutSerializer):
+    """Read-only serializer for payouts of archived campaigns."""
+
+    class Meta(CampaignPayoutSerializer.Meta):
+        model = ArchivedCampaignPayout
+
+
+class ArchivedCampaignListSerializer(serializers.ModelSerializer):
+    """
+    Serializer for archived campaigns in the campaign list.
+
+    Matches CampaignListSerializer and flags the entry as archived.
+    """
+
+    payouts = ArchivedCampaignPayoutSerializer(many=True, read_only=True)
+    is_archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedCampaign
+        fields = CampaignListSerializer.Meta.fields + ["is_archived", "archived_at"]
+        read_only_fields = fields
+
+    def get_is_archived(self, instance: ArchivedCampaign) -> bool:
+        return True
+
+
+class CampaignBulkDeleteSerializer(serializers.Serializer):
+    """
+    Input of the bulk delete action.
+
+    ``ids`` selects the campaigns to delete; when it is omitted the
+    request's filter parameters do. With ``background`` the deletion is
+    queued as a job instead of running in the request.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=BULK_DELETE_MAX_IDS,
+    )
+    background = serializers.BooleanField(default=False)
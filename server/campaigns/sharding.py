@@ -0,0 +1,155 @@
+"""
+Account-based placement of campaign data across shards.
+
+``DATABASE_SHARDS`` lists the aliases holding campaign tables, ``default``
+first. The ``AccountShard`` directory on ``default`` is authoritative: new
+accounts are placed there by a stable hash of their id, and accounts
+without an entry keep their data on ``default``. ``ShardRouter`` sends
+campaign queries to the placement resolved for the current request.
+"""
+
+from __future__ import annotations
+
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Models stored on the account's shard, as ``app_label.model_name``
+SHARDED_MODELS = {
+    "campaigns.campaign",
+    "campaigns.campaignpayout",
+    "campaigns.archivedcampaign",
+    "campaigns.archivedcampaignpayout",
+    "campaigns.campaigntombstone",
+}
+
+# Each shard allocates campaign ids from its own range so moved rows keep
+# their ids without colliding with the target's own rows
+SHARD_ID_SPACING = 10**12
+
+_current_shard: ContextVar[Optional[str]] = ContextVar("current_shard", default=None)
+
+
+class AccountMoving(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Campaign data is being moved, retry shortly."
+    default_code = "account_moving"
+
+
+@dataclass(frozen=True)
+class Placement:
+    alias: str
+    moving: bool = False
+
+
+def shards() -> List[str]:
+    return list(getattr(settings, "DATABASE_SHARDS", [DEFAULT_DB_ALIAS]))
+
+
+def sharding_enabled() -> bool:
+    return len(shards()) > 1
+
+
+def hash_shard(account_id: Any) -> str:
+    """Pick a shard for a new account; stable for a given shard list."""
+    aliases = shards()
+    return aliases[zlib.crc32(str(account_id).encode()) % len(aliases)]
+
+
+def placement_for(account_id: Any) -> Placement:
+    """Look up where an account's campaign data lives."""
+    from .models import AccountShard
+
+    row = (
+        AccountShard.objects.using(DEFAULT_DB_ALIAS)
+        .filter(account_id=account_id)
+        .values_list("alias", "moving")
+        .first()
+    )
+    return Placement(*row) if row else Placement(DEFAULT_DB_ALIAS)
+
+
+def moving_accounts() -> List[int]:
+    """Accounts being resharded, whose campaign rows must not be written."""
+    from .models import AccountShard
+
+    return list(
+        AccountShard.objects.using(DEFAULT_DB_ALIAS)
+        .filter(moving=True)
+        .values_list("account_id", flat=True)
+    )
+
+
+def place_account(account_id: Any) -> str:
+    """Record a hash placement for a new account and return its shard."""
+    from .models import AccountShard
+
+    entry, _ = AccountShard.objects.using(DEFAULT_DB_ALIAS).get_or_create(
+        account_id=account_id, defaults={"alias": hash_shard(account_id)}
+    )
+    return entry.alias
+
+
+def current_shard() -> Optional[str]:
+    """The shard resolved for the current request, if any."""
+    return _current_shard.get()
+
+
+def set_current_shard(alias: Optional[str]):
+    """Route sharded models to ``alias`` in this context; returns a token."""
+    return _current_shard.set(alias)
+
+
+def reset_current_shard(token) -> None:
+    _current_shard.reset(token)
+
+
+@contextmanager
+def use_shard(alias: str) -> Iterator[None]:
+    """Route sharded models to ``alias`` within the block."""
+    token = set_current_shard(alias)
+    try:
+        yield
+    finally:
+        reset_current_shard(token)
+
+
+def reserve_id_range(using: str, **kwargs: Any) -> None:
+    """
+    Start an empty shard's campaign id sequences in its own range.
+
+    Connected to ``post_migrate``; shard ``n`` of ``DATABASE_SHARDS`` hands
+    out ids from ``n * SHARD_ID_SPACING``.
+    """
+    from .models import Campaign, CampaignPayout, CampaignTombstone
+
+    aliases = shards()
+    if using not in aliases or aliases.index(using) == 0:
+        return
+    start = aliases.index(using) * SHARD_ID_SPACING
+    connection = connections[using]
+    for model in (Campaign, CampaignPayout, CampaignTombstone):
+        table = model._meta.db_table
+        if table not in connection.introspection.table_names():
+            continue
+        if model._base_manager.using(using).exists():
+            continue
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("DELETE FROM sqlite_sequence WHERE name = %s", [table])
+                cursor.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)",
+                    [table, start],
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, 'id'), %s, false)",
+                    [table, start + 1],
+                )
@@ -0,0 +1,23 @@
+"""
+Signal handlers keeping sharded campaign data in step with accounts.
+"""
+
+from django.db import DEFAULT_DB_ALIAS
+
+from .deletion import purge_account_campaigns
+from .sharding import place_account, placement_for, sharding_enabled
+
+
+def place_new_account(sender, instance, created, raw=False, **kwargs):
+    """Give every new account a shard placement."""
+    if created and not raw and sharding_enabled():
+        place_account(instance.pk)
+
+
+def delete_sharded_campaigns(sender, instance, **kwargs):
+    """Delete campaigns the account's cascade on ``default`` cannot reach."""
+    if not sharding_enabled():
+        return
+    alias = placement_for(instance.pk).alias
+    if alias != DEFAULT_DB_ALIAS:
+        purge_account_campaigns(instance.pk, alias)
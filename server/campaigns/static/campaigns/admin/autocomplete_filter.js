@@ -0,0 +1,18 @@
+'use strict';
+{
+    const $ = django.jQuery;
+    // Reload the changelist filtered by the object picked in an
+    // AutocompleteFilter, starting again from the first page.
+    $(function() {
+        $('.autocomplete-filter select').on('change', function() {
+            const params = new URLSearchParams(window.location.search);
+            params.delete('p');
+            if (this.value) {
+                params.set(this.name, this.value);
+            } else {
+                params.delete(this.name);
+            }
+            window.location.search = params.toString();
+        });
+    });
+}
@@ -0,0 +1,119 @@
+"""
+Server-Sent Events stream of an account's campaign changes.
+
+``GET /api/campaigns/events/`` keeps one idle connection per dashboard
+instead of polling the list. It is an async view: under the ASGI app
+(``server.asgi``) an open stream costs a coroutine, not a worker thread.
+Browsers' ``EventSource`` cannot send headers, so the stream also accepts
+a ``?ticket=`` from ``POST /api/campaigns/events/ticket/`` instead of the
+JWT access token: URLs end up in access logs, and a ticket is only good
+for opening this stream, for ``CAMPAIGN_EVENTS_TICKET_MAX_AGE`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .events import broker
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RECONNECT_MS = 3000
+TICKET_PARAM = "ticket"
+
+_SALT = "campaigns.streams"
+
+
+def make_ticket(user) -> str:
+    """Signed ticket letting ``user`` open their event stream."""
+    return signing.dumps({"user": user.pk}, salt=_SALT)
+
+
+def _ticket_user(ticket: str) -> Optional[Any]:
+    try:
+        data = signing.loads(
+            ticket, salt=_SALT, max_age=settings.CAMPAIGN_EVENTS_TICKET_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=data.get("user"), is_active=True).first()
+
+
+def authenticate(request: HttpRequest) -> Optional[Any]:
+    """The user of the request's access token header or ``?ticket=``."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        ticket = request.GET.get(TICKET_PARAM)
+        return _ticket_user(ticket) if ticket else None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def format_event(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def event_stream(account_id: Any) -> AsyncIterator[str]:
+    """SSE lines for the account's events, with comment heartbeats when idle."""
+    subscription = broker.subscribe(account_id)
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), settings.CAMPAIGN_EVENTS_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing the idle connection
+                yield ": keep-alive\n\n"
+                continue
+            event = {key: value for key, value in event.items() if key != "account_id"}
+            yield format_event(event)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@require_GET
+async def campaign_events(request: HttpRequest):
+    user = await sync_to_async(authenticate)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+    response = StreamingHttpResponse(
+        event_stream(user.pk), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Stream through nginx unbuffered
+    return response
+
+
+class CampaignEventsTicketView(APIView):
+    """``POST /api/campaigns/events/ticket/``: a ticket to open the stream."""
+
+    def post(self, request):
+        return Response(
+            {
+                "ticket": make_ticket(request.user),
+                "param": TICKET_PARAM,
+                "expires_in": settings.CAMPAIGN_EVENTS_TICKET_MAX_AGE,
+            }
+        )
@@ -0,0 +1,414 @@
+"""
+Synthetic campaign data generation for load testing.
+
+Rows are generated as plain tuples and written with multi-row inserts
+(``COPY`` on PostgreSQL), bypassing model ``save()`` and the per-payout
+validation queries in ``CampaignPayout.clean()``. Primary keys are assigned
+up front so payouts can reference their campaigns without reading ids back
+and so parallel workers can write disjoint id ranges.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import random
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import connections, models, transaction
+from django_countries import countries
+
+from .models import Campaign, CampaignPayout
+
+# Rough traffic-weighted country mix; the remaining weight is spread
+# over every other country as a long tail
+COUNTRY_WEIGHTS = {
+    "US": 24,
+    "GB": 9,
+    "DE": 8,
+    "FR": 6,
+    "CA": 5,
+    "ES": 4,
+    "IT": 4,
+    "NL": 3,
+    "SE": 3,
+    "FI": 2,
+    "BR": 3,
+    "IN": 4,
+    "JP": 3,
+    "AU": 2,
+}
+LONG_TAIL_WEIGHT = 20
+
+TITLE_ADJECTIVES = [
+    "Spring", "Summer", "Autumn", "Winter", "Flash", "Holiday", "Black Friday",
+    "Launch", "Loyalty", "Clearance", "Weekend", "Exclusive", "Mega", "Early Bird",
+]  # fmt: skip
+TITLE_SUBJECTS = [
+    "Sale", "Promotion", "Giveaway", "Campaign", "Deals", "Offer", "Bundle",
+    "Discount", "Event", "Special", "Drop", "Challenge",
+]  # fmt: skip
+LANDING_DOMAINS = [f"shop{i}.example.com" for i in range(200)]
+
+
+@dataclass
+class GeneratorOptions:
+    """Knobs controlling the shape of the generated data."""
+
+    max_payouts: int = 5
+    worldwide_ratio: float = 0.2
+    usd_ratio: float = 0.3
+    running_ratio: float = 0.4
+    title_collision_ratio: float = 0.3
+    history_days: int = 365
+    batch_size: int = 20000
+    seed: int = 0
+
+
+@dataclass
+class WorkChunk:
+    """A slice of accounts assigned to one worker, with its id ranges."""
+
+    accounts: List[Tuple[int, int]]  # (account_id, campaign_count)
+    campaign_id_start: int
+    payout_id_start: int
+    seed: int
+    database: str = "default"
+    options: GeneratorOptions = field(default_factory=GeneratorOptions)
+
+
+def campaigns_per_account(
+    account_ids: Sequence[int], total: int, rng: random.Random
+) -> List[Tuple[int, int]]:
+    """
+    Split ``total`` campaigns across accounts with a heavy-tailed skew.
+
+    A few large tenants own most campaigns, as in production, which keeps
+    per-account filtering benchmarks honest.
+    """
+    if not account_ids:
+        return []
+    weights = [rng.paretovariate(1.2) for _ in account_ids]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    # Hand the rounding remainder to the largest tenants
+    remainder = total - sum(counts)
+    for index in sorted(range(len(counts)), key=weights.__getitem__)[::-1]:
+        if remainder <= 0:
+            break
+        counts[index] += 1
+        remainder -= 1
+    return list(zip(account_ids, counts))
+
+
+def _country_pool() -> Tuple[List[str], List[float]]:
+    codes = list(COUNTRY_WEIGHTS)
+    weights = [float(weight) for weight in COUNTRY_WEIGHTS.values()]
+    tail = [code for code, _ in countries if code not in COUNTRY_WEIGHTS]
+    codes.extend(tail)
+    weights.extend([LONG_TAIL_WEIGHT / len(tail)] * len(tail))
+    return codes, weights
+
+
+def _column_plan(
+    model: type[models.Model], generated: Sequence[str], database: str
+) -> Tuple[List[str], List[Any]]:
+    """
+    Return the insert column list and prepared defaults for other columns.
+
+    Columns that are not generated are filled with the field default, so
+    fields added to the models later keep working without changes here.
+    """
+    connection = connections[database]
+    columns, defaults = list(generated), []
+    for model_field in model._meta.concrete_fields:
+        if model_field.attname in generated:
+            continue
+        columns.append(model_field.column)
+        defaults.append(
+            model_field.get_db_prep_save(model_field.get_default(), connection)
+        )
+    return columns, defaults
+
+
+class RowGenerator:
+    """Produce campaign and payout rows for one work chunk."""
+
+    CAMPAIGN_FIELDS = (
+        "id",
+        "account_id",
+        "title",
+        "landing_page_url",
+        "is_running",
+        "created_at",
+        "updated_at",
+    )
+    PAYOUT_FIELDS = (
+        "id",
+        "campaign_id",
+        "country",
+        "amount",
+        "currency",
+        "is_active",
+        "created_at",
+        "updated_at",
+    )
+
+    # Per-row values are drawn from pools sampled up front from the target
+    # distributions; formatting or sampling them per row would cost more
+    # than writing the row
+    POOL_SIZE = 8192
+
+    def __init__(self, chunk: WorkChunk) -> None:
+        self.chunk = chunk
+        self.options = chunk.options
+        self.rng = random.Random(chunk.seed)
+        self.title_prefixes = [
+            f"{adjective} {subject}"
+            for adjective in TITLE_ADJECTIVES
+            for subject in TITLE_SUBJECTS
+        ]
+        self.timestamps = self._timestamp_pool(connections[chunk.database])
+        self.urls = [
+            f"https://{self.rng.choice(LANDING_DOMAINS)}/landing/"
+            f"{self.rng.randrange(5000)}"
+            for _ in range(self.POOL_SIZE)
+        ]
+        self.payout_profiles = self._payout_profile_pool()
+
+    def _timestamp_pool(self, connection: Any) -> List[Tuple[Any, Any]]:
+        """Return prepared (created_at, updated_at) pairs over the history."""
+        now = datetime.now(timezone.utc)
+        history = self.options.history_days * 86400
+        pool = []
+        for _ in range(self.POOL_SIZE):
+            created = now - timedelta(seconds=self.rng.random() * history)
+            updated = created + (now - created) * self.rng.random()
+            pool.append(
+                (
+                    connection.ops.adapt_datetimefield_value(created),
+                    connection.ops.adapt_datetimefield_value(updated),
+                )
+            )
+        return pool
+
+    def _payout_profile_pool(self) -> List[Tuple[str, List[Tuple[Any, str]]]]:
+        """
+        Return (currency, [(country, amount), ...]) payout sets.
+
+        A campaign pays either worldwide or in a handful of countries drawn
+        from the weighted country mix, in a single currency.
+        """
+        options, rng = self.options, self.rng
+        codes, weights = _country_pool()
+        cum_weights = list(itertools.accumulate(weights))
+        max_payouts = max(options.max_payouts, 1)
+
+        profiles = []
+        for _ in range(self.POOL_SIZE):
+            if rng.random() < options.worldwide_ratio:
+                countries_: List[Any] = [None]
+            else:
+                wanted = min(1 + int(rng.expovariate(0.8)), max_payouts)
+                picked: Dict[str, None] = {}
+                while len(picked) < wanted:
+                    picked.update(
+                        dict.fromkeys(
+                            rng.choices(codes, cum_weights=cum_weights, k=wanted)
+                        )
+                    )
+                countries_ = list(picked)[:wanted]
+            currency = "USD" if rng.random() < options.usd_ratio else "EUR"
+            profiles.append(
+                (
+                    currency,
+                    [
+                        (country, f"{min(rng.lognormvariate(1.5, 0.8), 1e8):.2f}")
+                        for country in countries_
+                    ],
+                )
+            )
+        return profiles
+
+    def rows(self) -> Iterator[Tuple[List[tuple], List[tuple]]]:
+        """Yield (campaign_rows, payout_rows) batches of about batch_size rows."""
+        options = self.options
+        draw = self.rng.random
+        pool_size = self.POOL_SIZE
+        timestamps, urls = self.timestamps, self.urls
+        profiles, prefixes = self.payout_profiles, self.title_prefixes
+        prefix_count = len(prefixes)
+        campaign_id = self.chunk.campaign_id_start
+        payout_id = self.chunk.payout_id_start
+        campaigns: List[tuple] = []
+        payouts: List[tuple] = []
+
+        for account_id, count in self.chunk.accounts:
+            # Popular titles collide across accounts but never within one
+            shared_titles: Dict[str, int] = {}
+            for index in range(count):
+                prefix = prefixes[int(draw() * prefix_count)]
+                if draw() < options.title_collision_ratio:
+                    seen = shared_titles.get(prefix, 0)
+                    shared_titles[prefix] = seen + 1
+                    title = f"{prefix} #{seen + 1}" if seen else prefix
+                else:
+                    title = f"{prefix} {index}"
+                created, updated = timestamps[int(draw() * pool_size)]
+                campaigns.append(
+                    (
+                        campaign_id,
+                        account_id,
+                        title,
+                        urls[int(draw() * pool_size)],
+                        draw() < options.running_ratio,
+                        created,
+                        updated,
+                    )
+                )
+                currency, payout_set = profiles[int(draw() * pool_size)]
+                for country, amount in payout_set:
+                    payouts.append(
+                        (
+                            payout_id,
+                            campaign_id,
+                            country,
+                            amount,
+                            currency,
+                            True,
+                            created,
+                            updated,
+                        )
+                    )
+                    payout_id += 1
+                campaign_id += 1
+
+                if len(campaigns) + len(payouts) >= options.batch_size:
+                    yield campaigns, payouts
+                    campaigns, payouts = [], []
+        if campaigns:
+            yield campaigns, payouts
+
+
+def insert_rows(
+    model: type[models.Model],
+    columns: Sequence[str],
+    rows: Sequence[tuple],
+    database: str,
+) -> None:
+    """Write rows with COPY on PostgreSQL and multi-row inserts elsewhere."""
+    if not rows:
+        return
+    connection = connections[database]
+    table = connection.ops.quote_name(model._meta.db_table)
+    quoted = ", ".join(connection.ops.quote_name(column) for column in columns)
+    # Work on DB-API cursors directly: with DEBUG on, Django's debug wrapper
+    # would render and keep every multi-megabyte statement
+    connection.ensure_connection()
+    if connection.vendor == "postgresql":
+        _copy_rows(connection, table, quoted, rows)
+    else:
+        _insert_values(connection, table, quoted, len(columns), rows)
+
+
+def _copy_rows(connection: Any, table: str, columns: str, rows: Sequence) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    with connection.connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _insert_values(
+    connection: Any, table: str, columns: str, width: int, rows: Sequence
+) -> None:
+    """
+    Insert rows with multi-row VALUES statements.
+
+    On SQLite these beat executemany() by a wide margin, more so with the
+    largest statement the library accepts rather than Django's conservative
+    999-parameter cap.
+    """
+    if connection.vendor == "sqlite":
+        placeholder = "?"
+        max_params = connection.connection.getlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER
+        )
+    else:
+        placeholder = "%s"
+        max_params = connection.features.max_query_params or 65535
+    per_statement = max(1, min(1000, max_params // width))
+    row_sql = "(" + ", ".join([placeholder] * width) + ")"
+
+    cursor = connection.connection.cursor()
+    try:
+        for start in range(0, len(rows), per_statement):
+            end = start + per_statement
+            batch = rows[start:end]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES "
+                + ", ".join([row_sql] * len(batch)),
+                [value for row in batch for value in row],
+            )
+    finally:
+        cursor.close()
+
+
+def generate_chunk(
+    chunk: WorkChunk, progress: Optional[Callable[[int, int], None]] = None
+) -> Tuple[int, int]:
+    """
+    Generate and write all rows for one chunk.
+
+    Returns:
+        Number of (campaigns, payouts) written
+    """
+    generator = RowGenerator(chunk)
+    campaign_columns, campaign_defaults = _column_plan(
+        Campaign, RowGenerator.CAMPAIGN_FIELDS, chunk.database
+    )
+    payout_columns, payout_defaults = _column_plan(
+        CampaignPayout, RowGenerator.PAYOUT_FIELDS, chunk.database
+    )
+    campaign_extra, payout_extra = tuple(campaign_defaults), tuple(payout_defaults)
+
+    connection = connections[chunk.database]
+    written_campaigns = written_payouts = 0
+    # Rows are consistent by construction; like loaddata, skip the deferred
+    # foreign key checks where the backend allows it
+    with connection.constraint_checks_disabled():
+        for campaign_rows, payout_rows in generator.rows():
+            if campaign_extra:
+                campaign_rows = [row + campaign_extra for row in campaign_rows]
+            if payout_extra:
+                payout_rows = [row + payout_extra for row in payout_rows]
+            with transaction.atomic(using=chunk.database):
+                insert_rows(Campaign, campaign_columns, campaign_rows, chunk.database)
+                insert_rows(CampaignPayout, payout_columns, payout_rows, chunk.database)
+            written_campaigns += len(campaign_rows)
+            written_payouts += len(payout_rows)
+            if progress:
+                progress(len(campaign_rows), len(payout_rows))
+    return written_campaigns, written_payouts
+
+
+def run_chunk_in_worker(chunk: WorkChunk) -> Tuple[int, int]:
+    """
+    Entry point for forked worker processes.
+
+    The parent closes its connections before forking, so each worker opens
+    its own and closes it when done.
+    """
+    try:
+        return generate_chunk(chunk)
+    finally:
+        connections.close_all()
@@ -1,9 +1,20 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from .streams import CampaignEventsTicketView, campaign_events
 from .views import CampaignPayoutViewSet, CampaignViewSet
 
 router = DefaultRouter()
 router.register(r"campaigns", CampaignViewSet, basename="campaign")
 router.register(r"payouts", CampaignPayoutViewSet, basename="campaign-payout")
 
-urlpatterns = router.urls
+urlpatterns = [
+    # Ahead of the router, whose campaign detail route would match "events"
+    path("campaigns/events/", campaign_events, name="campaign-events"),
+    path(
+        "campaigns/events/ticket/",
+        CampaignEventsTicketView.as_view(),
+        name="campaign-events-ticket",
+    ),
+    *router.urls,
+]
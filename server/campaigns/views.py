@@ -1,21 +1,64 @@
+from django.db import router, transaction
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import serializers, viewsets
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 
-from .filters import CampaignFilter
-from .models import Campaign, CampaignPayout
+from jobs.queue import enqueue
+from jobs.serializers import JobSerializer
+from server.mixins import IdempotencyMixin, ReplicaReadMixin, ShardMixin
+from server.pagination import EstimatedCountPageNumberPagination, bump_count_version
+from server.streaming import streaming_response
+
+from .archive import restore_campaigns
+from .audit import campaign_snapshot, diff, payout_snapshot, record_change
+from .changes import CHANGES_MAX_PAGE_SIZE, CHANGES_PAGE_SIZE, changes_since
+from .deletion import delete_campaigns
+from .events import publish_change
+from .exports import (
+    EXPORT_HEADER,
+    campaign_export_rows,
+    stream_csv,
+    stream_json_list,
+)
+from .filters import ArchivedCampaignFilter, CampaignFilter, campaign_count_scope
+from .jobs import BULK_DELETE_JOB, record_bulk_deletion
+from .models import ArchivedCampaign, Campaign, CampaignPayout, CampaignTombstone
 from .serializers import (
+    ArchivedCampaignListSerializer,
+    CampaignBulkDeleteSerializer,
     CampaignListSerializer,
     CampaignPayoutSerializer,
     CampaignSerializer,
 )
 
+# Campaigns one ``?campaign__in=`` payout request may cover
+PAYOUT_BATCH_MAX_CAMPAIGNS = 100
+
+# Payout columns the list responses need
+PAYOUT_LIST_FIELDS = [
+    "id",
+    "campaign_id",
+    "country",
+    "amount",
+    "currency",
+    "created_at",
+    "updated_at",
+]
 
-class CampaignViewSet(viewsets.ModelViewSet):
+
+class CampaignViewSet(
+    IdempotencyMixin, ShardMixin, ReplicaReadMixin, viewsets.ModelViewSet
+):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = CampaignFilter
+    pagination_class = EstimatedCountPageNumberPagination
     lookup_field = "pk"
 
     ordering_fields = [
@@ -34,24 +77,236 @@ class CampaignViewSet(viewsets.ModelViewSet):
             .prefetch_related("payouts")
         )
 
+    def get_count_scope(self):
+        return campaign_count_scope(self.request.user.pk)
+
+    def get_archived_queryset(self):
+        return ArchivedCampaign.objects.filter(
+            account=self.request.user
+        ).prefetch_related("payouts")
+
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return CampaignSerializer
         return CampaignListSerializer
 
     def perform_create(self, serializer):
-        serializer.save(account=self.request.user)
+        campaign = serializer.save(account=self.request.user)
+        self._record_change("campaign.created", campaign, campaign_snapshot(campaign))
+
+    def perform_update(self, serializer):
+        before = campaign_snapshot(serializer.instance)
+        campaign = serializer.save()
+        # The prefetched payouts are stale once payouts were replaced
+        payouts = CampaignPayout.objects.filter(campaign_id=campaign.pk)
+        after = campaign_snapshot(campaign, payouts=payouts)
+        self._record_change("campaign.updated", campaign, diff(before, after))
+
+    def perform_destroy(self, instance):
+        snapshot = campaign_snapshot(instance)
+        campaign_id = instance.pk
+        using = instance._state.db
+        with transaction.atomic(using=using):
+            instance.delete()
+            CampaignTombstone.objects.using(using).create(
+                account_id=self.request.user.pk, campaign_id=campaign_id
+            )
+        self._record_change("campaign.deleted", instance, snapshot, campaign_id)
+
+    def _record_change(self, action, campaign, changes, campaign_id=None):
+        record_change(
+            action,
+            account_id=self.request.user.pk,
+            campaign_id=campaign_id or campaign.pk,
+            changes=changes,
+            using=campaign._state.db,
+        )
+        publish_change(
+            action,
+            account_id=self.request.user.pk,
+            campaign_id=campaign_id or campaign.pk,
+            using=campaign._state.db,
+        )
+        bump_count_version(self.get_count_scope(), using=campaign._state.db)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List campaigns; ``?include_archived=true`` adds archived ones.
+
+        ``?stream=true`` streams the unpaginated JSON list in chunks instead
+        of building it in memory, see ``exports.stream_json_list()``.
+        """
+        include_archived = request.query_params.get("include_archived", "")
+        if include_archived.lower() not in ("true", "1"):
+            if self._streams_list(request):
+                return self._stream_list(request)
+            return super().list(request, *args, **kwargs)
+
+        campaigns = list(self.filter_queryset(self.get_queryset()))
+        archived = ArchivedCampaignFilter(
+            request.query_params, queryset=self.get_archived_queryset(), request=request
+        ).qs
+        ordering_filter = OrderingFilter()
+        archived = list(ordering_filter.filter_queryset(request, archived, self))
+
+        # Merge both ordered lists on the requested ordering
+        merged = campaigns + archived
+        ordering = ordering_filter.get_ordering(request, archived, self) or []
+        for field in reversed(ordering):
+            merged.sort(
+                key=lambda item: getattr(item, field.lstrip("-")),
+                reverse=field.startswith("-"),
+            )
+
+        data = []
+        for item in merged:
+            if isinstance(item, ArchivedCampaign):
+                data.append(ArchivedCampaignListSerializer(item).data)
+            else:
+                data.append({**CampaignListSerializer(item).data, "is_archived": False})
+        return Response(data)
+
+    def _streams_list(self, request):
+        params = request.query_params
+        paginator = self.paginator
+        return (
+            params.get("stream", "").lower() in ("true", "1")
+            and paginator.page_query_param not in params
+            and paginator.page_size_query_param not in params
+            # The browsable API and MessagePack render the whole list
+            and isinstance(request.accepted_renderer, JSONRenderer)
+        )
+
+    def _stream_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        # The body streams after the request's routing context is reset
+        queryset = queryset.using(router.db_for_read(Campaign))
+        return streaming_response(
+            request,
+            stream_json_list(queryset, CampaignListSerializer),
+            # Each part is a whole chunk of campaigns
+            batch_size=1,
+            content_type="application/json",
+        )
+
+    @action(detail=True, methods=["post"])
+    def restore(self, request, pk=None):
+        """Move an archived campaign back to the active campaigns."""
+        archived = get_object_or_404(self.get_archived_queryset(), pk=pk)
+        restore_campaigns([archived.pk], using=router.db_for_write(Campaign))
+        campaign = self.get_queryset().get(pk=archived.pk)
+        return Response(CampaignListSerializer(campaign).data)
+
+    @action(detail=False, methods=["post"], url_path="bulk-delete")
+    def bulk_delete(self, request):
+        """
+        Delete campaigns by ``ids`` or, without ids, by the filter parameters.
+
+        Campaigns and payouts are deleted in chunks with set-based
+        statements instead of being loaded one by one. With
+        ``"background": true`` the deletion runs as a job: the response is
+        202 with the job, whose ``url`` reports its progress and counts.
+        """
+        serializer = CampaignBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        campaigns = Campaign.objects.filter(account=request.user)
+        ids = serializer.validated_data.get("ids")
+        # An empty value narrows nothing: "?search=" must not delete everything
+        filters = {
+            name
+            for name in self.filterset_class.base_filters
+            if request.query_params.get(name)
+        }
+        if ids is not None:
+            campaigns = campaigns.filter(id__in=ids)
+        elif filters:
+            campaigns = self.filter_queryset(campaigns)
+        else:
+            raise serializers.ValidationError(
+                {"ids": ["Provide campaign ids or filter parameters."]}
+            )
 
+        if serializer.validated_data["background"]:
+            if ids is not None:
+                payload = {"ids": ids}
+            else:
+                payload = {
+                    "filters": {name: request.query_params[name] for name in filters}
+                }
+            job = enqueue(BULK_DELETE_JOB, payload, account_id=request.user.pk)
+            return Response(
+                JobSerializer(job, context={"request": request}).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
 
-class CampaignPayoutViewSet(viewsets.ModelViewSet):
+        using = router.db_for_write(Campaign)
+        on_chunk = record_bulk_deletion(request.user.pk, using)
+        counts = delete_campaigns(campaigns, using, on_chunk=on_chunk)
+        return Response(
+            {"deleted": counts.campaigns, "payouts_deleted": counts.payouts}
+        )
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        Campaigns changed and deleted since ``?since=<cursor>``.
+
+        Pass the returned ``cursor`` on the next call; keep calling while
+        ``has_more`` is true. Without ``since`` all campaigns are returned.
+        """
+        try:
+            limit = int(request.query_params.get("limit", CHANGES_PAGE_SIZE))
+        except ValueError:
+            raise serializers.ValidationError({"limit": ["Must be an integer."]})
+        limit = max(1, min(limit, CHANGES_MAX_PAGE_SIZE))
+        try:
+            page = changes_since(
+                self.get_queryset(),
+                CampaignTombstone.objects.filter(account_id=request.user.pk),
+                request.query_params.get("since"),
+                limit,
+            )
+        except ValueError:
+            raise serializers.ValidationError({"since": ["Invalid cursor."]})
+        return Response(
+            {
+                "campaigns": CampaignListSerializer(page["campaigns"], many=True).data,
+                "deleted": [
+                    {"id": tombstone.campaign_id, "deleted_at": tombstone.deleted_at}
+                    for tombstone in page["deleted"]
+                ],
+                "cursor": page["cursor"],
+                "has_more": page["has_more"],
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """Stream the filtered campaigns as CSV without loading them all."""
+        queryset = self.filter_queryset(Campaign.objects.filter(account=request.user))
+        # The body streams after the request's routing context is reset
+        queryset = queryset.using(router.db_for_read(Campaign))
+        response = streaming_response(
+            request,
+            stream_csv(campaign_export_rows(queryset), EXPORT_HEADER),
+            content_type="text/csv",
+        )
+        response["Content-Disposition"] = 'attachment; filename="campaigns.csv"'
+        return response
+
+
+class CampaignPayoutViewSet(
+    IdempotencyMixin, ShardMixin, ReplicaReadMixin, viewsets.ModelViewSet
+):
     serializer_class = CampaignPayoutSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "pk"
 
     def get_queryset(self):
-        queryset = CampaignPayout.objects.filter(
-            campaign__account=self.request.user
-        ).select_related("campaign")
+        # The serializer only needs campaign_id, so no join to campaigns
+        queryset = CampaignPayout.objects.filter(campaign__account=self.request.user)
+        if self.action == "list":
+            queryset = queryset.only(*PAYOUT_LIST_FIELDS)
 
         campaign_id = self.request.query_params.get("campaign")
         if campaign_id:
@@ -62,3 +317,85 @@ class CampaignPayoutViewSet(viewsets.ModelViewSet):
                 raise serializers.ValidationError("Invalid campaign ID")
 
         return queryset
+
+    def list(self, request, *args, **kwargs):
+        """List payouts; ``?campaign__in=1,2,3`` returns them grouped by campaign."""
+        if "campaign__in" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        ids = self._campaign_ids(request.query_params["campaign__in"])
+        owned = set(
+            Campaign.objects.filter(account=request.user, id__in=ids).values_list(
+                "id", flat=True
+            )
+        )
+        # One indexed lookup on campaign_id for all campaigns of the page
+        payouts = (
+            CampaignPayout.objects.filter(campaign_id__in=owned)
+            .only(*PAYOUT_LIST_FIELDS)
+            .order_by("campaign_id", "id")
+        )
+        grouped = {str(campaign_id): [] for campaign_id in ids if campaign_id in owned}
+        for data in self.get_serializer(payouts, many=True).data:
+            grouped[str(data["campaign"])].append(data)
+        return Response(grouped)
+
+    def _campaign_ids(self, value):
+        try:
+            ids = list(dict.fromkeys(int(part) for part in value.split(",")))
+        except ValueError:
+            raise serializers.ValidationError(
+                {"campaign__in": ["Expected comma-separated campaign IDs."]}
+            )
+        if len(ids) > PAYOUT_BATCH_MAX_CAMPAIGNS:
+            raise serializers.ValidationError(
+                {
+                    "campaign__in": [
+                        f"At most {PAYOUT_BATCH_MAX_CAMPAIGNS} campaigns per request."
+                    ]
+                }
+            )
+        return ids
+
+    def perform_create(self, serializer):
+        payout = serializer.save()
+        self._touch_campaign(payout)
+        self._record_change("payout.created", payout, payout_snapshot(payout))
+
+    def perform_update(self, serializer):
+        before = payout_snapshot(serializer.instance)
+        payout = serializer.save()
+        self._touch_campaign(payout)
+        self._record_change(
+            "payout.updated", payout, diff(before, payout_snapshot(payout))
+        )
+
+    def perform_destroy(self, instance):
+        snapshot = payout_snapshot(instance)
+        payout_id = instance.pk
+        instance.delete()
+        self._touch_campaign(instance)
+        self._record_change("payout.deleted", instance, snapshot, payout_id=payout_id)
+
+    def _touch_campaign(self, payout):
+        # Payout changes reach sync clients through their campaign
+        Campaign.objects.using(payout._state.db).filter(pk=payout.campaign_id).update(
+            updated_at=timezone.now()
+        )
+
+    def _record_change(self, action, payout, changes, payout_id=None):
+        record_change(
+            action,
+            account_id=self.request.user.pk,
+            campaign_id=payout.campaign_id,
+            payout_id=payout_id or payout.pk,
+            changes=changes,
+            using=payout._state.db,
+        )
+        publish_change(
+            action,
+            account_id=self.request.user.pk,
+            campaign_id=payout.campaign_id,
+            payout_id=payout_id or payout.pk,
+            using=payout._state.db,
+        )
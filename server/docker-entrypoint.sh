@@ -6,10 +6,15 @@ python manage.py migrate
 # Collect static files
 python manage.py collectstatic --noinput
 
-# Start Gunicorn server
-gunicorn server.wsgi:application \
+# Start Gunicorn with Uvicorn workers serving the ASGI app, so idle
+# event streams (/api/campaigns/events/) do not hold a worker thread.
+# Streamed sync bodies (the CSV export) must go through
+# server/streaming.py, or ASGI reads them into memory before sending
+# server.asgi also turns persistent database connections off (they are
+# never reused under ASGI); the Postgres pool still reuses connections
+gunicorn server.asgi:application \
     --bind 0.0.0.0:8000 \
-    --workers 4 \
+    --workers "${WEB_WORKERS:-4}" \
     --timeout 30 \
     --keep-alive 5 \
     --max-requests 1000 \
@@ -18,5 +23,4 @@ gunicorn server.wsgi:application \
     --log-level info \
     --access-logfile - \
     --error-logfile - \
-    --worker-class gthread \
-    --threads 4
+    --worker-class uvicorn_worker.UvicornWorker
@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "kind",
+        "account_id",
+        "status",
+        "progress",
+        "total",
+        "attempts",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "kind")
+    search_fields = ("=account_id",)
+    show_facets = admin.ShowFacets.NEVER
+    readonly_fields = (
+        "attempts",
+        "locked_by",
+        "locked_until",
+        "progress",
+        "total",
+        "result",
+        "error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
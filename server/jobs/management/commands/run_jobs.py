@@ -0,0 +1,128 @@
+"""
+Run background job workers.
+
+``--concurrency`` workers claim and run jobs side by side, as threads of
+this process or, with ``--processes``, as separate processes for CPU-bound
+handlers. Several ``run_jobs`` commands can also run at once, on one host
+or many; see ``jobs.queue``. SIGTERM and SIGINT let the running jobs
+finish and then stop.
+
+Usage:
+
+    python manage.py run_jobs --concurrency 4
+    python manage.py run_jobs --burst  # run the due jobs, then exit
+"""
+
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import work
+from server.integrations import init_integrations
+
+
+def _work_in_thread(stop, burst, poll_interval, ran):
+    try:
+        ran.append(work(stop, burst, poll_interval))
+    finally:
+        connections.close_all()
+
+
+def _work_in_process(burst, poll_interval):
+    # Started with "spawn": the project is set up afresh in the child
+    import django
+
+    django.setup()
+    init_integrations()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    signal.signal(signal.SIGINT, lambda *args: stop.set())
+    work(stop, burst, poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Claim and run queued background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Jobs run at the same time",
+        )
+        parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Run each worker in its own process instead of a thread",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is due",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=None,
+            help="Seconds between looks at an empty queue (JOB_POLL_INTERVAL)",
+        )
+
+    def handle(self, *args, **options):
+        # Not served by the WSGI/ASGI entry points: report job errors too
+        init_integrations()
+        concurrency = max(1, options["concurrency"])
+        burst, poll_interval = options["burst"], options["poll_interval"]
+        if options["processes"]:
+            self._run_processes(concurrency, burst, poll_interval)
+            return
+
+        stop = threading.Event()
+        ran = []
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                handlers[signum] = signal.signal(signum, lambda *args: stop.set())
+        workers = [
+            threading.Thread(
+                target=_work_in_thread,
+                args=(stop, burst, poll_interval, ran),
+                name=f"job-worker-{i}",
+            )
+            for i in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            # Short joins keep the main thread responsive to signals
+            while worker.is_alive():
+                worker.join(0.5)
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+        self.stdout.write(f"Ran {sum(ran)} jobs")
+
+    def _run_processes(self, concurrency, burst, poll_interval):
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(
+                target=_work_in_process,
+                args=(burst, poll_interval),
+                name=f"job-worker-{i}",
+            )
+            for i in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def forward(signum, frame):
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()  # SIGTERM: finish the job, then stop
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for worker in workers:
+            worker.join()
+        self.stdout.write(f"{concurrency} worker processes stopped")
@@ -0,0 +1,122 @@
+"""
+Background job models.
+"""
+
+from django.db import models
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class Job(models.Model):
+    """
+    A unit of heavy work run outside the request by ``manage.py run_jobs``.
+
+    ``kind`` names the handler registered with ``jobs.queue.register``.
+    A worker claims a queued job by setting ``locked_by`` and a lease in
+    ``locked_until``; a job whose worker died is claimed again once the
+    lease runs out. Failed attempts are retried after a growing delay
+    until ``max_attempts`` is reached.
+
+    Attributes:
+        kind: The registered handler running the job
+        account_id: The account the job works for, if any
+        payload: Arguments for the handler
+        status: Where the job is in its lifecycle
+        attempts: How many times a worker started the job
+        max_attempts: Attempts before the job is given up
+        run_after: The earliest time the job may (re)start
+        locked_by: Token of the worker running the job
+        locked_until: When the running worker's lease runs out
+        progress: Units of work done
+        total: Units of work overall, when known
+        result: What the handler returned
+        error: The last failure
+        created_at: When the job was enqueued
+        started_at: When the last attempt started
+        finished_at: When the job succeeded or was given up
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    kind: models.CharField = models.CharField(
+        max_length=100, help_text="The registered handler running the job"
+    )
+    account_id: models.BigIntegerField = models.BigIntegerField(
+        null=True, blank=True, help_text="The account the job works for"
+    )
+    payload: models.JSONField = models.JSONField(
+        default=dict, encoder=JSONEncoder, help_text="Arguments for the handler"
+    )
+    status: models.CharField = models.CharField(
+        max_length=16,
+        choices=[
+            (QUEUED, "Queued"),
+            (RUNNING, "Running"),
+            (SUCCEEDED, "Succeeded"),
+            (FAILED, "Failed"),
+        ],
+        default=QUEUED,
+        help_text="Where the job is in its lifecycle",
+    )
+    attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=0, help_text="How many times a worker started the job"
+    )
+    max_attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=3, help_text="Attempts before the job is given up"
+    )
+    run_after: models.DateTimeField = models.DateTimeField(
+        help_text="The earliest time the job may (re)start"
+    )
+    locked_by: models.CharField = models.CharField(
+        max_length=64, blank=True, help_text="Token of the worker running the job"
+    )
+    locked_until: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, help_text="When the running worker's lease runs out"
+    )
+    progress: models.PositiveIntegerField = models.PositiveIntegerField(
+        default=0, help_text="Units of work done"
+    )
+    total: models.PositiveIntegerField = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Units of work overall, when known"
+    )
+    result: models.JSONField = models.JSONField(
+        null=True,
+        blank=True,
+        encoder=JSONEncoder,
+        help_text="What the handler returned",
+    )
+    error: models.TextField = models.TextField(blank=True, help_text="The last failure")
+    created_at: models.DateTimeField = models.DateTimeField(
+        auto_now_add=True, help_text="The date and time the job was enqueued"
+    )
+    started_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, help_text="When the last attempt started"
+    )
+    finished_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, help_text="When the job succeeded or was given up"
+    )
+
+    class Meta:
+        verbose_name = "job"
+        verbose_name_plural = "jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            # Only jobs a worker may claim, see jobs.queue.claim
+            models.Index(
+                fields=["run_after"],
+                condition=models.Q(status="queued"),
+                name="job_queued_idx",
+            ),
+            models.Index(
+                fields=["locked_until"],
+                condition=models.Q(status="running"),
+                name="job_running_idx",
+            ),
+            models.Index(fields=["account_id", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        """Return string representation of the job."""
+        return f"{self.kind} #{self.pk} ({self.status})"
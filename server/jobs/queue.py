@@ -0,0 +1,230 @@
+"""
+Database-backed queue of background jobs.
+
+Views hand heavy work to ``enqueue()`` and answer at once with the job,
+whose status, progress and result clients poll at ``/api/jobs/<id>/``.
+``python manage.py run_jobs`` runs the workers.
+
+Apps register handlers in a ``jobs`` module, loaded at start-up::
+
+    @register("campaigns.bulk_delete")
+    def bulk_delete(job: JobContext):
+        ...
+        job.set_progress(done, total)
+        return {"deleted": done}
+
+A worker claims a due job by switching it to ``running`` with its own
+token and a lease of ``JOB_LEASE_SECONDS``, in one short transaction.
+Candidates are locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+database has it, so workers never wait on each other; on SQLite the
+``BEGIN IMMEDIATE`` transactions run claims one at a time. The ``UPDATE``
+re-checks that the job is still due either way, so it is claimed once.
+Progress reports renew the lease; a job whose worker died is claimed
+again when its lease runs out. A failing job is retried after
+``JOB_RETRY_DELAY_SECONDS``, doubled with every attempt, until its
+``max_attempts`` are used up. Every write after the claim is guarded by
+the worker's token, so a worker whose lease was taken over cannot
+overwrite the job's new run.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    DatabaseError,
+    close_old_connections,
+    transaction,
+)
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS: Dict[str, Callable[["JobContext"], Any]] = {}
+
+
+def register(kind: str):
+    """Register the decorated function as the handler of ``kind`` jobs."""
+
+    def decorator(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+def _jobs():
+    return Job.objects.using(DEFAULT_DB_ALIAS)
+
+
+def _lease(now):
+    return now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+def enqueue(
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    account_id: Optional[int] = None,
+    max_attempts: int = 3,
+    delay: float = 0,
+) -> Job:
+    """Queue a ``kind`` job; a worker runs it after ``delay`` seconds."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"No handler registered for {kind!r} jobs")
+    return _jobs().create(
+        kind=kind,
+        payload=payload or {},
+        account_id=account_id,
+        max_attempts=max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+class JobContext:
+    """What a handler gets: the job's arguments and a progress reporter."""
+
+    def __init__(self, job: Job):
+        self.job = job
+        self.id = job.pk
+        self.payload = job.payload
+        self.account_id = job.account_id
+        self.attempt = job.attempts
+
+    def set_progress(self, progress: int, total: Optional[int] = None) -> None:
+        """Record the work done so far; also renews the worker's lease."""
+        fields = {"progress": progress, "locked_until": _lease(timezone.now())}
+        if total is not None:
+            fields["total"] = total
+        _jobs().filter(pk=self.job.pk, locked_by=self.job.locked_by).update(**fields)
+
+
+def _due(now) -> Q:
+    return Q(status=Job.QUEUED, run_after__lte=now) | Q(
+        status=Job.RUNNING, locked_until__lt=now
+    )
+
+
+def _worker_token() -> str:
+    return f"{socket.gethostname()[:20]}:{os.getpid()}:{uuid.uuid4().hex[:16]}"
+
+
+def claim(limit: int = 1) -> List[Job]:
+    """Claim up to ``limit`` due jobs for this worker."""
+    now = timezone.now()
+    token = _worker_token()
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        ids = list(
+            _jobs()
+            .filter(_due(now))
+            .order_by("run_after", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        _jobs().filter(_due(now), id__in=ids).update(
+            status=Job.RUNNING,
+            locked_by=token,
+            locked_until=_lease(now),
+            attempts=F("attempts") + 1,
+            started_at=now,
+        )
+    return list(_jobs().filter(id__in=ids, locked_by=token))
+
+
+def run_job(job: Job) -> str:
+    """Run a claimed job and record its outcome; returns its new status."""
+    mine = _jobs().filter(pk=job.pk, locked_by=job.locked_by)
+    handler = JOB_HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for {job.kind!r} jobs")
+        if job.attempts > job.max_attempts:
+            # Claimed again after the lease of its last attempt ran out
+            raise TimeoutError("The last attempt's worker stopped responding")
+        result = handler(JobContext(job))
+    except Exception as exc:
+        logger.warning(f"Job {job.pk} ({job.kind}) failed", exc_info=True)
+        now = timezone.now()
+        error = "".join(traceback.format_exception_only(exc)).strip()
+        if job.attempts < job.max_attempts and not isinstance(exc, LookupError):
+            delay = settings.JOB_RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            mine.update(
+                status=Job.QUEUED,
+                error=error,
+                run_after=now + timedelta(seconds=delay),
+                locked_by="",
+                locked_until=None,
+            )
+            return Job.QUEUED
+        mine.update(
+            status=Job.FAILED,
+            error=error,
+            locked_by="",
+            locked_until=None,
+            finished_at=now,
+        )
+        return Job.FAILED
+
+    mine.update(
+        status=Job.SUCCEEDED,
+        result=result,
+        error="",
+        locked_by="",
+        locked_until=None,
+        finished_at=timezone.now(),
+    )
+    return Job.SUCCEEDED
+
+
+def work(
+    stop: Optional[threading.Event] = None,
+    burst: bool = False,
+    poll_interval: Optional[float] = None,
+) -> int:
+    """
+    Claim and run jobs one at a time until ``stop`` is set.
+
+    With ``burst`` the loop returns as soon as no job is due. Returns the
+    number of jobs run.
+    """
+    stop = stop or threading.Event()
+    if poll_interval is None:
+        poll_interval = settings.JOB_POLL_INTERVAL
+    ran = 0
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            jobs = claim()
+        except DatabaseError:
+            # E.g. the database is locked or restarting; try again shortly
+            logger.warning("Could not claim jobs", exc_info=True)
+            stop.wait(poll_interval)
+            continue
+        if not jobs:
+            if burst:
+                break
+            stop.wait(poll_interval)
+            continue
+        for job in jobs:
+            started = time.monotonic()
+            status = run_job(job)
+            ran += 1
+            logger.info(
+                f"Job {job.pk} ({job.kind}) {status} "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+    return ran
@@ -0,0 +1,18 @@
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """The background jobs queued for the account, newest first."""
+
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Job.objects.using(DEFAULT_DB_ALIAS).filter(
+            account_id=self.request.user.pk
+        )
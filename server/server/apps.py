@@ -0,0 +1,30 @@
+import logging
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+
+class ServerConfig(AppConfig):
+    """Project-level app hosting operational commands."""
+
+    name = "server"
+
+    def ready(self):
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+            from .slow_queries import install
+
+            connection_created.connect(install, dispatch_uid="slow_query_log")
+
+        logger.info(
+            f"Loaded settings for {settings.ENV} environment "
+            f"(DEBUG={settings.DEBUG}, DB_ENGINE={settings.DB_ENGINE}, "
+            f"DB_HOST_TYPE={settings.DB_HOST_TYPE})"
+        )
+        logger.debug(
+            f"ALLOWED_HOSTS: {settings.ALLOWED_HOSTS}, "
+            f"CORS_ALLOW_ALL_ORIGINS: {settings.CORS_ALLOW_ALL_ORIGINS}, "
+            f"CORS_ALLOWED_ORIGINS: {settings.CORS_ALLOWED_ORIGINS}"
+        )
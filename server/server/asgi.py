@@ -11,6 +11,13 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from server.integrations import init_integrations
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+# Read by server.databases: no persistent connections under ASGI
+os.environ.setdefault("DJANGO_ASGI", "True")
+
+# Before the handler loads the middleware, which Sentry instruments
+init_integrations()
 
 application = get_asgi_application()
@@ -0,0 +1,223 @@
+"""
+Batch API: several campaign and payout calls in one HTTP request.
+
+``POST /api/batch/`` takes an ordered list of operations against the
+campaign and payout routes and runs them in-process, one after another,
+with the batch request's user: the token is checked and the throttle
+charged once for the whole batch. With ``"atomic": true`` all operations
+share one transaction, which is rolled back at the first failure.
+
+An operation can use an earlier result: a string ``"$<n>.<field>"``
+anywhere in the body, or ``$<n>.<field>`` inside the path, is replaced
+by that field of operation ``n``'s response, e.g. a campaign created by
+the first operation gets its payouts added by the next ones::
+
+    {"atomic": true, "operations": [
+        {"method": "POST", "path": "/api/campaigns/", "body": {...}},
+        {"method": "POST", "path": "/api/payouts/",
+         "body": {"campaign": "$0.id", "amount": "5.00", ...}}
+    ]}
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import re
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import router, transaction
+from django.urls import Resolver404, resolve
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from campaigns.models import Campaign
+from server.mixins import IdempotencyMixin, ShardMixin
+from utils import APIResponse
+
+logger = logging.getLogger(__name__)
+
+# Routes an operation may call, by URL name
+BATCH_ROUTES = {
+    "campaign-list",
+    "campaign-detail",
+    "campaign-payout-list",
+    "campaign-payout-detail",
+}
+BATCH_MAX_OPERATIONS = 50
+# Budget per batch; list reads return unbounded data and cost more
+BATCH_MAX_COST = 100
+BATCH_LIST_READ_COST = 10
+
+_REFERENCE = re.compile(r"\$(\d+)\.(\w+)")
+
+# Request headers not passed on to operations
+_REQUEST_ONLY_META = {
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "QUERY_STRING",
+    "HTTP_IDEMPOTENCY_KEY",
+}
+
+
+class BatchOperationError(Exception):
+    pass
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.CharField(max_length=500)
+    body = serializers.JSONField(required=False, default=None)
+
+
+class BatchSerializer(serializers.Serializer):
+    """Input of the batch endpoint."""
+
+    operations = BatchOperationSerializer(
+        many=True, allow_empty=False, max_length=BATCH_MAX_OPERATIONS
+    )
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_operations(self, operations: List[Dict[str, Any]]):
+        cost = 0
+        for index, operation in enumerate(operations):
+            path = operation["path"].partition("?")[0]
+            try:
+                match = resolve(_REFERENCE.sub("0", path))
+            except Resolver404:
+                match = None
+            if match is None or match.url_name not in BATCH_ROUTES:
+                raise serializers.ValidationError(
+                    f"Operation {index}: {path} cannot be batched."
+                )
+            is_list_read = operation["method"] == "GET" and match.url_name.endswith(
+                "-list"
+            )
+            cost += BATCH_LIST_READ_COST if is_list_read else 1
+        if cost > BATCH_MAX_COST:
+            raise serializers.ValidationError(
+                f"Batch costs {cost}, more than the limit of {BATCH_MAX_COST}."
+            )
+        return operations
+
+
+def _resolve_references(value: Any, results: List[Dict[str, Any]]) -> Any:
+    if isinstance(value, dict):
+        return {key: _resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_references(item, results) for item in value]
+    if isinstance(value, str) and _REFERENCE.fullmatch(value):
+        return _reference(_REFERENCE.fullmatch(value), results)
+    return value
+
+
+def _reference(match: re.Match, results: List[Dict[str, Any]]) -> Any:
+    index, field = int(match.group(1)), match.group(2)
+    if index >= len(results) or not isinstance(results[index]["body"], dict):
+        raise BatchOperationError(f"${index}.{field} does not refer to a result")
+    if field not in results[index]["body"]:
+        raise BatchOperationError(f"Result {index} has no field {field!r}")
+    return results[index]["body"][field]
+
+
+class BatchView(IdempotencyMixin, ShardMixin, APIView):
+    """Run campaign and payout operations in order under one request."""
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data["operations"]
+
+        if not serializer.validated_data["atomic"]:
+            results = self._run(request, operations, stop_on_error=False)
+            return Response({"results": results})
+
+        using = router.db_for_write(Campaign)
+        with transaction.atomic(using=using):
+            results = self._run(request, operations, stop_on_error=True)
+            failed = results[-1]["status"] >= 400
+            if failed:
+                transaction.set_rollback(True, using=using)
+        if failed:
+            return Response(
+                {"results": results, "rolled_back": True}, status=results[-1]["status"]
+            )
+        return Response({"results": results})
+
+    def _run(self, request, operations, stop_on_error) -> List[Dict[str, Any]]:
+        results: List[Dict[str, Any]] = []
+        for operation in operations:
+            try:
+                result = self._call(request, operation, results)
+            except BatchOperationError as exc:
+                result = {"status": 400, "body": {"detail": str(exc)}}
+            except Exception:
+                # One failing operation must not turn the batch into a 500
+                logger.exception(f"Batch operation {operation['path']} failed")
+                error = APIResponse(
+                    success=False,
+                    error="An unexpected error occurred",
+                    status_code=500,
+                )
+                result = {"status": 500, "body": asdict(error)}
+            results.append(result)
+            if stop_on_error and result["status"] >= 400:
+                break
+        return results
+
+    def _call(self, request, operation, results) -> Dict[str, Any]:
+        path = _REFERENCE.sub(
+            lambda match: str(_reference(match, results)), operation["path"]
+        )
+        path, _, query = path.partition("?")
+        body = _resolve_references(operation["body"], results)
+        content = b"" if body is None else json.dumps(body).encode()
+
+        outer = request._request
+        environ = {
+            key: value
+            for key, value in outer.META.items()
+            if key not in _REQUEST_ONLY_META
+        }
+        environ.update(
+            {
+                # The batch may have come in over ASGI, whose META has no
+                # wsgi.* keys: absolute URLs need the scheme and host
+                "wsgi.url_scheme": outer.scheme,
+                "HTTP_HOST": outer.get_host(),
+                "REQUEST_METHOD": operation["method"],
+                "PATH_INFO": path,
+                "SCRIPT_NAME": "",
+                "QUERY_STRING": query,
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(content)),
+                # Sub-responses are decoded as JSON whatever the batch accepts
+                "HTTP_ACCEPT": "application/json",
+                "wsgi.input": io.BytesIO(content),
+            }
+        )
+        sub_request = WSGIRequest(environ)
+        # Already authenticated: DRF uses this user instead of the token
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+
+        try:
+            match = resolve(path)
+        except Resolver404:
+            match = None
+        if match is None or match.url_name not in BATCH_ROUTES:
+            raise BatchOperationError(f"{path} cannot be batched")
+        view_class = match.func.cls
+        initkwargs = {**match.func.initkwargs, "throttle_classes": ()}
+        if hasattr(match.func, "actions"):
+            view = view_class.as_view(match.func.actions, **initkwargs)
+        else:
+            view = view_class.as_view(**initkwargs)
+        response = view(sub_request, *match.args, **match.kwargs)
+        response.render()
+        data = json.loads(response.content) if response.content else None
+        return {"status": response.status_code, "body": data}
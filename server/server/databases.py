@@ -0,0 +1,193 @@
+"""
+Builders for ``DATABASES`` entries.
+
+Each function returns one connection configuration read from environment
+variables, so settings can declare the default database (and any extra
+aliases) without repeating engine-specific tuning.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+
+def sqlite_database(name: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Return a SQLite configuration for the file at ``name``.
+
+    ``SQLITE_PROFILE=tuned`` (the default) is meant for small single-node
+    production deployments: every new connection gets WAL with
+    ``synchronous=NORMAL``, a memory-mapped and enlarged page cache and an
+    explicit busy timeout, connections are reused across requests (see
+    ``conn_max_age()``) and transactions start with ``BEGIN IMMEDIATE`` so
+    writers queue on the busy timeout instead of failing when a read lock
+    cannot be upgraded.
+    ``SQLITE_PROFILE=basic`` keeps the previous minimal configuration.
+    """
+    busy_timeout_ms = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "20000"))
+
+    if os.getenv("SQLITE_PROFILE", "tuned") == "basic":
+        return {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": name,
+            "OPTIONS": {
+                "timeout": busy_timeout_ms / 1000,
+                # Better concurrency
+                "init_command": "PRAGMA journal_mode=WAL;",
+            },
+        }
+
+    pragmas = {
+        "journal_mode": "WAL",
+        # Durable across application crashes; only an OS crash or power
+        # loss can roll back the last commits in WAL mode
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": busy_timeout_ms,
+        # Negative values are KiB: 64 MiB of page cache per connection
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+        "temp_store": "MEMORY",
+    }
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "CONN_MAX_AGE": conn_max_age(int(os.getenv("SQLITE_CONN_MAX_AGE", "600"))),
+        "OPTIONS": {
+            "timeout": busy_timeout_ms / 1000,
+            "transaction_mode": "IMMEDIATE",
+            "init_command": ";".join(
+                f"PRAGMA {pragma}={value}" for pragma, value in pragmas.items()
+            ),
+        },
+    }
+
+
+def postgres_database() -> Dict[str, Any]:
+    """
+    Return the PostgreSQL configuration from the ``POSTGRES_*`` variables.
+
+    With psycopg 3 and psycopg-pool installed, each process keeps a real
+    connection pool (``POSTGRES_POOL``, on by default) bounded by
+    ``POSTGRES_POOL_MIN_SIZE``/``POSTGRES_POOL_MAX_SIZE``; requests wait up
+    to ``POSTGRES_POOL_TIMEOUT`` seconds for a free connection. Without
+    them, connections persist per thread for ``CONN_MAX_AGE`` as before
+    (see ``conn_max_age()``).
+    """
+    config: Dict[str, Any] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("POSTGRES_DB", "app_db"),
+        "USER": os.getenv("POSTGRES_USER", "postgres"),
+        "PASSWORD": os.getenv("POSTGRES_PASSWORD", "postgres"),
+        "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+        "OPTIONS": {
+            "sslmode": os.getenv("POSTGRES_SSLMODE", "prefer"),
+            "connect_timeout": 10,
+        },
+        "CONN_MAX_AGE": conn_max_age(600),
+        # Named cursors for .iterator() must be off behind a transaction
+        # pooler such as PgBouncer; the built-in pool keeps them working
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.getenv("POSTGRES_DISABLE_SERVER_SIDE_CURSORS", "False") == "True"
+        ),
+    }
+    if os.getenv("POSTGRES_POOL", "True") == "True" and pool_available():
+        config["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1")),
+            # Under the Uvicorn workers (docker-entrypoint.sh) each sync
+            # request runs on its own thread and holds a connection until it
+            # returns; idle event streams hold none. This bounds the requests
+            # a process serves at once, so size it to the database: workers
+            # (WEB_WORKERS) x max_size, plus the audit sink, LISTEN and job
+            # worker connections, must fit in max_connections
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+            "max_waiting": int(os.getenv("POSTGRES_POOL_MAX_WAITING", "0")),
+            "max_idle": float(os.getenv("POSTGRES_POOL_MAX_IDLE", "600")),
+            "max_lifetime": float(os.getenv("POSTGRES_POOL_MAX_LIFETIME", "3600")),
+        }
+        # Pooled connections are returned after each request instead
+        config["CONN_MAX_AGE"] = 0
+    return config
+
+
+def conn_max_age(seconds: int) -> int:
+    """
+    Return ``seconds``, or 0 in processes serving the ASGI app.
+
+    Django's ASGI handler runs every request in its own thread-sensitive
+    context, so a persistent connection is never picked up by a later
+    request and stays open until the process exits; Django's deployment
+    docs say to disable them under ASGI. ``server.asgi`` sets
+    ``DJANGO_ASGI`` before the settings are loaded.
+    """
+    if os.getenv("DJANGO_ASGI", "False") == "True":
+        return 0
+    return seconds
+
+
+def pool_available() -> bool:
+    """Whether Django can use psycopg 3's connection pool."""
+    return (
+        importlib.util.find_spec("psycopg") is not None
+        and importlib.util.find_spec("psycopg_pool") is not None
+    )
+
+
+def replica_databases(engine: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Return read-replica aliases ``replica1``, ``replica2``... for ``engine``.
+
+    ``SQLITE_REPLICAS`` lists replica database files and
+    ``POSTGRES_REPLICA_HOSTS`` replica hosts sharing the primary's
+    credentials, both comma separated. In tests every replica mirrors
+    ``default`` so no extra test databases are created.
+    """
+    configs = _secondary_configs(engine, "SQLITE_REPLICAS", "POSTGRES_REPLICA_HOSTS")
+    return {
+        f"replica{index}": {**config, "TEST": {"MIRROR": "default"}}
+        for index, config in enumerate(configs, start=1)
+    }
+
+
+def shard_databases(engine: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Return campaign shard aliases ``shard1``, ``shard2``... for ``engine``.
+
+    ``SQLITE_SHARDS`` lists shard database files and ``POSTGRES_SHARD_HOSTS``
+    shard hosts sharing the primary's credentials, both comma separated.
+    ``default`` stays shard zero and keeps every unsharded table.
+    """
+    configs = _secondary_configs(engine, "SQLITE_SHARDS", "POSTGRES_SHARD_HOSTS")
+    return {f"shard{index}": config for index, config in enumerate(configs, start=1)}
+
+
+def replica_weights(aliases: List[str]) -> Dict[str, int]:
+    """
+    Map each replica alias to its selection weight.
+
+    ``DATABASE_REPLICA_WEIGHTS`` holds comma-separated weights in replica
+    order; missing entries default to 1.
+    """
+    weights = [int(weight) for weight in _env_list("DATABASE_REPLICA_WEIGHTS")]
+    return {
+        alias: weights[index] if index < len(weights) else 1
+        for index, alias in enumerate(aliases)
+    }
+
+
+def _env_list(name: str) -> List[str]:
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+def _secondary_configs(
+    engine: str, sqlite_variable: str, postgres_variable: str
+) -> List[Dict[str, Any]]:
+    if engine == "sqlite":
+        return [sqlite_database(path) for path in _env_list(sqlite_variable)]
+    return [
+        {**postgres_database(), "HOST": host} for host in _env_list(postgres_variable)
+    ]
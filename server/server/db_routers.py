@@ -0,0 +1,158 @@
+"""
+Database routers: account shards and read replicas.
+
+``ShardRouter`` keeps each account's campaign data on the shard recorded
+for it (see ``campaigns.sharding``) and everything else on ``default``.
+
+``ReplicaRouter`` reads from the aliases weighted in ``DATABASE_REPLICAS``.
+Campaign reads only go to a replica inside ``replica_reads()``, which the
+campaign viewsets enter for safe requests; everything else, and every
+write, uses the primary (``default``). After an account writes, its reads
+stay on the primary for ``REPLICA_STICKY_SECONDS`` so replication lag
+never hides the user's own changes. The sticky marks live in the default
+cache, which is Redis when ``REDIS_URL`` is set (as in docker-compose.yml)
+and must be whenever several processes serve requests: a process-local
+cache only keeps a read on the primary in the process that wrote.
+"""
+
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+
+from campaigns.sharding import (
+    SHARDED_MODELS,
+    current_shard,
+    placement_for,
+    shards,
+)
+
+# Apps whose reads may be served from a replica
+REPLICA_APPS = {"campaigns"}
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+def replicas_enabled() -> bool:
+    return bool(getattr(settings, "DATABASE_REPLICAS", None))
+
+
+def _sticky_key(account_id: Any) -> str:
+    return f"db-router:sticky:{account_id}"
+
+
+def mark_written(account_id: Any) -> None:
+    """Pin the account's reads to the primary for the sticky window."""
+    seconds = settings.REPLICA_STICKY_SECONDS
+    if replicas_enabled() and seconds > 0:
+        cache.set(_sticky_key(account_id), True, seconds)
+
+
+def recently_written(account_id: Any) -> bool:
+    """Whether the account wrote within the sticky window."""
+    return bool(cache.get(_sticky_key(account_id), False))
+
+
+def set_replica_reads(enabled: bool):
+    """Allow or forbid replica reads in the current context; returns a token."""
+    return _replica_reads.set(enabled)
+
+
+def reset_replica_reads(token) -> None:
+    _replica_reads.reset(token)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """Route reads of replica-enabled apps to replicas within the block."""
+    token = set_replica_reads(enabled)
+    try:
+        yield
+    finally:
+        reset_replica_reads(token)
+
+
+class ReplicaRouter:
+    """Send opted-in reads to a weighted replica and all writes to primary."""
+
+    def pick_replica(self) -> str:
+        aliases = list(settings.DATABASE_REPLICAS)
+        weights = list(settings.DATABASE_REPLICAS.values())
+        return random.choices(aliases, weights=weights)[0]
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        if model._meta.app_label not in REPLICA_APPS or not _replica_reads.get():
+            return None
+        if not replicas_enabled():
+            return None
+        # Related lookups follow the database their instance came from
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return self.pick_replica()
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> str:
+        # Never fall back to the instance's database: it may be a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, "DATABASE_REPLICAS", {})}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> Optional[bool]:
+        # Replicas receive the schema through replication (or a file copy)
+        if db in getattr(settings, "DATABASE_REPLICAS", {}):
+            return False
+        return None
+
+
+class ShardRouter:
+    """Send each account's campaign data to its shard."""
+
+    def _shard(self, model: Type[Model], hints: dict) -> Optional[str]:
+        instance = hints.get("instance")
+        if model._meta.label_lower not in SHARDED_MODELS:
+            # Accounts and other tables stay on default, even when reached
+            # through a sharded instance
+            return DEFAULT_DB_ALIAS if instance is not None else None
+        alias = current_shard()
+        if alias is not None or instance is None:
+            return alias
+        if instance._meta.label == settings.AUTH_USER_MODEL:
+            return placement_for(instance.pk).alias
+        if instance._state.db:
+            return instance._state.db
+        account_id = getattr(instance, "account_id", None)
+        campaign = instance._state.fields_cache.get("campaign")
+        if account_id is None and campaign is not None:
+            return campaign._state.db or placement_for(campaign.account_id).alias
+        return placement_for(account_id).alias if account_id else None
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        return self._shard(model, hints)
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        return self._shard(model, hints)
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        aliases = set(shards())
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(
+        self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any
+    ) -> Optional[bool]:
+        if db == DEFAULT_DB_ALIAS or db not in shards():
+            return None
+        # Shards only hold the sharded tables
+        return f"{app_label}.{model_name}" in SHARDED_MODELS
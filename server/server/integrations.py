@@ -0,0 +1,62 @@
+"""
+Lazily initialized third-party integrations.
+
+Importing settings must stay cheap: every gunicorn worker recycled by
+``--max-requests`` imports them again. Integrations with a noticeable
+startup cost are therefore configured through settings and initialized
+here, once per process, by the WSGI/ASGI entry points and the
+``run_jobs`` worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_initialized = False
+
+
+def init_integrations() -> None:
+    """Initialize all enabled integrations; later calls are no-ops."""
+    global _initialized
+    if _initialized:
+        return
+    with _lock:
+        if _initialized:
+            return
+        init_sentry()
+        _initialized = True
+
+
+def init_sentry() -> bool:
+    """
+    Initialize Sentry if a DSN is configured.
+
+    Returns:
+        Whether Sentry is enabled in this process
+    """
+    if not settings.SENTRY_DSN:
+        return False
+
+    # Imported here so processes without Sentry never pay for the SDK
+    import sentry_sdk
+
+    options = {
+        "dsn": settings.SENTRY_DSN,
+        "send_default_pii": settings.SENTRY_SEND_DEFAULT_PII,
+        "traces_sample_rate": settings.SENTRY_TRACES_SAMPLE_RATE,
+    }
+    if settings.SENTRY_PROFILE_SESSION_SAMPLE_RATE:
+        options.update(
+            profile_session_sample_rate=settings.SENTRY_PROFILE_SESSION_SAMPLE_RATE,
+            # Run the profiler only while a transaction is active
+            profile_lifecycle="trace",
+        )
+    sentry_sdk.init(**options)
+    logger.info("Sentry initialized")
+    return True
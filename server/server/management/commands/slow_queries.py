@@ -0,0 +1,112 @@
+"""
+Summarize the slow query log written by ``server.slow_queries``.
+
+Entries are grouped by fingerprint and ranked by total time (or count or
+worst duration with ``--sort``). Each offender is printed with its
+normalized SQL, the views and call site issuing it and the plan captured
+for its slowest explained run. Rotated log files are read as well.
+
+Usage:
+
+    python manage.py slow_queries --top 10 --since-hours 24
+"""
+
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Summarize the slowest queries from the slow query log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--sort",
+            choices=["total", "count", "max"],
+            default="total",
+            help="Rank fingerprints by total time, occurrences or worst run",
+        )
+        parser.add_argument(
+            "--since-hours",
+            type=float,
+            default=None,
+            help="Only entries from the last N hours",
+        )
+        parser.add_argument(
+            "--file",
+            default=settings.SLOW_QUERY_LOG_FILE,
+            help="Log file to read; its rotated copies are read too",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["file"])
+        files = sorted(path.parent.glob(f"{path.name}.*")) + [path]
+        files = [f for f in files if f.suffix[1:].isdigit() or f == path]
+        if not any(f.exists() for f in files):
+            raise CommandError(f"No slow query log at {path}")
+        since = None
+        if options["since_hours"] is not None:
+            since = timezone.now() - timedelta(hours=options["since_hours"])
+
+        groups = defaultdict(
+            lambda: {"count": 0, "total": 0.0, "max": 0.0, "views": Counter()}
+        )
+        for entry in self._entries(files):
+            if since and datetime.fromisoformat(entry["at"]) < since:
+                continue
+            group = groups[entry["fingerprint"]]
+            group["count"] += 1
+            group["total"] += entry["duration_ms"]
+            group["views"][entry.get("view") or "-"] += 1
+            if entry["duration_ms"] >= group["max"]:
+                group["max"] = entry["duration_ms"]
+                group["sql"] = entry["sql"]
+                group["stack"] = entry.get("stack") or []
+            if entry.get("plan") and entry["duration_ms"] >= group.get("plan_ms", 0.0):
+                group["plan"] = entry["plan"]
+                group["plan_ms"] = entry["duration_ms"]
+
+        ranked = sorted(
+            groups.items(), key=lambda item: item[1][options["sort"]], reverse=True
+        )
+        self.stdout.write(
+            f"{len(groups)} slow query fingerprints, "
+            f"{sum(g['count'] for g in groups.values())} entries"
+        )
+        for rank, (key, group) in enumerate(ranked[: options["top"]], start=1):
+            views = ", ".join(
+                f"{view} ({count})" for view, count in group["views"].most_common(3)
+            )
+            self.stdout.write(
+                f"\n#{rank} {key}: {group['count']} runs, "
+                f"{group['total']:.1f} ms total, "
+                f"{group['total'] / group['count']:.1f} ms mean, "
+                f"{group['max']:.1f} ms max"
+            )
+            self.stdout.write(f"  views: {views}")
+            self.stdout.write(f"  sql: {group['sql']}")
+            for frame in group["stack"]:
+                self.stdout.write(f"    at {frame}")
+            if group.get("plan"):
+                self.stdout.write(f"  plan ({group['plan_ms']:.1f} ms run):")
+                for line in group["plan"].splitlines():
+                    self.stdout.write(f"    {line}")
+
+    def _entries(self, files):
+        for path in files:
+            if not path.exists():
+                continue
+            with path.open() as lines:
+                for line in lines:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:  # A diagnostic line, not an entry
+                        continue
+                    if isinstance(entry, dict) and "fingerprint" in entry:
+                        yield entry
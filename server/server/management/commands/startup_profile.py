@@ -0,0 +1,214 @@
+"""
+Report where worker start-up time goes.
+
+Each run starts a fresh interpreter with ``-X importtime`` that boots the
+project phase by phase (settings, logging, integrations, app registry,
+middleware, URLconf) and serves one request, so the numbers match what a
+newly forked or recycled worker pays before its first response.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOTSTRAP = r"""
+import io, json, sys, time
+start = time.perf_counter()
+phases, ready = [], {}
+
+def mark(name):
+    phases.append((name, time.perf_counter() - start))
+
+from django.conf import settings
+settings.INSTALLED_APPS
+mark("settings")
+
+from django.utils.log import configure_logging
+configure_logging(settings.LOGGING_CONFIG, settings.LOGGING)
+mark("logging")
+
+from server.integrations import init_integrations
+init_integrations()
+mark("integrations")
+
+from django.apps import AppConfig, apps
+create = AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    original = config.ready
+
+    def timed_ready():
+        t0 = time.perf_counter()
+        original()
+        ready[config.label] = time.perf_counter() - t0
+
+    config.ready = timed_ready
+    return config
+
+AppConfig.create = classmethod(timed_create)
+apps.populate(settings.INSTALLED_APPS)
+mark("app registry")
+
+from django.core.handlers.wsgi import WSGIHandler
+handler = WSGIHandler()
+mark("middleware")
+
+from django.urls import resolve
+path = sys.argv[1]
+resolve(path)
+mark("urlconf")
+
+host = next((h for h in settings.ALLOWED_HOSTS if h and h != "*"), "localhost")
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": path, "SERVER_NAME": host,
+    "SERVER_PORT": "80", "HTTP_HOST": host, "wsgi.input": io.BytesIO(),
+    "wsgi.url_scheme": "http", "wsgi.errors": sys.stderr,
+}
+status = []
+b"".join(handler(environ, lambda s, h: status.append(s)))
+mark("first response")
+print("STARTUP-PROFILE " + json.dumps(
+    {"phases": phases, "ready": ready, "status": status[0]}
+))
+"""
+
+
+def parse_importtime(stderr):
+    """Return {module: self_microseconds} from ``-X importtime`` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            _, self_us, _cumulative, name = (
+                part.strip() for part in line.replace(":", "|", 1).split("|")
+            )
+            modules[name] = modules.get(name, 0) + int(self_us)
+        except ValueError:
+            continue
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Profile cold start to first response, per phase, package and app."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument(
+            "--path", default="/", help="Path served as the first request"
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Packages to list by import cost"
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print the raw report as JSON"
+        )
+
+    def handle(self, *args, **options):
+        runs = [self._run_once(options["path"]) for _ in range(options["runs"])]
+        report = self._summarize(runs)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"Median of {len(runs)} cold start(s)\n")
+        self.stdout.write(f"{'phase':<18}{'at ms':>10}{'phase ms':>10}")
+        for name, at_ms, phase_ms in report["phases"]:
+            self.stdout.write(f"{name:<18}{at_ms:>10.1f}{phase_ms:>10.1f}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nCold start to first response: {report['total_ms']:.1f} ms "
+                f"({report['status']})"
+            )
+        )
+
+        self.stdout.write("\nImport time by app (self, ms) and ready() (ms)")
+        for label, values in report["apps"].items():
+            self.stdout.write(
+                f"  {label:<30}{values['import_ms']:>9.1f}{values['ready_ms']:>9.1f}"
+            )
+
+        self.stdout.write(f"\nTop {options['top']} packages by import time (ms)")
+        for package, ms in report["packages"][: options["top"]]:
+            self.stdout.write(f"  {package:<32}{ms:>9.1f}")
+
+    def _run_once(self, path):
+        env = {**os.environ, "PYTHONPATH": str(settings.BASE_DIR)}
+        env.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOTSTRAP, path],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+        )
+        marker = next(
+            (
+                line
+                for line in result.stdout.splitlines()
+                if line.startswith("STARTUP-PROFILE ")
+            ),
+            None,
+        )
+        if result.returncode or marker is None:
+            raise CommandError(f"Start-up run failed:\n{result.stderr[-2000:]}")
+        data = json.loads(marker.split(" ", 1)[1])
+        data["imports"] = parse_importtime(result.stderr)
+        return data
+
+    def _summarize(self, runs):
+        phase_names = [name for name, _ in runs[0]["phases"]]
+        phases, previous = [], 0.0
+        for index, name in enumerate(phase_names):
+            at = statistics.median(run["phases"][index][1] for run in runs) * 1000
+            phases.append((name, round(at, 2), round(at - previous, 2)))
+            previous = at
+
+        packages = defaultdict(list)
+        for run in runs:
+            totals = defaultdict(int)
+            for module, self_us in run["imports"].items():
+                totals[module.split(".")[0]] += self_us
+            for package, self_us in totals.items():
+                packages[package].append(self_us / 1000)
+        package_ms = sorted(
+            ((name, round(statistics.median(v), 2)) for name, v in packages.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+        apps = {}
+        for entry in settings.INSTALLED_APPS:
+            label = entry.rsplit(".", 1)[-1]
+            import_ms = statistics.median(
+                sum(
+                    us
+                    for module, us in run["imports"].items()
+                    if module == entry or module.startswith(entry + ".")
+                )
+                / 1000
+                for run in runs
+            )
+            ready_ms = statistics.median(
+                run["ready"].get(label, 0) * 1000 for run in runs
+            )
+            apps[entry] = {
+                "import_ms": round(import_ms, 2),
+                "ready_ms": round(ready_ms, 2),
+            }
+
+        return {
+            "phases": phases,
+            "total_ms": phases[-1][1] if phases else 0.0,
+            "status": runs[0]["status"],
+            "apps": apps,
+            "packages": package_ms,
+        }
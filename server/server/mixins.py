@@ -0,0 +1,153 @@
+"""
+Reusable viewset mixins.
+"""
+
+from __future__ import annotations
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from campaigns import idempotency
+from campaigns.sharding import (
+    AccountMoving,
+    placement_for,
+    reset_current_shard,
+    set_current_shard,
+    sharding_enabled,
+)
+from server.db_routers import (
+    mark_written,
+    recently_written,
+    replicas_enabled,
+    reset_replica_reads,
+    set_replica_reads,
+)
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe requests from read replicas.
+
+    Reads switch to replicas only after authentication, and only when the
+    account has not written within ``REPLICA_STICKY_SECONDS``; successful
+    unsafe requests start that window.
+    """
+
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if replicas_enabled():
+            self._replica_token = set_replica_reads(
+                request.method in SAFE_METHODS and not recently_written(request.user.pk)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._replica_token is not None:
+            reset_replica_reads(self._replica_token)
+            self._replica_token = None
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            mark_written(request.user.pk)
+        return response
+
+
+class ShardMixin:
+    """
+    Route the request's campaign queries to the account's shard.
+
+    The placement is looked up once per request, after authentication.
+    Writes are refused with 503 while the account is being resharded.
+    """
+
+    _shard_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if sharding_enabled():
+            placement = placement_for(request.user.pk)
+            if placement.moving and request.method not in SAFE_METHODS:
+                raise AccountMoving()
+            self._shard_token = set_current_shard(placement.alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._shard_token is not None:
+            reset_current_shard(self._shard_token)
+            self._shard_token = None
+        return response
+
+
+class _Replay(Exception):
+    def __init__(self, stored):
+        self.stored = stored
+
+
+class IdempotencyMixin:
+    """
+    Answer POST retries carrying an ``Idempotency-Key`` with the stored response.
+
+    The key is claimed after authentication, so it is scoped to the
+    account; see ``campaigns.idempotency``. Replayed responses carry an
+    ``Idempotent-Replayed: true`` header.
+    """
+
+    _idempotency_key = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        key = request.headers.get(idempotency.IDEMPOTENCY_KEY_HEADER)
+        if request.method != "POST" or not key:
+            return
+        if len(key) > idempotency.MAX_KEY_LENGTH:
+            raise ValidationError(
+                {
+                    idempotency.IDEMPOTENCY_KEY_HEADER: [
+                        f"Must be at most {idempotency.MAX_KEY_LENGTH} characters."
+                    ]
+                }
+            )
+        stored = idempotency.claim(
+            request.user.pk, key, idempotency.fingerprint(request._request)
+        )
+        if stored is not None:
+            raise _Replay(stored)
+        self._idempotency_key = key
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            return Response(
+                exc.stored.response_data,
+                status=exc.stored.response_status,
+                headers={idempotency.REPLAYED_HEADER: "true"},
+            )
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            self._release_idempotency_key()
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._idempotency_key is not None:
+            if response.status_code < 500 and isinstance(response, Response):
+                idempotency.complete(
+                    request.user.pk,
+                    self._idempotency_key,
+                    response.status_code,
+                    response.data,
+                )
+                self._idempotency_key = None
+            else:
+                self._release_idempotency_key()
+        return response
+
+    def _release_idempotency_key(self):
+        if self._idempotency_key is not None:
+            idempotency.release(self.request.user.pk, self._idempotency_key)
+            self._idempotency_key = None
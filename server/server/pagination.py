@@ -0,0 +1,213 @@
+"""
+Counting large querysets without ``COUNT(*)`` over the whole table.
+
+``estimated_count`` counts exactly up to ``ESTIMATED_COUNT_THRESHOLD``
+rows with a bounded ``COUNT`` over ``LIMIT threshold + 1``. Past that the
+number only sizes a page range, so it is taken from the PostgreSQL
+planner (``EXPLAIN``), which reads table statistics instead of rows. Other
+databases have no row estimate; there the exact count is computed once
+and cached for ``ESTIMATED_COUNT_CACHE_SECONDS``. Writes do not refresh
+it, so it is reported as approximate too.
+
+Counts can also be cached under a scope, such as one account's
+campaigns, whose version is bumped by ``bump_count_version`` when the
+scope's rows change; those counts are exact unless the planner estimated
+them. Versions live in the default cache, so only processes sharing it
+(``REDIS_URL``) see a bump at once. With per-process caches, a count
+cached by one process misses the writes of the others (web workers,
+``run_jobs``, the scheduling and landing page commands) for up to
+``ESTIMATED_COUNT_CACHE_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+def _threshold() -> int:
+    return getattr(settings, "ESTIMATED_COUNT_THRESHOLD", 10000)
+
+
+def _cache_seconds() -> int:
+    return getattr(settings, "ESTIMATED_COUNT_CACHE_SECONDS", 300)
+
+
+def _version_key(scope: str) -> str:
+    return f"count-version:{scope}"
+
+
+def count_version(scope: str) -> int:
+    return cache.get(_version_key(scope), 0)
+
+
+def bump_count_version(scope: str, using: Optional[str] = None) -> None:
+    """Invalidate the counts cached for ``scope`` once the transaction commits."""
+
+    def bump():
+        # A plain set: ``incr`` fails when the key was evicted (or never
+        # stored, e.g. by the dummy cache) between ``add`` and ``incr``
+        cache.set(_version_key(scope), time.time_ns(), None)
+
+    transaction.on_commit(bump, using=using)
+
+
+def planner_estimate(queryset: QuerySet) -> Optional[int]:
+    """Rows the PostgreSQL planner expects ``queryset`` to return."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(queryset: QuerySet) -> int:
+    """Exact count of ``queryset``, cached by its SQL."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha1(f"{queryset.db}:{sql}:{params!r}".encode())
+    key = f"count:{digest.hexdigest()}"
+    return cache.get_or_set(key, queryset.count, _cache_seconds())
+
+
+def estimated_count(
+    queryset: QuerySet, cache_key: Optional[str] = None
+) -> Tuple[int, bool]:
+    """
+    Count ``queryset`` cheaply.
+
+    Args:
+        queryset: Rows to count
+        cache_key: Cache the result under this key, which must change
+            whenever the rows do (see ``count_cache_key``)
+
+    Returns:
+        The count and whether it is exact. Estimates never go below the
+        threshold, so the page range never ends before the rows do.
+    """
+    if cache_key is not None:
+        # The key's scope version changes with the rows: a full count is exact
+        return tuple(
+            cache.get_or_set(
+                cache_key,
+                lambda: _count(queryset, lambda: (queryset.count(), True)),
+                _cache_seconds(),
+            )
+        )
+    return _count(queryset, lambda: (cached_count(queryset), False))
+
+
+def _count(
+    queryset: QuerySet, full_count: Callable[[], Tuple[int, bool]]
+) -> Tuple[int, bool]:
+    threshold = _threshold()
+    queryset = queryset.order_by()
+    bounded = queryset[: threshold + 1].count()
+    if bounded <= threshold:
+        return bounded, True
+    estimate = planner_estimate(queryset)
+    if estimate is None:
+        return full_count()
+    return max(estimate, bounded), False
+
+
+def count_cache_key(scope: str, params: dict) -> str:
+    """Key of a count of ``scope``'s rows filtered by ``params``."""
+    filters = sorted((key, str(value)) for key, value in params.items())
+    digest = hashlib.sha1(repr(filters).encode()).hexdigest()
+    return f"count:{scope}:{count_version(scope)}:{digest}"
+
+
+class EstimatedCountPaginator(Paginator):
+    """Django paginator whose ``count`` comes from ``estimated_count``."""
+
+    def __init__(self, *args, count_cache_key: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def _counted(self) -> Tuple[int, bool]:
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list), True
+        return estimated_count(self.object_list, self.count_cache_key)
+
+    @cached_property
+    def count(self) -> int:
+        return self._counted[0]
+
+    @property
+    def count_is_exact(self) -> bool:
+        return self._counted[1]
+
+
+class EstimatedCountPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination reporting an estimated count on large results.
+
+    Only used when the request asks for a ``page`` or ``page_size``; other
+    requests keep the unpaginated list. Responses carry
+    ``count_is_approximate``. Views with a ``get_count_scope()`` have their
+    counts cached per scope version and filter parameters.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    # Query parameters that do not change the count
+    uncounted_params = ("page", "page_size", "ordering")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.page_query_param not in params and (
+            self.page_size_query_param not in params
+        ):
+            return None
+        self.count_cache_key = None
+        if hasattr(view, "get_count_scope"):
+            filters = {
+                key: params.getlist(key)
+                for key in params
+                if key not in self.uncounted_params
+            }
+            self.count_cache_key = count_cache_key(view.get_count_scope(), filters)
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset, page_size):
+        # Called by paginate_queryset() in place of a Paginator class
+        return EstimatedCountPaginator(
+            queryset, page_size, count_cache_key=self.count_cache_key
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_is_approximate": not self.page.paginator.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_approximate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
@@ -0,0 +1,232 @@
+"""
+Opt-in profiling of single requests for staff.
+
+A staff user gets a short-lived signed token from
+``POST /api/profiles/token/`` and sends it with the request to profile,
+as an ``X-Profile-Token`` header or a ``_profile`` query parameter.
+``ProfilingMiddleware`` runs that one request under ``cProfile`` and
+stores the stats (a ``pstats`` dump, readable with ``python -m pstats``
+or snakeviz) with the request's method, path, status and timing in
+``PROFILE_DIR``. The response names the profile in ``X-Profile-Id``.
+
+``PROFILE_DIR`` is a ring buffer: past ``PROFILE_MAX_FILES`` profiles
+the oldest are deleted. Staff list them with ``GET /api/profiles/``
+and download one with ``GET /api/profiles/<id>/``.
+
+Requests without a token only pay for one header and one substring
+lookup. An invalid or expired token is ignored rather than rejected, so
+a stale token never breaks a request, and one profile runs at a time per
+process; a request arriving while another is profiled is served as is.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import (
+    async_to_sync,
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.utils import timezone
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_PARAM = "_profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_META_KEY = "HTTP_" + PROFILE_HEADER.upper().replace("-", "_")
+_SALT = "server.profiling"
+_PROFILE_ID = re.compile(r"^\d{19,}-[0-9a-f]{8}$")
+
+# cProfile cannot profile two threads' requests with one hook
+_lock = threading.Lock()
+
+
+def make_token(user) -> str:
+    """Signed token letting ``user``'s requests opt into profiling."""
+    return signing.dumps({"user": user.pk}, salt=_SALT)
+
+
+def _token_user(token: str) -> Optional[int]:
+    try:
+        data = signing.loads(token, salt=_SALT, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return data.get("user")
+
+
+def _directory() -> Path:
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def save_profile(profiler: cProfile.Profile, metadata: Dict[str, Any]) -> str:
+    """Store a finished profile and drop the oldest past the cap."""
+    directory = _directory()
+    # Ids sort by creation time
+    profile_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    stats_tmp = directory / f".{profile_id}.prof"
+    meta_tmp = directory / f".{profile_id}.json"
+    profiler.dump_stats(stats_tmp)
+    meta_tmp.write_text(json.dumps({"id": profile_id, **metadata}))
+    # The metadata file appears last and marks the profile as complete
+    os.replace(stats_tmp, directory / f"{profile_id}.prof")
+    os.replace(meta_tmp, directory / f"{profile_id}.json")
+
+    for meta in sorted(directory.glob("*.json"))[: -settings.PROFILE_MAX_FILES]:
+        meta.unlink(missing_ok=True)
+        meta.with_suffix(".prof").unlink(missing_ok=True)
+    return profile_id
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Metadata of the stored profiles, newest first."""
+    profiles = []
+    for meta in sorted(_directory().glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(meta.read_text()))
+        except (OSError, ValueError):  # Dropped from the ring meanwhile
+            continue
+    return profiles
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """Stats file of a stored profile, if it exists."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = _directory() / f"{profile_id}.prof"
+    return path if path.exists() else None
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests carrying a valid staff profiling token.
+
+    Async-capable: under ASGI other requests pass straight through on the
+    event loop. A profiled one runs the rest of the chain synchronously on
+    the request's thread, as sync-only middleware would, so the profile
+    also covers the (sync) view instead of only the event loop's waiting.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        staff_id = _requested_by(request)
+        if staff_id is None:
+            return self.get_response(request)
+        return _profile(request, staff_id, self.get_response)
+
+    async def __acall__(self, request):
+        staff_id = _requested_by(request)
+        if staff_id is None:
+            return await self.get_response(request)
+        return await sync_to_async(_profile, thread_sensitive=True)(
+            request, staff_id, async_to_sync(self.get_response)
+        )
+
+
+def _requested_by(request) -> Optional[int]:
+    """The staff user whose token asks to profile ``request``, if any."""
+    token = request.META.get(_META_KEY)
+    if token is None and PROFILE_PARAM in request.META.get("QUERY_STRING", ""):
+        token = request.GET.get(PROFILE_PARAM)
+    return _token_user(token) if token else None
+
+
+def _profile(request, staff_id: int, get_response):
+    if not _lock.acquire(blocking=False):
+        return get_response(request)
+    try:
+        profiler = cProfile.Profile()
+        started_at = timezone.now()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+    finally:
+        _lock.release()
+
+    user = getattr(request, "user", None)
+    response[PROFILE_ID_HEADER] = save_profile(
+        profiler,
+        {
+            "method": request.method,
+            "path": request.path,
+            "query": request.META.get("QUERY_STRING", ""),
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "requested_by": staff_id,
+            "user": getattr(user, "pk", None),
+            "created_at": started_at.isoformat(),
+        },
+    )
+    return response
+
+
+class ProfileTokenView(APIView):
+    """``POST /api/profiles/token/``: a profiling token for the staff user."""
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        return Response(
+            {
+                "token": make_token(request.user),
+                "header": PROFILE_HEADER,
+                "expires_in": settings.PROFILE_TOKEN_MAX_AGE,
+            }
+        )
+
+
+class ProfileListView(APIView):
+    """``GET /api/profiles/``: the stored profiles, newest first."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(list_profiles())
+
+
+class ProfileDownloadView(APIView):
+    """``GET /api/profiles/<id>/``: download one profile's pstats file."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id: str):
+        path = profile_path(profile_id)
+        if path is None:
+            raise Http404("No such profile")
+        return FileResponse(
+            path.open("rb"),
+            as_attachment=True,
+            filename=path.name,
+            content_type="application/octet-stream",
+        )
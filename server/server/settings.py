@@ -10,29 +10,20 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
-import logging
-import logging.config
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
-import sentry_sdk
-
-sentry_sdk.init(
-    dsn="https://4ef0d9c953999d340456aea6dd3d7867@o4509412666703872.ingest.de.sentry.io/4509632650805328",
-    # Add data like request headers and IP for users,
-    # see https://docs.sentry.io/platforms/python/data-management/data-collected/ for more info
-    send_default_pii=True,
-    # Set traces_sample_rate to 1.0 to capture 100%
-    # of transactions for tracing.
-    traces_sample_rate=1.0,
-    # Set profile_session_sample_rate to 1.0 to profile 100%
-    # of profile sessions.
-    profile_session_sample_rate=1.0,
-    # Set profile_lifecycle to "trace" to automatically
-    # run the profiler on when there is an active transaction
-    profile_lifecycle="trace",
+
+from server.databases import (
+    postgres_database,
+    replica_databases,
+    replica_weights,
+    shard_databases,
+    sqlite_database,
 )
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -67,6 +58,8 @@ if not CORS_ALLOW_ALL_ORIGINS:
     CORS_ALLOWED_ORIGINS = [
         origin.strip() for origin in raw_origins.split(",") if origin.strip()
     ]
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key", "x-profile-token")
+CORS_EXPOSE_HEADERS = ["x-profile-id"]
 
 DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")  # sqlite | postgres
 DB_HOST_TYPE = os.getenv("DB_HOST_TYPE", "local")  # local | docker | remote
@@ -88,6 +81,8 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "corsheaders",
     "campaigns",
+    "jobs",
+    "server",
 ]
 
 REST_FRAMEWORK = {
@@ -100,6 +95,18 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ),
     "EXCEPTION_HANDLER": "utils.custom_exception_handler",
+    # Chosen by Accept / Content-Type; the first is the default
+    "DEFAULT_RENDERER_CLASSES": [
+        "server.renderers.ORJSONRenderer",
+        "server.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "server.renderers.ORJSONParser",
+        "server.renderers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
@@ -112,6 +119,10 @@ REST_FRAMEWORK = {
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    # Only requests carrying a staff profiling token, see server/profiling.py
+    "server.profiling.ProfilingMiddleware",
+    # Names the view in slow query entries, see server/slow_queries.py
+    "server.slow_queries.SlowQueryViewMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -145,32 +156,92 @@ WSGI_APPLICATION = "server.wsgi.application"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 if DB_ENGINE == "sqlite":
     DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
-            "OPTIONS": {
-                "timeout": 20,
-                # Better concurrency
-                "init_command": "PRAGMA journal_mode=WAL;",
-            },
-        }
+        "default": sqlite_database(os.getenv("SQLITE_NAME", BASE_DIR / "db.sqlite3"))
     }
 else:
-    DATABASES = {
+    DATABASES = {"default": postgres_database()}
+
+# Campaign shards and read replicas, see server/db_routers.py
+_shards = shard_databases(DB_ENGINE)
+_replicas = replica_databases(DB_ENGINE)
+DATABASES.update(_shards)
+DATABASES.update(_replicas)
+DATABASE_SHARDS = ["default", *_shards]
+DATABASE_REPLICAS = replica_weights(list(_replicas))
+DATABASE_ROUTERS = []
+if _shards:
+    # Shard placement wins; replicas only serve reads the shards leave open
+    DATABASE_ROUTERS.append("server.db_routers.ShardRouter")
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS.append("server.db_routers.ReplicaRouter")
+# Seconds an account's reads stay on the primary after it writes
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+# Cache shared by every process with REDIS_URL: sticky replica reads,
+# count versions and throttling must see other workers' writes. Without
+# it each process has its own memory cache, enough for runserver
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": os.getenv("POSTGRES_DB", "app_db"),
-            "USER": os.getenv("POSTGRES_USER", "postgres"),
-            "PASSWORD": os.getenv("POSTGRES_PASSWORD", "postgres"),
-            "PORT": os.getenv("POSTGRES_PORT", "5432"),
-            "HOST": os.getenv("POSTGRES_HOST", "localhost"),
-            "OPTIONS": {
-                "sslmode": os.getenv("POSTGRES_SSLMODE", "prefer"),
-                "connect_timeout": 10,
-            },
-            "CONN_MAX_AGE": 600,
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
         }
     }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Campaign audit trail, see campaigns/audit.py
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_BACKGROUND_FLUSH = os.getenv("AUDIT_BACKGROUND_FLUSH", "True") == "True"
+
+# Campaign change notifications, see campaigns/events.py
+CAMPAIGN_EVENTS_CHANNEL = os.getenv(
+    "CAMPAIGN_EVENTS_CHANNEL", "postgres" if DB_ENGINE == "postgres" else "local"
+)
+# Seconds between keep-alive comments on idle event streams
+CAMPAIGN_EVENTS_HEARTBEAT = float(os.getenv("CAMPAIGN_EVENTS_HEARTBEAT", "15"))
+# Seconds a stream ticket can be used to open (or reopen) a stream
+CAMPAIGN_EVENTS_TICKET_MAX_AGE = int(os.getenv("CAMPAIGN_EVENTS_TICKET_MAX_AGE", "60"))
+
+# Campaign change feed, see campaigns/changes.py
+CHANGES_SETTLE_SECONDS = float(os.getenv("CHANGES_SETTLE_SECONDS", "2"))
+CAMPAIGN_TOMBSTONE_RETENTION_DAYS = int(
+    os.getenv("CAMPAIGN_TOMBSTONE_RETENTION_DAYS", "30")
+)
+
+# Idempotency-Key replay of POST requests, see campaigns/idempotency.py
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+# Seconds a retry waits for the first request with its key to finish
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+# Seconds after which an unfinished claim counts as abandoned
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+# Row counts past this are estimated, see server/pagination.py
+ESTIMATED_COUNT_THRESHOLD = int(os.getenv("ESTIMATED_COUNT_THRESHOLD", "10000"))
+ESTIMATED_COUNT_CACHE_SECONDS = int(os.getenv("ESTIMATED_COUNT_CACHE_SECONDS", "300"))
+
+# Opt-in request profiles for staff, see server/profiling.py
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "campaign-profiles")
+)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_TOKEN_MAX_AGE = int(os.getenv("PROFILE_TOKEN_MAX_AGE", "600"))
+
+# Slow query log with EXPLAIN plans, see server/slow_queries.py
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN_LIMIT = int(os.getenv("SLOW_QUERY_EXPLAIN_LIMIT", "200"))
+SLOW_QUERY_LOG_FILE = os.getenv(
+    "SLOW_QUERY_LOG_FILE",
+    os.path.join(tempfile.gettempdir(), "slow-queries.jsonl"),
+)
+
+# Background job queue, see jobs/queue.py
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", "30"))
 
 
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
@@ -182,7 +253,7 @@ SESSION_SAVE_EVERY_REQUEST = False
 
 AUTH_PASSWORD_VALIDATORS = [
     {
-        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",  # noqa: E501
     },
     {
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
@@ -241,12 +312,24 @@ LOGGING = {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "message": {
+            "format": "{message}",
+            "style": "{",
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "formatter": "simple",
         },
+        "slow_queries": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": SLOW_QUERY_LOG_FILE,
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 3,
+            "delay": True,
+            "formatter": "message",
+        },
     },
     "root": {
         "handlers": ["console"],
@@ -258,16 +341,21 @@ LOGGING = {
             "level": "DEBUG",
             "propagate": False,
         },
+        # One JSON object per line, read by `manage.py slow_queries`
+        "server.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
 
-# Configure logging manually and log startup information
-logging.config.dictConfig(LOGGING)
-logger = logging.getLogger(__name__)
-logger.info(f"Loading settings for {ENV} environment")
-logger.info(f"DEBUG: {DEBUG}")
-logger.info(f"ALLOWED_HOSTS: {ALLOWED_HOSTS}")
-logger.info(f"CORS_ALLOW_ALL_ORIGINS: {CORS_ALLOW_ALL_ORIGINS}")
-logger.info(f"CORS_ALLOWED_ORIGINS: {CORS_ALLOWED_ORIGINS}")
-logger.info(f"DB_ENGINE: {DB_ENGINE}")
-logger.info(f"DB_HOST_TYPE: {DB_HOST_TYPE}")
+# Sentry is opt-in: it is initialized once per process by the WSGI/ASGI
+# entry points (see server/integrations.py), never at settings import
+SENTRY_DSN = os.getenv("SENTRY_DSN", "")
+SENTRY_SEND_DEFAULT_PII = os.getenv("SENTRY_SEND_DEFAULT_PII", "True") == "True"
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "1.0"))
+# Continuous profiling has a per-request cost; enable it explicitly
+SENTRY_PROFILE_SESSION_SAMPLE_RATE = float(
+    os.getenv("SENTRY_PROFILE_SESSION_SAMPLE_RATE", "0")
+)
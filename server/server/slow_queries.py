@@ -0,0 +1,203 @@
+"""
+Log of slow database queries.
+
+``ServerConfig.ready()`` installs ``slow_query_wrapper`` as an execute
+wrapper on every new connection. A statement running longer than
+``SLOW_QUERY_THRESHOLD_MS`` is written as one JSON line to the
+``server.slow_queries`` logger (a rotating file, ``SLOW_QUERY_LOG_FILE``)
+with its fingerprint, duration, database alias, the view serving the
+request (set by ``SlowQueryViewMiddleware``) and the project frames that
+issued it. Queries faster than the threshold only cost two clock reads.
+
+The fingerprint hashes the SQL with literals, placeholder lists and
+whitespace normalized, so the same ORM query groups together whatever
+its parameters. The first time a ``SELECT`` fingerprint is slow, and
+again whenever it runs twice as slow as when last explained, its plan is
+captured with ``EXPLAIN`` (``EXPLAIN QUERY PLAN`` on SQLite) and logged
+with it; at most ``SLOW_QUERY_EXPLAIN_LIMIT`` fingerprints are tracked
+per process. ``python manage.py slow_queries`` summarizes the log.
+
+Durations cover executing the statement, not fetching its rows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import traceback
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# The view whose request is running, for attributing queries
+current_view: ContextVar[Optional[str]] = ContextVar("current_view", default=None)
+
+MAX_SQL_LENGTH = 4000
+STACK_DEPTH = 6
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+_local = threading.local()
+_explained: Dict[str, float] = {}
+_explained_lock = threading.Lock()
+
+
+def normalize_sql(sql: str) -> str:
+    """The SQL with literals and placeholder lists replaced."""
+    sql = _LITERALS.sub("?", sql)
+    sql = _PLACEHOLDER_LISTS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def install(sender, connection, **kwargs) -> None:
+    """``connection_created`` receiver adding the wrapper once."""
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    if getattr(_local, "explaining", False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - started) * 1000
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        try:
+            _record(sql, params, many, context["connection"], duration_ms)
+        except Exception:  # Never fail the query over its log entry
+            logger.exception("Could not record a slow query")
+    return result
+
+
+def _record(sql, params, many, connection, duration_ms: float) -> None:
+    normalized = normalize_sql(sql)
+    key = fingerprint(normalized)
+    entry = {
+        "at": timezone.now().isoformat(),
+        "fingerprint": key,
+        "sql": normalized[:MAX_SQL_LENGTH],
+        "duration_ms": round(duration_ms, 3),
+        "alias": connection.alias,
+        "view": current_view.get(),
+        "stack": _call_site(),
+    }
+    if (
+        not many
+        and normalized[:6].upper() == "SELECT"
+        and _should_explain(key, duration_ms)
+    ):
+        entry["plan"] = _explain(connection, sql, params)
+    logger.warning(json.dumps(entry))
+
+
+def _call_site() -> List[str]:
+    """Innermost project frames, outside this module and installed packages."""
+    base = str(settings.BASE_DIR)
+    frames = [
+        f"{frame.filename[len(base) + 1 :]}:{frame.lineno} in {frame.name}"
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base)
+        and frame.filename != __file__
+        and "site-packages" not in frame.filename
+    ]
+    return frames[-STACK_DEPTH:]
+
+
+def _should_explain(key: str, duration_ms: float) -> bool:
+    with _explained_lock:
+        previous = _explained.get(key)
+        if previous is None and len(_explained) >= settings.SLOW_QUERY_EXPLAIN_LIMIT:
+            return False
+        if previous is not None and duration_ms < 2 * previous:
+            return False
+        _explained[key] = duration_ms
+        return True
+
+
+def _explain(connection, sql, params) -> Optional[str]:
+    prefix = connection.ops.explain_query_prefix()
+    _local.explaining = True
+    try:
+        # A failed EXPLAIN must not abort the caller's transaction; outside
+        # one, autocommit keeps SQLite from taking a write lock for it
+        savepoint = (
+            transaction.atomic(using=connection.alias)
+            if connection.in_atomic_block
+            else nullcontext()
+        )
+        with savepoint:
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+    except Exception:
+        logger.debug(f"EXPLAIN failed for {sql}", exc_info=True)
+        return None
+    finally:
+        _local.explaining = False
+    # SQLite's plan detail and PostgreSQL's plan line are the last column
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+class SlowQueryViewMiddleware:
+    """
+    Remember which view serves the request, for slow query entries.
+
+    Async-capable, so it adds no thread hop under ASGI. Queries of async
+    views run through ``sync_to_async``, whose thread sees the view in
+    ``current_view`` as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django would run a sync process_view through sync_to_async
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = current_view.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+    async def __acall__(self, request):
+        token = current_view.set(None)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _set_view(request, view_func)
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        _set_view(request, view_func)
+
+
+def _set_view(request, view_func) -> None:
+    match = request.resolver_match
+    current_view.set(match.view_name if match else view_func.__qualname__)
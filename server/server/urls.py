@@ -21,15 +21,28 @@ from django.contrib import admin
 from django.urls import include, path
 
 from . import views
+from .batch import BatchView
+from .profiling import ProfileDownloadView, ProfileListView, ProfileTokenView
+
 
 # for testing sentry
 def trigger_error(request):
     division_by_zero = 1 / 0
 
+
 urlpatterns = [
     path("sentry-debug/", trigger_error),
     path("", views.index, name="index"),
     path("admin/", admin.site.urls),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("api/profiles/", ProfileListView.as_view(), name="profile-list"),
+    path("api/profiles/token/", ProfileTokenView.as_view(), name="profile-token"),
+    path(
+        "api/profiles/<str:profile_id>/",
+        ProfileDownloadView.as_view(),
+        name="profile-detail",
+    ),
     path("api/", include("accounts.urls")),
     path("api/", include("campaigns.urls")),
+    path("api/", include("jobs.urls")),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -11,6 +11,11 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from server.integrations import init_integrations
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "server.settings")
 
+# Before the handler loads the middleware, which Sentry instruments
+init_integrations()
+
 application = get_wsgi_application()
@@ -1,13 +1,32 @@
+import queue
+
 import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from campaigns.audit import audit_sink
 from campaigns.models import Campaign, CampaignPayout
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def audit_events_stay_queued(settings):
+    """
+    Audit events are written only by tests flushing them, never by the
+    background thread racing the test database teardown.
+    """
+    settings.AUDIT_BACKGROUND_FLUSH = False
+    yield
+    # Left unflushed, they would be written by a later test
+    while True:
+        try:
+            audit_sink._queue.get_nowait()
+        except queue.Empty:
+            break
+
+
 @pytest.fixture
 def test_user(db):
     email = "test@test.com"
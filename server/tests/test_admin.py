@@ -0,0 +1,197 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from campaigns import events
+from campaigns.audit import audit_sink
+from campaigns.models import Campaign, CampaignAuditEvent, CampaignPayout
+from server.pagination import estimated_count
+
+
+def make_campaigns(account, count):
+    campaigns = Campaign.objects.bulk_create(
+        Campaign(
+            account=account, title=f"Campaign {i}", landing_page_url="https://a.com"
+        )
+        for i in range(count)
+    )
+    CampaignPayout.objects.bulk_create(
+        CampaignPayout(campaign=campaign, country="US", amount=1, currency="USD")
+        for campaign in campaigns
+    )
+    return campaigns
+
+
+@pytest.fixture
+def admin_client(client, db):
+    admin = get_user_model().objects.create_superuser(
+        username="admin@test.com", email="admin@test.com", password="x"
+    )
+    client.force_login(admin)
+    return client
+
+
+def changelist_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+class TestChangelists:
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "admin:campaigns_campaign_changelist",
+            "admin:campaigns_campaignpayout_changelist",
+        ],
+    )
+    def test_query_count_does_not_grow_with_rows(self, admin_client, test_user, name):
+        url = reverse(name)
+        make_campaigns(test_user, 5)
+        few = changelist_queries(admin_client, url)
+        for i in range(5):
+            email = f"u{i}@a.com"
+            account = get_user_model().objects.create_user(username=email, email=email)
+            make_campaigns(account, 10)
+
+        assert changelist_queries(admin_client, url) == few
+
+    def test_filters_by_account_without_listing_accounts(self, admin_client, test_user):
+        other = get_user_model().objects.create_user(
+            username="other@a.com", email="other@a.com"
+        )
+        make_campaigns(other, 2)
+        make_campaigns(test_user, 3)
+
+        response = admin_client.get(
+            reverse("admin:campaigns_campaign_changelist"),
+            {"account__id__exact": test_user.pk},
+        )
+
+        content = response.content.decode()
+        assert response.context["cl"].result_count == 3
+        assert "admin-autocomplete" in content
+        assert "other@a.com" not in content
+
+    def test_estimates_count_past_threshold(self, settings, test_user):
+        settings.ESTIMATED_COUNT_THRESHOLD = 5
+        make_campaigns(test_user, 8)
+
+        assert estimated_count(Campaign.objects.all()) == (8, False)
+        assert estimated_count(Campaign.objects.filter(title="Campaign 1")) == (
+            1,
+            True,
+        )
+
+
+@pytest.mark.django_db
+class TestPayoutInline:
+    def post(self, client, campaign, rows, deleted=(), amounts=None):
+        payouts = list(campaign.payouts.order_by("pk"))
+        data = {
+            "account": campaign.account_id,
+            "title": campaign.title,
+            "landing_page_url": campaign.landing_page_url,
+            "payouts-TOTAL_FORMS": len(payouts) + len(rows),
+            "payouts-INITIAL_FORMS": len(payouts),
+        }
+        for i, payout in enumerate(payouts):
+            data.update(
+                {
+                    f"payouts-{i}-id": payout.pk,
+                    f"payouts-{i}-campaign": campaign.pk,
+                    f"payouts-{i}-country": payout.country.code or "",
+                    f"payouts-{i}-amount": (amounts or {}).get(
+                        payout.country.code, payout.amount
+                    ),
+                    f"payouts-{i}-currency": payout.currency,
+                }
+            )
+            if payout.country.code in deleted:
+                data[f"payouts-{i}-DELETE"] = "on"
+        for i, (country, amount) in enumerate(rows, start=len(payouts)):
+            data.update(
+                {
+                    f"payouts-{i}-campaign": campaign.pk,
+                    f"payouts-{i}-country": country,
+                    f"payouts-{i}-amount": amount,
+                    f"payouts-{i}-currency": "USD",
+                }
+            )
+        url = reverse("admin:campaigns_campaign_change", args=[campaign.pk])
+        return client.post(url, data)
+
+    def test_saves_rows_together(self, admin_client, sample_campaign_instance):
+        response = self.post(
+            admin_client, sample_campaign_instance, [("FI", "3.00"), ("SE", "4.00")]
+        )
+
+        assert response.status_code == 302
+        assert set(
+            sample_campaign_instance.payouts.values_list("country", flat=True)
+        ) == {"US", "CA", "FI", "SE"}
+
+    def test_rejects_mixing_worldwide_and_countries(
+        self, admin_client, sample_campaign_instance
+    ):
+        response = self.post(admin_client, sample_campaign_instance, [("", "3.00")])
+
+        assert response.status_code == 200
+        assert "Cannot mix worldwide" in response.content.decode()
+        assert sample_campaign_instance.payouts.count() == 2
+
+    def test_replaces_countries_with_worldwide(
+        self, admin_client, sample_campaign_instance
+    ):
+        response = self.post(
+            admin_client,
+            sample_campaign_instance,
+            [("", "3.00")],
+            deleted=("US", "CA"),
+        )
+
+        assert response.status_code == 302
+        payout = sample_campaign_instance.payouts.get()
+        assert payout.is_worldwide
+
+    def test_changes_are_recorded_and_published(
+        self,
+        admin_client,
+        sample_campaign_instance,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+    ):
+        campaign = sample_campaign_instance
+        published = []
+        monkeypatch.setattr(events.broker, "publish", published.append)
+        ca = campaign.payouts.get(country="CA")
+        touched_at = campaign.updated_at
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.post(
+                admin_client,
+                campaign,
+                [("FI", "3.00")],
+                deleted=("US",),
+                amounts={"CA": "7.00"},
+            )
+        audit_sink.flush()
+
+        assert response.status_code == 302
+        recorded = {event.action: event for event in CampaignAuditEvent.objects.all()}
+        assert set(recorded) == {"payout.created", "payout.updated", "payout.deleted"}
+        assert recorded["payout.updated"].payout_id == ca.pk
+        assert recorded["payout.updated"].changes == {
+            "amount": [str(ca.amount), "7.00"]
+        }
+        assert recorded["payout.created"].changes["country"] == "FI"
+        assert {event.account_id for event in recorded.values()} == {
+            campaign.account_id
+        }
+        assert sorted(event["action"] for event in published) == sorted(recorded)
+        campaign.refresh_from_db()
+        assert campaign.updated_at > touched_at
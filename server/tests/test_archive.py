@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from campaigns.models import (
+    ArchivedCampaign,
+    ArchivedCampaignPayout,
+    Campaign,
+    CampaignPayout,
+)
+
+
+def age(campaign, days):
+    Campaign.objects.filter(pk=campaign.pk).update(
+        is_running=False, updated_at=timezone.now() - timedelta(days=days)
+    )
+
+
+@pytest.mark.django_db
+class TestArchive:
+    def test_archives_only_old_stopped_campaigns(self, sample_campaign_instance):
+        running = Campaign.objects.create(
+            account=sample_campaign_instance.account,
+            title="Running",
+            landing_page_url="https://example.com",
+            is_running=True,
+        )
+        age(sample_campaign_instance, 120)
+
+        call_command("archive_campaigns", older_than_days=90, verbosity=0)
+
+        assert list(Campaign.objects.all()) == [running]
+        archived = ArchivedCampaign.objects.get()
+        assert archived.id == sample_campaign_instance.id
+        assert archived.created_at == sample_campaign_instance.created_at
+        assert ArchivedCampaignPayout.objects.count() == 2
+        assert not CampaignPayout.objects.exists()
+
+    def test_recent_campaigns_stay_hot(self, sample_campaign_instance):
+        age(sample_campaign_instance, 10)
+
+        call_command("archive_campaigns", older_than_days=90, verbosity=0)
+
+        assert Campaign.objects.count() == 1
+        assert not ArchivedCampaign.objects.exists()
+
+    def test_list_includes_archived_on_request(
+        self, auth_client, sample_campaign_instance
+    ):
+        age(sample_campaign_instance, 120)
+        call_command("archive_campaigns", verbosity=0)
+        url = reverse("campaign-list")
+
+        assert auth_client.get(url).data == []
+
+        response = auth_client.get(url, {"include_archived": "true"})
+        assert response.status_code == 200
+        assert [c["id"] for c in response.data] == [sample_campaign_instance.id]
+        assert response.data[0]["is_archived"] is True
+        assert len(response.data[0]["payouts"]) == 2
+
+    def test_restore_moves_campaign_back(self, auth_client, sample_campaign_instance):
+        age(sample_campaign_instance, 120)
+        call_command("archive_campaigns", verbosity=0)
+
+        response = auth_client.post(
+            reverse("campaign-restore", args=[sample_campaign_instance.id])
+        )
+
+        assert response.status_code == 200
+        assert response.data["id"] == sample_campaign_instance.id
+        assert len(response.data["payouts"]) == 2
+        assert not ArchivedCampaign.objects.exists()
+        restored = Campaign.objects.get()
+        assert restored.created_at == sample_campaign_instance.created_at
+        assert restored.updated_at > timezone.now() - timedelta(minutes=1)
+
+    def test_restore_refuses_duplicate_title(
+        self, auth_client, sample_campaign_instance
+    ):
+        age(sample_campaign_instance, 120)
+        call_command("archive_campaigns", verbosity=0)
+        Campaign.objects.create(
+            account=sample_campaign_instance.account,
+            title=sample_campaign_instance.title,
+            landing_page_url="https://example.com",
+        )
+
+        response = auth_client.post(
+            reverse("campaign-restore", args=[sample_campaign_instance.id])
+        )
+
+        assert response.status_code == 400
+        assert ArchivedCampaign.objects.count() == 1
+
+    def test_restore_command_skips_conflicts(self, sample_campaign_instance, capsys):
+        age(sample_campaign_instance, 120)
+        call_command("archive_campaigns", verbosity=0)
+        Campaign.objects.create(
+            account=sample_campaign_instance.account,
+            title=sample_campaign_instance.title,
+            landing_page_url="https://example.com",
+        )
+
+        call_command("restore_campaigns", sample_campaign_instance.account_id)
+
+        assert "Skipped" in capsys.readouterr().err
+        assert ArchivedCampaign.objects.count() == 1
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+from django.urls import reverse
+
+from campaigns.audit import AuditSink, audit_sink
+from campaigns.models import CampaignAuditEvent
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.batches = []
+        self.written = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+        self.written.set()
+
+
+class TestAuditSink:
+    def test_flushes_when_batch_is_full(self):
+        writer = RecordingWriter()
+        sink = AuditSink(writer, batch_size=3, flush_interval=60)
+
+        for index in range(3):
+            sink.emit({"index": index})
+
+        assert writer.written.wait(2)
+        assert [len(batch) for batch in writer.batches] == [3]
+        sink.shutdown()
+
+    def test_flushes_after_interval(self):
+        writer = RecordingWriter()
+        sink = AuditSink(writer, batch_size=100, flush_interval=0.05)
+
+        sink.emit({"index": 0})
+
+        assert writer.written.wait(2)
+        assert writer.batches == [[{"index": 0}]]
+        sink.shutdown()
+
+    def test_shutdown_flushes_queue(self):
+        writer = RecordingWriter()
+        sink = AuditSink(writer, batch_size=2, flush_interval=60)
+
+        for index in range(5):
+            sink.emit({"index": index}, background=False)
+        sink.shutdown()
+
+        assert [len(batch) for batch in writer.batches] == [2, 2, 1]
+        assert sink.stats()["written"] == 5
+
+    def test_counts_dropped_events(self):
+        sink = AuditSink(RecordingWriter(), max_size=2)
+
+        for index in range(5):
+            sink.emit({"index": index}, background=False)
+
+        stats = sink.stats()
+        assert (stats["enqueued"], stats["dropped"], stats["queued"]) == (2, 3, 2)
+
+    def test_writer_errors_are_counted(self):
+        def failing_writer(batch):
+            raise RuntimeError("database unavailable")
+
+        sink = AuditSink(failing_writer)
+        sink.emit({"index": 0}, background=False)
+        sink.flush()
+
+        assert sink.stats()["failed"] == 1
+
+    def test_emit_does_not_wait_for_writer(self):
+        release = threading.Event()
+        sink = AuditSink(lambda batch: release.wait(2), batch_size=1)
+
+        started = time.perf_counter()
+        for index in range(50):
+            sink.emit({"index": index})
+        elapsed = time.perf_counter() - started
+
+        release.set()
+        sink.shutdown()
+        assert elapsed < 0.5
+
+
+@pytest.mark.django_db
+class TestCampaignAudit:
+    def test_campaign_changes_are_recorded(
+        self,
+        auth_client,
+        test_user,
+        sample_campaign_data,
+        settings,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.AUDIT_BACKGROUND_FLUSH = False
+        url = reverse("campaign-list")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = auth_client.post(url, sample_campaign_data, format="json").data
+            detail = reverse("campaign-detail", args=[created["id"]])
+            auth_client.patch(detail, {"is_running": False}, format="json")
+            auth_client.delete(detail)
+        audit_sink.flush()
+
+        events = list(CampaignAuditEvent.objects.order_by("id"))
+        assert [event.action for event in events] == [
+            "campaign.created",
+            "campaign.updated",
+            "campaign.deleted",
+        ]
+        assert {event.campaign_id for event in events} == {created["id"]}
+        assert {event.account_id for event in events} == {test_user.pk}
+        assert events[0].changes["payouts"][0]["amount"] == "90.00"
+        assert events[1].changes == {"is_running": [True, False]}
+        assert events[2].changes["title"] == sample_campaign_data["title"]
+
+    def test_events_wait_for_commit(self, auth_client, sample_campaign_data, settings):
+        settings.AUDIT_BACKGROUND_FLUSH = False
+
+        auth_client.post(reverse("campaign-list"), sample_campaign_data, format="json")
+        audit_sink.flush()
+
+        # The test transaction never commits, so nothing was queued
+        assert not CampaignAuditEvent.objects.exists()
+
+    def test_events_are_append_only(self):
+        event = CampaignAuditEvent.objects.create(
+            account_id=1,
+            campaign_id=1,
+            action="campaign.created",
+            occurred_at="2025-01-01T00:00:00Z",
+        )
+
+        with pytest.raises(ValueError):
+            event.save()
+        with pytest.raises(ValueError):
+            event.delete()
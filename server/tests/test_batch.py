@@ -0,0 +1,166 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from campaigns.models import Campaign, CampaignPayout
+from campaigns.views import CampaignPayoutViewSet, CampaignViewSet
+from server.batch import BATCH_MAX_OPERATIONS
+
+URL = reverse("batch")
+
+
+def create_campaign(title="Batch Campaign"):
+    return {
+        "method": "POST",
+        "path": "/api/campaigns/",
+        "body": {
+            "title": title,
+            "landing_page_url": "https://example.com",
+            "is_running": True,
+        },
+    }
+
+
+def add_payout(campaign="$0.id", country="US"):
+    return {
+        "method": "POST",
+        "path": "/api/payouts/",
+        "body": {
+            "campaign": campaign,
+            "country": country,
+            "amount": "5.00",
+            "currency": "USD",
+        },
+    }
+
+
+@pytest.mark.django_db
+class TestBatch:
+    def test_runs_operations_in_order_with_references(self, auth_client):
+        response = auth_client.post(
+            URL,
+            {
+                "atomic": True,
+                "operations": [
+                    create_campaign(),
+                    add_payout(country="US"),
+                    add_payout(country="CA"),
+                    {"method": "GET", "path": "/api/campaigns/$0.id/"},
+                ],
+            },
+            format="json",
+        )
+
+        assert response.status_code == 200
+        statuses = [result["status"] for result in response.data["results"]]
+        assert statuses == [201, 201, 201, 200]
+        campaign = Campaign.objects.get()
+        assert response.data["results"][3]["body"]["id"] == campaign.id
+        assert CampaignPayout.objects.filter(campaign=campaign).count() == 2
+
+    def test_atomic_batch_rolls_back_on_failure(self, auth_client):
+        response = auth_client.post(
+            URL,
+            {
+                "atomic": True,
+                "operations": [
+                    create_campaign(),
+                    add_payout(country="US"),
+                    add_payout(country="US"),  # Duplicate country
+                    create_campaign("Never created"),
+                ],
+            },
+            format="json",
+        )
+
+        assert response.status_code == 400
+        assert response.data["rolled_back"] is True
+        assert len(response.data["results"]) == 3
+        assert not Campaign.objects.exists()
+        assert not CampaignPayout.objects.exists()
+
+    def test_non_atomic_batch_continues_after_failure(self, auth_client):
+        response = auth_client.post(
+            URL,
+            {"operations": [add_payout(campaign=999999), create_campaign()]},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert [r["status"] for r in response.data["results"]] == [400, 201]
+        assert Campaign.objects.count() == 1
+
+    def test_unexpected_error_fails_only_its_operation(self, auth_client, monkeypatch):
+        def broken(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(CampaignPayoutViewSet, "finalize_response", broken)
+        operations = [create_campaign(), add_payout(), create_campaign("Second")]
+
+        response = auth_client.post(URL, {"operations": operations}, format="json")
+
+        assert response.status_code == 200
+        results = response.data["results"]
+        assert [r["status"] for r in results] == [201, 500, 201]
+        assert results[1]["body"]["error"] == "An unexpected error occurred"
+        assert Campaign.objects.count() == 2
+
+        operations = [create_campaign("Third"), add_payout()]
+        response = auth_client.post(
+            URL, {"atomic": True, "operations": operations}, format="json"
+        )
+
+        assert response.status_code == 500
+        assert response.data["rolled_back"] is True
+        assert Campaign.objects.count() == 2
+
+    def test_sub_requests_keep_scheme_and_host_under_asgi(self, test_user, monkeypatch):
+        urls = []
+        get_queryset = CampaignViewSet.get_queryset
+
+        def recording_get_queryset(self):
+            urls.append(self.request.build_absolute_uri())
+            return get_queryset(self)
+
+        monkeypatch.setattr(CampaignViewSet, "get_queryset", recording_get_queryset)
+        access = RefreshToken.for_user(test_user).access_token
+
+        response = async_to_sync(AsyncClient().post)(
+            URL,
+            json.dumps({"operations": [{"method": "GET", "path": "/api/campaigns/"}]}),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {access}"},
+            secure=True,
+        )
+
+        assert response.status_code == 200
+        assert urls == ["https://testserver/api/campaigns/"]
+
+    def test_rejects_routes_outside_campaigns(self, auth_client):
+        response = auth_client.post(
+            URL,
+            {"operations": [{"method": "POST", "path": "/api/batch/"}]},
+            format="json",
+        )
+
+        assert response.status_code == 400
+
+    def test_caps_batch_size_and_cost(self, auth_client):
+        too_many = [create_campaign(f"C{i}") for i in range(BATCH_MAX_OPERATIONS + 1)]
+        list_reads = [{"method": "GET", "path": "/api/campaigns/"}] * 11
+
+        for operations in (too_many, list_reads):
+            response = auth_client.post(URL, {"operations": operations}, format="json")
+            assert response.status_code == 400
+        assert not Campaign.objects.exists()
+
+    def test_requires_authentication(self, unauth_client):
+        response = unauth_client.post(
+            URL, {"operations": [create_campaign()]}, format="json"
+        )
+
+        assert response.status_code == 401
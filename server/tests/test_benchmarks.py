@@ -0,0 +1,40 @@
+from benchmarks.common import (
+    ScenarioResult,
+    compare_results,
+    percentile,
+    report_errors,
+)
+
+
+class TestBenchmarkHelpers:
+    def test_percentile_interpolates(self):
+        samples = [4, 1, 3, 2]
+        assert percentile(samples, 0) == 1
+        assert percentile(samples, 50) == 2.5
+        assert percentile(samples, 100) == 4
+        assert percentile([], 95) == 0.0
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        baseline = {"scenarios": {"list": {"p50_ms": 10.0, "rps": 100.0}}}
+        current = {"scenarios": {"list": {"p50_ms": 12.0, "rps": 95.0}}}
+
+        rows = {row["metric"]: row for row in compare_results(current, baseline, 0.1)}
+
+        assert rows["p50_ms"]["regression"] is True
+        assert rows["p50_ms"]["change_pct"] == 20.0
+        # A 5% throughput drop is within the 10% tolerance
+        assert rows["rps"]["regression"] is False
+
+    def test_scenario_result_from_samples(self):
+        result = ScenarioResult.from_samples("profile", [0.001, 0.003], 0.5)
+        assert result.requests == 2
+        assert result.p50_ms == 2.0
+        assert result.rps == 4.0
+
+    def test_errors_fail_the_run(self, capsys):
+        clean = ScenarioResult.from_samples("profile", [0.001], 0.1)
+        failing = ScenarioResult.from_samples("login", [0.001] * 4, 0.1, errors=3)
+
+        assert report_errors([clean]) == 0
+        assert report_errors([clean, failing]) == 1
+        assert "login: 3 of 4 requests failed" in capsys.readouterr().out
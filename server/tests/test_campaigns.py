@@ -1,6 +1,10 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from campaigns.models import Campaign, CampaignPayout
+
 
 @pytest.mark.django_db
 class TestCampaigns:
@@ -58,3 +62,86 @@ class TestCampaigns:
         # Check if our sample campaign is in the list
         campaign_names = [campaign["title"] for campaign in response.data]
         assert sample_campaign_instance.title in campaign_names
+
+    def test_export_campaigns_csv(self, auth_client, sample_campaign_instance):
+        """Test streaming the account's campaigns as CSV"""
+        url = reverse("campaign-export")
+        response = auth_client.get(url)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0].startswith("id,title,landing_page_url")
+        assert len(lines) == 2
+        assert sample_campaign_instance.title in lines[1]
+        assert "US 100.00 USD" in lines[1] and "CA 90.00 EUR" in lines[1]
+
+    def test_create_campaign_duplicate_title_ignores_case(
+        self, auth_client, sample_campaign_data
+    ):
+        url = reverse("campaign-list")
+        auth_client.post(url, sample_campaign_data, format="json")
+        sample_campaign_data["title"] = sample_campaign_data["title"].upper()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.post(url, sample_campaign_data, format="json")
+
+        assert response.status_code == 400
+        assert "A campaign with this title already exists" in response.data["error"]
+        # No lookup of the title before the INSERT
+        assert not any(
+            q["sql"].startswith("SELECT") and '"campaigns_campaign"' in q["sql"]
+            for q in queries
+        )
+        assert Campaign.objects.count() == 1
+
+    def test_edit_campaign_title_to_taken_title(
+        self, auth_client, sample_campaign_instance
+    ):
+        other = Campaign.objects.create(
+            account=sample_campaign_instance.account,
+            title="Other Campaign",
+            landing_page_url="https://example.com",
+        )
+        url = reverse("campaign-detail", args=[other.id])
+
+        taken = auth_client.patch(
+            url, {"title": sample_campaign_instance.title.lower()}, format="json"
+        )
+        recased = auth_client.patch(url, {"title": "OTHER campaign"}, format="json")
+
+        assert taken.status_code == 400
+        assert "title" in taken.data["error"]
+        assert recased.status_code == 200
+
+    def test_stream_list_matches_list(self, auth_client, test_user, monkeypatch):
+        """Test streaming the list in chunks renders the same JSON"""
+        monkeypatch.setattr("campaigns.exports.STREAM_CHUNK_SIZE", 2)
+        for i in range(5):
+            campaign = Campaign.objects.create(
+                account=test_user,
+                title=f"Campaign {i}",
+                landing_page_url="https://example.com",
+                is_running=i % 2 == 0,
+            )
+            CampaignPayout.objects.create(
+                campaign=campaign, country="US", amount=i, currency="USD"
+            )
+        url = reverse("campaign-list")
+
+        for params in ({}, {"is_running": "true", "ordering": "title"}):
+            listed = auth_client.get(url, params)
+            streamed = auth_client.get(url, {**params, "stream": "true"})
+
+            assert streamed.streaming
+            with CaptureQueriesContext(connection) as queries:
+                content = b"".join(streamed.streaming_content)
+            assert content == listed.content
+            # Payouts are prefetched per chunk of two campaigns
+            payouts = [q for q in queries if "campaigns_campaignpayout" in q["sql"]]
+            assert len(payouts) <= 3
+
+    def test_stream_empty_list(self, auth_client):
+        response = auth_client.get(reverse("campaign-list"), {"stream": "true"})
+
+        assert b"".join(response.streaming_content) == b"[]"
@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from campaigns.changes import encode_cursor
+from campaigns.models import Campaign, CampaignTombstone
+
+URL = reverse("campaign-changes")
+
+
+@pytest.fixture(autouse=True)
+def no_settle_window(settings):
+    settings.CHANGES_SETTLE_SECONDS = 0
+
+
+def sync(client, cursor=None, **params):
+    if cursor:
+        params["since"] = cursor
+    response = client.get(URL, params)
+    assert response.status_code == 200, response.data
+    return response.data
+
+
+@pytest.mark.django_db
+class TestCampaignChanges:
+    def test_initial_sync_returns_all_campaigns(
+        self, auth_client, sample_campaign_instance
+    ):
+        data = sync(auth_client)
+
+        assert [c["id"] for c in data["campaigns"]] == [sample_campaign_instance.id]
+        assert len(data["campaigns"][0]["payouts"]) == 2
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+
+    def test_returns_only_changes_since_cursor(
+        self, auth_client, sample_campaign_instance
+    ):
+        cursor = sync(auth_client)["cursor"]
+        assert sync(auth_client, cursor)["campaigns"] == []
+
+        other = Campaign.objects.create(
+            account=sample_campaign_instance.account,
+            title="Other",
+            landing_page_url="https://example.com/other",
+        )
+        data = sync(auth_client, cursor)
+
+        assert [c["id"] for c in data["campaigns"]] == [other.id]
+        assert sync(auth_client, data["cursor"])["campaigns"] == []
+
+    def test_payout_changes_bump_their_campaign(
+        self, auth_client, sample_campaign_instance
+    ):
+        cursor = sync(auth_client)["cursor"]
+        payout = sample_campaign_instance.payouts.first()
+
+        response = auth_client.delete(
+            reverse("campaign-payout-detail", args=[payout.pk])
+        )
+        assert response.status_code == 204
+
+        data = sync(auth_client, cursor)
+        assert [c["id"] for c in data["campaigns"]] == [sample_campaign_instance.id]
+
+    def test_deletions_are_reported_as_tombstones(
+        self, auth_client, sample_campaign_instance
+    ):
+        cursor = sync(auth_client)["cursor"]
+
+        response = auth_client.delete(
+            reverse("campaign-detail", args=[sample_campaign_instance.pk])
+        )
+        assert response.status_code == 204
+
+        data = sync(auth_client, cursor)
+        assert data["campaigns"] == []
+        assert [d["id"] for d in data["deleted"]] == [sample_campaign_instance.id]
+        assert sync(auth_client, data["cursor"])["deleted"] == []
+
+    def test_archiving_and_restoring_are_synced(
+        self, auth_client, sample_campaign_instance
+    ):
+        cursor = sync(auth_client)["cursor"]
+        Campaign.objects.filter(pk=sample_campaign_instance.pk).update(
+            is_running=False, updated_at=timezone.now() - timedelta(days=120)
+        )
+        call_command("archive_campaigns", verbosity=0)
+
+        data = sync(auth_client, cursor)
+        assert [d["id"] for d in data["deleted"]] == [sample_campaign_instance.id]
+
+        auth_client.post(
+            reverse("campaign-restore", args=[sample_campaign_instance.pk])
+        )
+        data = sync(auth_client, data["cursor"])
+        assert [c["id"] for c in data["campaigns"]] == [sample_campaign_instance.id]
+        assert not CampaignTombstone.objects.exists()
+
+    def test_pages_through_changes(self, auth_client, test_user):
+        Campaign.objects.bulk_create(
+            Campaign(
+                account=test_user,
+                title=f"Campaign {i}",
+                landing_page_url="https://example.com",
+            )
+            for i in range(5)
+        )
+
+        seen, cursor, has_more = [], None, True
+        while has_more:
+            data = sync(auth_client, cursor, limit=2)
+            assert len(data["campaigns"]) <= 2
+            seen += [c["id"] for c in data["campaigns"]]
+            cursor, has_more = data["cursor"], data["has_more"]
+
+        assert sorted(seen) == sorted(Campaign.objects.values_list("id", flat=True))
+
+    def test_other_accounts_changes_are_hidden(self, auth_client, django_user_model):
+        other = django_user_model.objects.create_user(username="o@o.com", password="x")
+        campaign = Campaign.objects.create(
+            account=other, title="Theirs", landing_page_url="https://example.com"
+        )
+        CampaignTombstone.objects.create(account_id=other.pk, campaign_id=campaign.id)
+
+        data = sync(auth_client)
+        assert data["campaigns"] == [] and data["deleted"] == []
+
+    def test_invalid_cursor_is_rejected(self, auth_client):
+        response = auth_client.get(URL, {"since": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_expired_cursor_is_gone(self, auth_client, settings):
+        old = timezone.now() - timedelta(
+            days=settings.CAMPAIGN_TOMBSTONE_RETENTION_DAYS + 1
+        )
+
+        response = auth_client.get(URL, {"since": encode_cursor((old, 0), (old, 0))})
+
+        assert response.status_code == 410
+
+    def test_purge_removes_expired_tombstones(self, test_user, settings):
+        kept = CampaignTombstone.objects.create(account_id=test_user.pk, campaign_id=1)
+        expired = CampaignTombstone.objects.create(
+            account_id=test_user.pk, campaign_id=2
+        )
+        CampaignTombstone.objects.filter(pk=expired.pk).update(
+            deleted_at=timezone.now()
+            - timedelta(days=settings.CAMPAIGN_TOMBSTONE_RETENTION_DAYS + 1)
+        )
+
+        call_command("purge_tombstones", verbosity=0)
+
+        assert list(CampaignTombstone.objects.all()) == [kept]
@@ -0,0 +1,120 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from campaigns.models import Campaign
+from server.databases import replica_databases, replica_weights
+from server.db_routers import ReplicaRouter, replica_reads
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = {"replica1": 3, "replica2": 1}
+    settings.REPLICA_STICKY_SECONDS = 30
+    cache.clear()
+    yield settings
+    cache.clear()
+
+
+@pytest.fixture
+def routed_reads(replicas, monkeypatch):
+    """Route to a recorded replica that is really ``default``."""
+    picked = []
+
+    def pick_replica(self):
+        picked.append("replica")
+        return "default"
+
+    monkeypatch.setattr(ReplicaRouter, "pick_replica", pick_replica)
+    replicas.DATABASE_ROUTERS = ["server.db_routers.ReplicaRouter"]
+    return picked
+
+
+class TestReplicaRouter:
+    def test_reads_use_replicas_only_when_allowed(self, replicas):
+        router = ReplicaRouter()
+
+        assert router.db_for_read(Campaign) is None
+        with replica_reads():
+            assert router.db_for_read(Campaign) in {"replica1", "replica2"}
+            # Accounts are never routed
+            assert router.db_for_read(Campaign.account.field.related_model) is None
+        assert router.db_for_write(Campaign) == "default"
+
+    def test_weighted_selection(self, replicas):
+        router = ReplicaRouter()
+        picks = [router.pick_replica() for _ in range(4000)]
+
+        assert 0.70 < picks.count("replica1") / len(picks) < 0.80
+
+    def test_replicas_are_not_migrated(self, replicas):
+        router = ReplicaRouter()
+
+        assert router.allow_migrate("replica1", "campaigns") is False
+        assert router.allow_migrate("default", "campaigns") is None
+
+    def test_replica_configuration_from_environment(self, monkeypatch):
+        monkeypatch.setenv("SQLITE_REPLICAS", "/tmp/a.sqlite3, /tmp/b.sqlite3")
+        monkeypatch.setenv("DATABASE_REPLICA_WEIGHTS", "3")
+
+        databases = replica_databases("sqlite")
+
+        assert list(databases) == ["replica1", "replica2"]
+        assert databases["replica2"]["NAME"] == "/tmp/b.sqlite3"
+        assert databases["replica1"]["TEST"] == {"MIRROR": "default"}
+        assert replica_weights(list(databases)) == {"replica1": 3, "replica2": 1}
+
+
+@pytest.mark.django_db
+class TestReadYourWrites:
+    def test_reads_go_to_replica(
+        self, auth_client, sample_campaign_instance, routed_reads
+    ):
+        response = auth_client.get(reverse("campaign-list"))
+
+        assert response.status_code == 200
+        assert routed_reads
+
+    def test_writes_pin_account_to_primary(
+        self, auth_client, sample_campaign_data, routed_reads
+    ):
+        response = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        )
+        assert response.status_code == 201
+        assert routed_reads == []
+
+        response = auth_client.get(reverse("campaign-list"))
+        assert response.status_code == 200
+        assert sample_campaign_data["title"] in [c["title"] for c in response.data]
+        assert routed_reads == []
+
+    def test_failed_writes_do_not_pin(self, auth_client, routed_reads):
+        response = auth_client.post(reverse("campaign-list"), {}, format="json")
+        assert response.status_code == 400
+
+        auth_client.get(reverse("campaign-list"))
+        assert routed_reads
+
+
+def test_redis_url_gives_every_process_one_cache():
+    script = (
+        "import django; django.setup();"
+        'from django.core.cache import caches; print(type(caches["default"]).__name__)'
+    )
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "server.settings",
+        "REDIS_URL": "redis://redis:6379/0",
+    }
+
+    completed = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env
+    )
+
+    # Sticky marks set by one worker are seen by the others
+    assert completed.stdout.strip() == "RedisCache", completed.stderr
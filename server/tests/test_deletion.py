@@ -0,0 +1,149 @@
+from itertools import count
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+
+from campaigns.deletion import delete_campaigns
+from campaigns.models import (
+    ArchivedCampaign,
+    ArchivedCampaignPayout,
+    Campaign,
+    CampaignPayout,
+    CampaignTombstone,
+)
+
+URL = reverse("campaign-bulk-delete")
+# Titles are unique per account
+TITLES = count()
+
+
+def make_campaigns(account, number, is_running=True):
+    campaigns = Campaign.objects.bulk_create(
+        Campaign(
+            account=account,
+            title=f"Campaign {account.pk}-{next(TITLES)}",
+            landing_page_url="https://example.com",
+            is_running=is_running,
+        )
+        for _ in range(number)
+    )
+    CampaignPayout.objects.bulk_create(
+        CampaignPayout(campaign=campaign, amount=1, currency="USD")
+        for campaign in campaigns
+    )
+    return campaigns
+
+
+@pytest.fixture
+def other_user(db):
+    return get_user_model().objects.create_user(username="o@o.com", password="x")
+
+
+@pytest.mark.django_db
+class TestDeleteCampaigns:
+    def test_deletes_in_chunks(self, test_user):
+        make_campaigns(test_user, 5)
+        chunks = []
+
+        counts = delete_campaigns(
+            Campaign.objects.all(),
+            "default",
+            chunk_size=2,
+            on_chunk=lambda rows, counts: chunks.append(len(rows)),
+        )
+
+        assert (counts.campaigns, counts.payouts) == (5, 5)
+        assert chunks == [2, 2, 1]
+        assert not Campaign.objects.exists() and not CampaignPayout.objects.exists()
+        assert CampaignTombstone.objects.count() == 5
+
+
+@pytest.mark.django_db
+class TestBulkDelete:
+    def test_by_ids(self, auth_client, test_user, other_user):
+        mine = make_campaigns(test_user, 3)
+        theirs = make_campaigns(other_user, 1)
+
+        response = auth_client.post(
+            URL, {"ids": [mine[0].id, mine[1].id, theirs[0].id]}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert response.data == {"deleted": 2, "payouts_deleted": 2}
+        assert set(Campaign.objects.values_list("id", flat=True)) == {
+            mine[2].id,
+            theirs[0].id,
+        }
+
+    def test_by_filter(self, auth_client, test_user):
+        make_campaigns(test_user, 2, is_running=False)
+        running = make_campaigns(test_user, 1)[0]
+
+        response = auth_client.post(f"{URL}?is_running=false", {}, format="json")
+
+        assert response.data["deleted"] == 2
+        assert list(Campaign.objects.all()) == [running]
+
+    def test_requires_ids_or_filters(self, auth_client, test_user):
+        make_campaigns(test_user, 1)
+
+        response = auth_client.post(URL, {}, format="json")
+
+        assert response.status_code == 400
+        assert Campaign.objects.count() == 1
+
+    @pytest.mark.parametrize("query", ["search=", "title=", "search=&is_running="])
+    def test_empty_filters_are_no_filters(self, auth_client, test_user, query):
+        make_campaigns(test_user, 3)
+
+        for background in (False, True):
+            response = auth_client.post(
+                f"{URL}?{query}", {"background": background}, format="json"
+            )
+            assert response.status_code == 400
+        assert Campaign.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestPurgeAccount:
+    def test_purges_account_and_campaign_data(self, test_user, other_user):
+        make_campaigns(test_user, 3)
+        make_campaigns(other_user, 1)
+        archived = ArchivedCampaign.objects.create(
+            id=10**6,
+            account=test_user,
+            title="Old",
+            landing_page_url="https://example.com",
+            created_at="2020-01-01T00:00Z",
+            updated_at="2020-01-01T00:00Z",
+        )
+        ArchivedCampaignPayout.objects.create(
+            id=10**6,
+            campaign=archived,
+            amount=1,
+            currency="USD",
+            created_at="2020-01-01T00:00Z",
+            updated_at="2020-01-01T00:00Z",
+        )
+        CampaignTombstone.objects.create(account_id=test_user.pk, campaign_id=1)
+
+        call_command("purge_account", test_user.pk, chunk_size=2, verbosity=0)
+
+        assert not get_user_model().objects.filter(pk=test_user.pk).exists()
+        assert list(Campaign.objects.values_list("account_id", flat=True)) == [
+            other_user.pk
+        ]
+        assert CampaignPayout.objects.count() == 1
+        assert not ArchivedCampaign.objects.exists()
+        assert not ArchivedCampaignPayout.objects.exists()
+        assert not CampaignTombstone.objects.exists()
+
+    def test_keep_account(self, test_user):
+        make_campaigns(test_user, 2)
+
+        call_command("purge_account", test_user.pk, keep_account=True, verbosity=0)
+
+        assert get_user_model().objects.filter(pk=test_user.pk).exists()
+        assert not Campaign.objects.exists()
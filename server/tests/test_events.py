@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from campaigns import events, streams
+from campaigns.events import RESYNC, EventBroker
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+class TestEventBroker:
+    def test_fans_out_to_the_account_subscribers(self):
+        broker = EventBroker("local")
+
+        async def scenario():
+            first, second = broker.subscribe(1), broker.subscribe(1)
+            other = broker.subscribe(2)
+            # Published from a worker thread, like a sync view does
+            await asyncio.to_thread(broker.publish, {"account_id": 1, "n": 1})
+            received = [await first.get(), await second.get()]
+            return received, other.queue.empty()
+
+        received, other_empty = run(scenario())
+
+        assert received == [{"account_id": 1, "n": 1}] * 2
+        assert other_empty
+
+    def test_slow_subscribers_are_told_to_resync(self):
+        broker = EventBroker("local")
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            for n in range(events.SUBSCRIBER_QUEUE_SIZE + 1):
+                broker.publish({"account_id": 1, "n": n})
+            await asyncio.sleep(0)
+            return [
+                subscription.queue.get_nowait()
+                for _ in range(subscription.queue.qsize())
+            ]
+
+        assert run(scenario()) == [RESYNC]
+
+    def test_unsubscribe(self):
+        broker = EventBroker("local")
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            broker.unsubscribe(subscription)
+            return broker.subscriber_count()
+
+        assert run(scenario()) == 0
+
+
+class TestEventStream:
+    def test_streams_events_and_heartbeats(self, settings, monkeypatch):
+        settings.CAMPAIGN_EVENTS_HEARTBEAT = 0.05
+        broker = EventBroker("local")
+        monkeypatch.setattr(streams, "broker", broker)
+
+        async def scenario():
+            stream = streams.event_stream(7)
+            lines = [await stream.__anext__()]
+            broker.deliver({"account_id": 7, "action": "campaign.updated"})
+            lines.append(await stream.__anext__())
+            lines.append(await stream.__anext__())
+            await stream.aclose()
+            return lines, broker.subscriber_count()
+
+        lines, subscribers = run(scenario())
+
+        assert lines == [
+            "retry: 3000\n\n",
+            'data: {"action": "campaign.updated"}\n\n',
+            ": keep-alive\n\n",
+        ]
+        assert subscribers == 0
+
+    @pytest.mark.django_db
+    def test_requires_a_token(self, unauth_client):
+        response = unauth_client.get(reverse("campaign-events"))
+
+        assert response.status_code == 401
+
+    @pytest.mark.django_db
+    def test_accepts_a_ticket_as_query_parameter(
+        self, auth_client, unauth_client, test_user
+    ):
+        ticket = auth_client.post(reverse("campaign-events-ticket")).data["ticket"]
+
+        response = unauth_client.get(reverse("campaign-events"), {"ticket": ticket})
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+
+    @pytest.mark.django_db
+    def test_refuses_access_tokens_and_expired_tickets_in_the_url(
+        self, unauth_client, test_user, settings
+    ):
+        token = str(RefreshToken.for_user(test_user).access_token)
+        settings.CAMPAIGN_EVENTS_TICKET_MAX_AGE = -1
+        url = reverse("campaign-events")
+
+        for params in ({"token": token}, {"ticket": token}):
+            assert unauth_client.get(url, params).status_code == 401
+        expired = streams.make_ticket(test_user)
+        assert unauth_client.get(url, {"ticket": expired}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_campaign_writes_publish_after_commit(
+    auth_client,
+    sample_campaign_data,
+    test_user,
+    monkeypatch,
+    django_capture_on_commit_callbacks,
+):
+    published = []
+    monkeypatch.setattr(events.broker, "publish", published.append)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        )
+
+    assert published == [
+        {
+            "action": "campaign.created",
+            "account_id": test_user.pk,
+            "campaign_id": response.data["id"],
+            "payout_id": None,
+        }
+    ]
@@ -0,0 +1,130 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from campaigns.idempotency import fingerprint
+from campaigns.models import Campaign, IdempotencyKey
+
+URL = reverse("campaign-list")
+
+
+def post(client, data, key="retry-1"):
+    return client.post(
+        URL,
+        json.dumps(data),
+        content_type="application/json",
+        HTTP_IDEMPOTENCY_KEY=key,
+    )
+
+
+def claim_in_progress(user, data, key="retry-1", age=timedelta()):
+    request = RequestFactory().post(
+        URL, json.dumps(data), content_type="application/json"
+    )
+    now = timezone.now()
+    return IdempotencyKey.objects.create(
+        account_id=user.pk,
+        key=key,
+        fingerprint=fingerprint(request),
+        created_at=now - age,
+        expires_at=now + timedelta(hours=1),
+    )
+
+
+@pytest.mark.django_db
+class TestIdempotencyKey:
+    def test_retry_replays_the_first_response(
+        self, auth_client, test_user, sample_campaign_data
+    ):
+        first = post(auth_client, sample_campaign_data)
+        retry = post(auth_client, sample_campaign_data)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry["Idempotent-Replayed"] == "true"
+        assert Campaign.objects.filter(account=test_user).count() == 1
+
+    def test_validation_errors_are_replayed_too(
+        self, auth_client, sample_campaign_data
+    ):
+        sample_campaign_data["payouts"] = []
+        first = post(auth_client, sample_campaign_data)
+
+        retry = post(auth_client, sample_campaign_data)
+
+        assert first.status_code == retry.status_code == 400
+        assert retry["Idempotent-Replayed"] == "true"
+
+    def test_rejects_key_reused_for_another_request(
+        self, auth_client, sample_campaign_data
+    ):
+        post(auth_client, sample_campaign_data)
+        sample_campaign_data["title"] = "Another title"
+
+        response = post(auth_client, sample_campaign_data)
+
+        assert response.status_code == 422
+
+    def test_without_key_runs_every_time(self, auth_client, sample_campaign_data):
+        auth_client.post(URL, sample_campaign_data, format="json")
+        response = auth_client.post(URL, sample_campaign_data, format="json")
+
+        assert response.status_code == 400  # Duplicate title
+
+    def test_waits_for_request_in_progress(
+        self, auth_client, test_user, sample_campaign_data, settings
+    ):
+        settings.IDEMPOTENCY_WAIT_SECONDS = 0.1
+        claim_in_progress(test_user, sample_campaign_data)
+
+        response = post(auth_client, sample_campaign_data)
+
+        assert response.status_code == 409
+        assert not Campaign.objects.exists()
+
+    def test_takes_over_abandoned_claim(
+        self, auth_client, test_user, sample_campaign_data, settings
+    ):
+        claim_in_progress(
+            test_user,
+            sample_campaign_data,
+            age=timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS + 1),
+        )
+
+        response = post(auth_client, sample_campaign_data)
+
+        assert response.status_code == 201
+
+    def test_batch_replays_without_passing_key_to_operations(
+        self, auth_client, sample_campaign_data
+    ):
+        batch = {
+            "operations": [
+                {"method": "POST", "path": URL, "body": sample_campaign_data}
+            ]
+        }
+        responses = [
+            auth_client.post(
+                reverse("batch"), batch, format="json", HTTP_IDEMPOTENCY_KEY="b-1"
+            )
+            for _ in range(2)
+        ]
+
+        assert responses[0].json()["results"][0]["status"] == 201
+        assert responses[1].json() == responses[0].json()
+        assert Campaign.objects.count() == 1
+
+    def test_purge_deletes_expired_keys(self, test_user, sample_campaign_data):
+        expired = claim_in_progress(test_user, sample_campaign_data)
+        expired.expires_at = timezone.now() - timedelta(seconds=1)
+        expired.save()
+        kept = claim_in_progress(test_user, sample_campaign_data, key="retry-2")
+
+        call_command("purge_idempotency_keys")
+
+        assert list(IdempotencyKey.objects.all()) == [kept]
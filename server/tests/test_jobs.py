@@ -0,0 +1,157 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from campaigns.models import Campaign, CampaignPayout
+from jobs import queue
+from jobs.models import Job
+from tests.test_deletion import make_campaigns
+
+
+@pytest.fixture
+def handlers():
+    calls = []
+
+    def count_to(job):
+        calls.append(job.attempt)
+        for done in range(1, job.payload["to"] + 1):
+            job.set_progress(done, job.payload["to"])
+        return {"counted": job.payload["to"]}
+
+    def flaky(job):
+        calls.append(job.attempt)
+        raise RuntimeError(f"attempt {job.attempt} failed")
+
+    queue.register("test.count_to")(count_to)
+    queue.register("test.flaky")(flaky)
+    yield calls
+    queue.JOB_HANDLERS.pop("test.count_to")
+    queue.JOB_HANDLERS.pop("test.flaky")
+
+
+def run_due_jobs():
+    statuses = []
+    while jobs := queue.claim():
+        statuses += [queue.run_job(job) for job in jobs]
+    return statuses
+
+
+@pytest.mark.django_db
+class TestQueue:
+    def test_runs_job_and_records_progress(self, handlers):
+        job = queue.enqueue("test.count_to", {"to": 3}, account_id=1)
+
+        assert run_due_jobs() == [Job.SUCCEEDED]
+
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (Job.SUCCEEDED, 1)
+        assert (job.progress, job.total) == (3, 3)
+        assert job.result == {"counted": 3}
+        assert job.locked_by == "" and job.finished_at is not None
+
+    def test_unknown_kind_is_refused(self):
+        with pytest.raises(ValueError):
+            queue.enqueue("test.missing")
+
+    def test_retries_with_backoff_then_fails(self, handlers, settings):
+        settings.JOB_RETRY_DELAY_SECONDS = 60
+        job = queue.enqueue("test.flaky", max_attempts=2)
+
+        assert run_due_jobs() == [Job.QUEUED]
+        job.refresh_from_db()
+        assert job.status == Job.QUEUED and "attempt 1 failed" in job.error
+        assert job.run_after > timezone.now() + timedelta(seconds=50)
+        # Not due again before the retry delay
+        assert queue.claim() == []
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        assert run_due_jobs() == [Job.FAILED]
+        job.refresh_from_db()
+        assert job.status == Job.FAILED and "attempt 2 failed" in job.error
+        assert handlers == [1, 2]
+
+    def test_job_is_claimed_once(self, handlers):
+        queue.enqueue("test.count_to", {"to": 1})
+
+        first = queue.claim(limit=5)
+
+        assert len(first) == 1
+        assert queue.claim(limit=5) == []
+
+    def test_expired_lease_is_claimed_again(self, handlers):
+        job = queue.enqueue("test.count_to", {"to": 2})
+        (stale,) = queue.claim()
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        (reclaimed,) = queue.claim()
+        assert reclaimed.attempts == 2 and reclaimed.locked_by != stale.locked_by
+        assert queue.run_job(reclaimed) == Job.SUCCEEDED
+        # The worker that lost its lease can no longer change the job
+        queue.run_job(stale)
+        job.refresh_from_db()
+        assert (job.status, job.progress, job.attempts) == (Job.SUCCEEDED, 2, 2)
+        assert handlers == [2, 1]
+
+
+@pytest.mark.django_db
+class TestJobApi:
+    def test_status_is_scoped_to_account(self, auth_client, test_user, handlers):
+        mine = queue.enqueue("test.count_to", {"to": 1}, account_id=test_user.pk)
+        theirs = queue.enqueue("test.count_to", {"to": 1}, account_id=test_user.pk + 1)
+
+        response = auth_client.get(reverse("job-detail", args=[mine.pk]))
+
+        assert response.status_code == 200
+        assert response.data["status"] == Job.QUEUED
+        assert response.data["url"].endswith(reverse("job-detail", args=[mine.pk]))
+        assert "payload" not in response.data
+        assert (
+            auth_client.get(reverse("job-detail", args=[theirs.pk])).status_code == 404
+        )
+        listed = auth_client.get(reverse("job-list")).data
+        assert [job["id"] for job in listed] == [mine.pk]
+
+    def test_background_bulk_delete(self, auth_client, test_user):
+        make_campaigns(test_user, 3, is_running=False)
+        kept = make_campaigns(test_user, 1, is_running=True)
+
+        response = auth_client.post(
+            reverse("campaign-bulk-delete") + "?is_running=false",
+            {"background": True},
+            format="json",
+        )
+
+        assert response.status_code == 202
+        assert Campaign.objects.count() == 4
+        assert run_due_jobs() == [Job.SUCCEEDED]
+        job = auth_client.get(response.data["url"]).data
+        assert job["status"] == Job.SUCCEEDED
+        assert (job["progress"], job["total"]) == (3, 3)
+        assert job["result"] == {"deleted": 3, "payouts_deleted": 3}
+        assert list(Campaign.objects.values_list("id", flat=True)) == [kept[0].id]
+        assert CampaignPayout.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_command_runs_due_jobs(handlers, monkeypatch):
+    initialized = []
+    monkeypatch.setattr(
+        "jobs.management.commands.run_jobs.init_integrations",
+        lambda: initialized.append(True),
+    )
+    for to in (1, 2, 3):
+        queue.enqueue("test.count_to", {"to": to})
+    out = StringIO()
+
+    call_command("run_jobs", concurrency=2, burst=True, poll_interval=0.01, stdout=out)
+
+    assert out.getvalue().strip() == "Ran 3 jobs"
+    assert set(Job.objects.values_list("status", flat=True)) == {Job.SUCCEEDED}
+    # The worker reports errors to Sentry like the web app
+    assert initialized == [True]
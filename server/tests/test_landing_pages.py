@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from campaigns import events
+from campaigns.landing_pages import run_checks
+from campaigns.models import AccountShard, Campaign, LandingPageCheck
+
+ETAG = '"v1"'
+
+
+class LandingPageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        self.server.requests[self.command, self.path] += 1
+        if self.path == "/no-head":
+            return self._answer(405)
+        self._answer_page()
+
+    def do_GET(self):
+        self.server.requests[self.command, self.path] += 1
+        self._answer_page()
+
+    def _answer_page(self):
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/missing":
+            return self._answer(404)
+        if self.headers.get("If-None-Match") == ETAG:
+            return self._answer(304, {"ETag": ETAG})
+        self._answer(200, {"ETag": ETAG})
+
+    def _answer(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def landing_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LandingPageHandler)
+    server.requests = Counter()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_campaign(account, title, url, is_running=True):
+    return Campaign.objects.create(
+        account=account, title=title, landing_page_url=url, is_running=is_running
+    )
+
+
+@pytest.mark.django_db
+class TestLandingPageChecks:
+    def test_stores_results_on_running_campaigns(self, test_user, landing_server):
+        ok = make_campaign(test_user, "Ok", f"{landing_server.url}/ok")
+        missing = make_campaign(test_user, "Missing", f"{landing_server.url}/missing")
+        stopped = make_campaign(
+            test_user, "Stopped", f"{landing_server.url}/ok", is_running=False
+        )
+
+        stats = run_checks(["default"])
+
+        assert (stats.urls, stats.broken, stats.campaigns) == (2, 1, 2)
+        for campaign, expected in ((ok, True), (missing, False), (stopped, None)):
+            campaign.refresh_from_db()
+            assert campaign.landing_page_ok is expected
+        assert ok.landing_page_checked_at is not None
+
+    def test_only_changed_results_are_written_and_published(
+        self, test_user, landing_server, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        published = []
+        monkeypatch.setattr(events.broker, "publish", published.append)
+        ok = make_campaign(test_user, "Ok", f"{landing_server.url}/ok")
+        flipped = make_campaign(test_user, "Flipped", f"{landing_server.url}/missing")
+        with django_capture_on_commit_callbacks(execute=True):
+            assert run_checks(["default"]).campaigns == 2
+        Campaign.objects.filter(pk=flipped.pk).update(landing_page_ok=True)
+        LandingPageCheck.objects.update(checked_at=timezone.now() - timedelta(hours=2))
+        ok.refresh_from_db()
+        flipped.refresh_from_db()
+        published.clear()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            stats = run_checks(["default"])
+
+        assert (stats.requested, stats.campaigns) == (2, 1)
+        unchanged_at, flipped_at = ok.updated_at, flipped.updated_at
+        ok.refresh_from_db()
+        flipped.refresh_from_db()
+        assert ok.updated_at == unchanged_at
+        assert flipped.landing_page_ok is False and flipped.updated_at > flipped_at
+        assert [event["campaign_id"] for event in published] == [flipped.pk]
+
+    def test_accounts_being_moved_are_left_alone(self, test_user, landing_server):
+        other_user = get_user_model().objects.create_user(
+            username="o@o.com", password="x"
+        )
+        AccountShard.objects.create(account=test_user, alias="default", moving=True)
+        moving = make_campaign(test_user, "Moving", f"{landing_server.url}/missing")
+        staying = make_campaign(other_user, "Staying", f"{landing_server.url}/missing")
+
+        assert run_checks(["default"]).campaigns == 1
+
+        moving.refresh_from_db()
+        staying.refresh_from_db()
+        assert moving.landing_page_ok is None and staying.landing_page_ok is False
+
+        # Picked up once the move is over
+        AccountShard.objects.update(moving=False)
+        assert run_checks(["default"]).campaigns == 1
+        moving.refresh_from_db()
+        assert moving.landing_page_ok is False
+
+    def test_shared_url_is_requested_once(self, test_user, landing_server):
+        for i in range(5):
+            make_campaign(test_user, f"Shared {i}", f"{landing_server.url}/ok")
+
+        run_checks(["default"])
+
+        assert landing_server.requests == Counter({("HEAD", "/ok"): 1})
+        assert Campaign.objects.filter(landing_page_ok=True).count() == 5
+
+    def test_fresh_results_are_reused(self, test_user, landing_server):
+        make_campaign(test_user, "Ok", f"{landing_server.url}/ok")
+        run_checks(["default"])
+
+        stats = run_checks(["default"])
+
+        assert stats.requested == 0
+        assert sum(landing_server.requests.values()) == 1
+
+    def test_stale_result_is_revalidated_conditionally(self, test_user, landing_server):
+        make_campaign(test_user, "Ok", f"{landing_server.url}/ok")
+        run_checks(["default"])
+        LandingPageCheck.objects.update(checked_at=timezone.now() - timedelta(hours=2))
+
+        stats = run_checks(["default"], max_age=3600)
+
+        assert (stats.requested, stats.not_modified, stats.broken) == (1, 1, 0)
+        check = LandingPageCheck.objects.get()
+        assert check.ok and check.status_code == 304 and check.etag == ETAG
+
+    def test_falls_back_to_get_without_head(self, test_user, landing_server):
+        campaign = make_campaign(test_user, "No head", f"{landing_server.url}/no-head")
+
+        run_checks(["default"])
+
+        campaign.refresh_from_db()
+        assert campaign.landing_page_ok is True
+        assert landing_server.requests[("GET", "/no-head")] == 1
+
+    def test_timeouts_and_unreachable_hosts_are_broken(self, test_user, landing_server):
+        make_campaign(test_user, "Slow", f"{landing_server.url}/slow")
+        make_campaign(test_user, "Down", "http://127.0.0.1:9/")
+
+        stats = run_checks(["default"], timeout=0.1)
+
+        assert stats.broken == 2
+        errors = set(LandingPageCheck.objects.values_list("error", flat=True))
+        assert all(errors) and any("Timeout" in error for error in errors)
+
+    def test_command_reports_and_filter_exposes_results(
+        self, auth_client, test_user, landing_server
+    ):
+        make_campaign(test_user, "Ok", f"{landing_server.url}/ok")
+        make_campaign(test_user, "Missing", f"{landing_server.url}/missing")
+        out = StringIO()
+
+        call_command("check_landing_pages", stdout=out)
+
+        assert "Checked 2 of 2 landing pages" in out.getvalue()
+        response = auth_client.get(
+            reverse("campaign-list"), {"landing_page_ok": "false"}
+        )
+        assert [c["title"] for c in response.data] == ["Missing"]
@@ -0,0 +1,110 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from campaigns.models import Campaign
+from server.pagination import bump_count_version, count_version
+
+URL = reverse("campaign-list")
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_campaigns(account, count, start=0):
+    Campaign.objects.bulk_create(
+        Campaign(
+            account=account,
+            title=f"Campaign {i}",
+            landing_page_url="https://example.com",
+            is_running=i % 2 == 0,
+        )
+        for i in range(start, start + count)
+    )
+
+
+@pytest.mark.django_db
+class TestCampaignPagination:
+    def test_without_page_returns_the_plain_list(self, auth_client, test_user):
+        make_campaigns(test_user, 3)
+
+        response = auth_client.get(URL)
+
+        assert isinstance(response.data, list)
+        assert len(response.data) == 3
+
+    def test_exact_count_below_threshold(self, auth_client, test_user):
+        make_campaigns(test_user, 5)
+
+        response = auth_client.get(
+            URL, {"page": 2, "page_size": 2, "is_running": "true"}
+        )
+
+        assert response.data["count"] == 3
+        assert response.data["count_is_approximate"] is False
+        assert len(response.data["results"]) == 1
+        assert response.data["next"] is None
+
+    def test_flags_estimate_above_threshold(
+        self, auth_client, test_user, settings, monkeypatch
+    ):
+        settings.ESTIMATED_COUNT_THRESHOLD = 3
+        # As the PostgreSQL planner would
+        monkeypatch.setattr("server.pagination.planner_estimate", lambda qs: 40)
+        make_campaigns(test_user, 5)
+
+        response = auth_client.get(URL, {"page_size": 2})
+
+        assert response.data["count"] == 40
+        assert response.data["count_is_approximate"] is True
+        assert len(response.data["results"]) == 2
+
+    def test_full_count_above_threshold_is_exact(
+        self, auth_client, test_user, settings
+    ):
+        settings.ESTIMATED_COUNT_THRESHOLD = 3
+        make_campaigns(test_user, 5)
+
+        # SQLite has no planner estimate: the rows are counted
+        response = auth_client.get(URL, {"page_size": 2})
+
+        assert response.data["count"] == 5
+        assert response.data["count_is_approximate"] is False
+
+    def test_count_is_cached_until_the_account_writes(
+        self,
+        auth_client,
+        test_user,
+        sample_campaign_data,
+        django_capture_on_commit_callbacks,
+    ):
+        make_campaigns(test_user, 2)
+        assert auth_client.get(URL, {"page": 1}).data["count"] == 2
+
+        # Not through the API: the cached count is served
+        make_campaigns(test_user, 1, start=2)
+        assert auth_client.get(URL, {"page": 1}).data["count"] == 2
+        # Other filters are counted separately
+        assert auth_client.get(URL, {"page": 1, "title": "Campaign"}).data["count"] == 3
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.post(URL, sample_campaign_data, format="json")
+        assert auth_client.get(URL, {"page": 1}).data["count"] == 4
+
+
+@pytest.mark.django_db
+def test_bump_survives_a_cache_without_the_key(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bump_count_version("campaigns:1")
+
+    assert count_version("campaigns:1") == 0
@@ -0,0 +1,67 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from campaigns.models import Campaign, CampaignPayout
+from campaigns.views import PAYOUT_BATCH_MAX_CAMPAIGNS
+
+URL = reverse("campaign-payout-list")
+
+
+@pytest.mark.django_db
+class TestPayoutsForCampaigns:
+    def test_groups_payouts_by_campaign(self, auth_client, sample_campaign_instance):
+        empty = Campaign.objects.create(
+            account=sample_campaign_instance.account,
+            title="No payouts",
+            landing_page_url="https://example.com",
+        )
+        ids = f"{empty.id},{sample_campaign_instance.id}"
+
+        response = auth_client.get(URL, {"campaign__in": ids})
+
+        assert response.status_code == 200
+        assert list(response.data) == [str(empty.id), str(sample_campaign_instance.id)]
+        assert response.data[str(empty.id)] == []
+        payouts = response.data[str(sample_campaign_instance.id)]
+        assert {p["display_country"] for p in payouts} == {
+            "United States of America",
+            "Canada",
+        }
+
+    def test_reads_payouts_without_joining_campaigns(
+        self, auth_client, sample_campaign_instance
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            auth_client.get(URL, {"campaign__in": str(sample_campaign_instance.id)})
+
+        payout_table = CampaignPayout._meta.db_table
+        payout_queries = [
+            q["sql"] for q in queries if f'FROM "{payout_table}"' in q["sql"]
+        ]
+        assert len(payout_queries) == 1
+        assert "JOIN" not in payout_queries[0]
+
+    def test_skips_other_accounts_campaigns(
+        self, auth_client, sample_campaign_instance
+    ):
+        other = get_user_model().objects.create_user(username="o@o.com", password="x")
+        theirs = Campaign.objects.create(
+            account=other, title="Theirs", landing_page_url="https://example.com"
+        )
+        CampaignPayout.objects.create(campaign=theirs, amount=1, currency="USD")
+
+        response = auth_client.get(URL, {"campaign__in": str(theirs.id)})
+
+        assert response.data == {}
+
+    @pytest.mark.parametrize(
+        "value",
+        ["1,a", ",".join(str(i) for i in range(PAYOUT_BATCH_MAX_CAMPAIGNS + 1))],
+    )
+    def test_rejects_invalid_or_too_many_ids(self, auth_client, value):
+        response = auth_client.get(URL, {"campaign__in": value})
+
+        assert response.status_code == 400
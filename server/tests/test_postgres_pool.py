@@ -0,0 +1,88 @@
+import socket
+
+import pytest
+from django.db.utils import ConnectionHandler
+
+from server.databases import pool_available, postgres_database, sqlite_database
+
+requires_pool = pytest.mark.skipif(
+    not pool_available(), reason="psycopg 3 with psycopg-pool is not installed"
+)
+
+
+def postgres_reachable(config):
+    """Whether something accepts TCP connections on the configured host."""
+    try:
+        socket.create_connection((config["HOST"], int(config["PORT"])), 1).close()
+    except OSError:
+        return False
+    return True
+
+
+class TestPostgresConfig:
+    @requires_pool
+    def test_pool_options_from_environment(self, monkeypatch):
+        monkeypatch.setenv("POSTGRES_POOL_MIN_SIZE", "2")
+        monkeypatch.setenv("POSTGRES_POOL_MAX_SIZE", "8")
+        monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "2.5")
+
+        config = postgres_database()
+
+        pool = config["OPTIONS"]["pool"]
+        assert (pool["min_size"], pool["max_size"], pool["timeout"]) == (2, 8, 2.5)
+        assert config["CONN_MAX_AGE"] == 0
+        assert config["DISABLE_SERVER_SIDE_CURSORS"] is False
+
+    def test_pool_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("POSTGRES_POOL", "False")
+
+        config = postgres_database()
+
+        assert "pool" not in config["OPTIONS"]
+        assert config["CONN_MAX_AGE"] == 600
+
+    def test_no_persistent_connections_under_asgi(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("POSTGRES_POOL", "False")
+        monkeypatch.setenv("DJANGO_ASGI", "True")
+
+        assert postgres_database()["CONN_MAX_AGE"] == 0
+        assert sqlite_database(tmp_path / "db.sqlite3")["CONN_MAX_AGE"] == 0
+
+
+@requires_pool
+class TestPostgresPool:
+    """Runs against a local Postgres when one is listening, skips otherwise."""
+
+    @pytest.fixture
+    def pooled_connection(self, monkeypatch):
+        monkeypatch.setenv("POSTGRES_POOL_MAX_SIZE", "4")
+        monkeypatch.setenv("POSTGRES_POOL_TIMEOUT", "3")
+        config = postgres_database()
+        if not postgres_reachable(config):
+            pytest.skip("No Postgres server reachable")
+        connection = ConnectionHandler({"pooled": config})["pooled"]
+        yield connection
+        connection.close()
+        connection.close_pool()
+
+    def test_connections_are_reused_from_pool(self, pooled_connection):
+        with pooled_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            first_pid = cursor.fetchone()[0]
+        pooled_connection.close()
+
+        with pooled_connection.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            assert cursor.fetchone()[0] == first_pid
+        assert pooled_connection.pool.get_stats()["pool_max"] == 4
+
+    def test_chunked_cursor_is_server_side(self, pooled_connection):
+        pooled_connection.ensure_connection()
+        cursor = pooled_connection.chunked_cursor()
+        try:
+            assert cursor.cursor.name
+            cursor.execute("SELECT generate_series(1, 5000)")
+            assert len(cursor.fetchmany(1000)) == 1000
+            assert len(cursor.fetchall()) == 4000
+        finally:
+            cursor.close()
@@ -0,0 +1,122 @@
+import pstats
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from server.profiling import ProfilingMiddleware, make_token
+
+CAMPAIGNS = reverse("campaign-list")
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def staff_user(db):
+    return get_user_model().objects.create_user(
+        username="staff", email="staff@test.com", password="Password123!", is_staff=True
+    )
+
+
+@pytest.fixture
+def staff_client(staff_user):
+    client = APIClient()
+    token = RefreshToken.for_user(staff_user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    def test_profiles_request_with_token(
+        self, auth_client, staff_client, staff_user, test_user, profile_dir
+    ):
+        token = staff_client.post(reverse("profile-token")).data["token"]
+
+        response = auth_client.get(CAMPAIGNS, HTTP_X_PROFILE_TOKEN=token)
+
+        assert response.status_code == 200
+        profile_id = response["X-Profile-Id"]
+        [profile] = staff_client.get(reverse("profile-list")).json()
+        assert profile["id"] == profile_id
+        assert profile["path"] == CAMPAIGNS and profile["status"] == 200
+        assert profile["requested_by"] == staff_user.pk
+        assert profile["user"] == test_user.pk
+
+        download = staff_client.get(reverse("profile-detail", args=[profile_id]))
+        path = profile_dir / "downloaded.prof"
+        path.write_bytes(b"".join(download.streaming_content))
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    def test_query_parameter_opts_in(self, auth_client, staff_user):
+        response = auth_client.get(CAMPAIGNS, {"_profile": make_token(staff_user)})
+
+        assert "X-Profile-Id" in response
+
+    def test_requests_without_valid_token_are_not_profiled(
+        self, auth_client, profile_dir
+    ):
+        plain = auth_client.get(CAMPAIGNS)
+        forged = auth_client.get(CAMPAIGNS, HTTP_X_PROFILE_TOKEN="forged:token")
+
+        assert "X-Profile-Id" not in plain and "X-Profile-Id" not in forged
+        assert forged.status_code == 200
+        assert not list(profile_dir.iterdir())
+
+    def test_keeps_only_the_newest_profiles(self, auth_client, staff_user, settings):
+        settings.PROFILE_MAX_FILES = 2
+        token = make_token(staff_user)
+
+        ids = [
+            auth_client.get(CAMPAIGNS, HTTP_X_PROFILE_TOKEN=token)["X-Profile-Id"]
+            for _ in range(3)
+        ]
+
+        staff = APIClient()
+        staff.force_authenticate(staff_user)
+        listed = [p["id"] for p in staff.get(reverse("profile-list")).json()]
+        assert listed == ids[:0:-1]
+
+    def test_profiles_are_staff_only(self, auth_client, staff_client):
+        assert auth_client.post(reverse("profile-token")).status_code == 403
+        assert auth_client.get(reverse("profile-list")).status_code == 403
+        missing = staff_client.get(reverse("profile-detail", args=["not-a-profile"]))
+        assert missing.status_code == 404
+
+    def test_async_requests_are_profiled_with_their_view(
+        self, test_user, staff_user, profile_dir
+    ):
+        access = RefreshToken.for_user(test_user).access_token
+        client = AsyncClient()
+        auth = {"Authorization": f"Bearer {access}"}
+
+        plain = async_to_sync(client.get)(CAMPAIGNS, headers=auth)
+        profiled = async_to_sync(client.get)(
+            CAMPAIGNS, headers={**auth, "X-Profile-Token": make_token(staff_user)}
+        )
+
+        assert plain.status_code == profiled.status_code == 200
+        assert "X-Profile-Id" not in plain
+        stats = pstats.Stats(str(profile_dir / f"{profiled['X-Profile-Id']}.prof"))
+        # The sync view ran inside the profiled thread
+        assert any(
+            filename.endswith("campaigns/views.py") and name == "get_queryset"
+            for filename, _, name in stats.stats
+        )
+
+
+def test_runs_on_the_event_loop_under_asgi():
+    async def get_response(request):
+        pass
+
+    # Django then calls it without a thread hop
+    assert iscoroutinefunction(ProfilingMiddleware(get_response))
+    assert not iscoroutinefunction(ProfilingMiddleware(lambda request: None))
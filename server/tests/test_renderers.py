@@ -0,0 +1,79 @@
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import msgpack
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from server.renderers import ORJSONParser, ORJSONRenderer
+
+
+class TestORJSONRenderer:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"amount": Decimal("100.10"), "raw": Decimal("0.1")},
+            {"at": datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)},
+            {"naive": datetime(2025, 1, 2, 3, 4, 5), "day": date(2025, 1, 2)},
+            {"id": uuid.UUID(int=1), "lazy": gettext_lazy("Worldwide")},
+            {"text": "Suomi ✓    ", "error": ErrorDetail("bad")},
+            ReturnDict({"nested": [{"a": 1, "b": None, "c": True}]}, serializer=None),
+            {1: "integer key", "big": 2**70},
+            [],
+        ],
+    )
+    def test_matches_drf_json_output(self, data):
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_falls_back_to_drf(self):
+        data = {"a": [1, 2]}
+
+        rendered = ORJSONRenderer().render(data, "application/json; indent=2")
+
+        assert rendered == JSONRenderer().render(data, "application/json; indent=2")
+
+    def test_parser_round_trip(self):
+        import io
+
+        body = io.BytesIO(b'{"amount": 1.5, "title": "\\u00e4"}')
+
+        assert ORJSONParser().parse(body) == {"amount": 1.5, "title": "ä"}
+
+
+@pytest.mark.django_db
+class TestContentNegotiation:
+    def test_json_is_the_default(self, auth_client, sample_campaign_instance):
+        response = auth_client.get(reverse("campaign-list"))
+
+        assert response["Content-Type"] == "application/json"
+        assert response.json()[0]["payouts"][0]["amount"] in ("100.00", "90.00")
+
+    def test_msgpack_response_matches_json(self, auth_client, sample_campaign_instance):
+        url = reverse("campaign-list")
+
+        response = auth_client.get(url, HTTP_ACCEPT="application/msgpack")
+
+        assert response["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == auth_client.get(url).json()
+
+    def test_msgpack_request_body(self, auth_client, sample_campaign_data):
+        body = msgpack.packb(sample_campaign_data)
+
+        response = auth_client.post(
+            reverse("campaign-list"), body, content_type="application/msgpack"
+        )
+
+        assert response.status_code == 201
+        assert response.data["title"] == sample_campaign_data["title"]
+
+    def test_invalid_msgpack_is_rejected(self, auth_client):
+        response = auth_client.post(
+            reverse("campaign-list"), b"\xc1", content_type="application/msgpack"
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from campaigns.archive import archivable
+from campaigns.models import Campaign
+from campaigns.scheduling import run_transitions
+
+
+def make_campaign(account, title, **fields):
+    return Campaign.objects.create(
+        account=account, title=title, landing_page_url="https://example.com", **fields
+    )
+
+
+@pytest.mark.django_db
+class TestScheduler:
+    def test_starts_and_stops_due_campaigns(self, test_user):
+        now = timezone.now()
+        starting = make_campaign(test_user, "Starting", start_at=now - timedelta(5))
+        ending = make_campaign(
+            test_user, "Ending", is_running=True, end_at=now - timedelta(seconds=1)
+        )
+        later = make_campaign(
+            test_user,
+            "Later",
+            start_at=now + timedelta(hours=1),
+            end_at=now + timedelta(hours=2),
+        )
+
+        stats = run_transitions("default")
+
+        assert (stats.started, stats.stopped) == (1, 1)
+        assert stats.max_lag >= 5
+        starting.refresh_from_db()
+        assert starting.is_running and starting.start_at is None
+        ending.refresh_from_db()
+        assert not ending.is_running and ending.end_at is None
+        later.refresh_from_db()
+        assert not later.is_running and later.start_at is not None
+
+    def test_drops_start_whose_end_has_passed(self, test_user):
+        now = timezone.now()
+        missed = make_campaign(
+            test_user,
+            "Missed",
+            start_at=now - timedelta(hours=2),
+            end_at=now - timedelta(hours=1),
+        )
+
+        stats = run_transitions("default")
+
+        assert (stats.started, stats.expired) == (0, 1)
+        missed.refresh_from_db()
+        assert not missed.is_running
+        assert missed.start_at is None and missed.end_at is None
+
+    def test_manual_stop_after_scheduled_start_sticks(self, test_user):
+        campaign = make_campaign(
+            test_user, "Manual", start_at=timezone.now() - timedelta(minutes=1)
+        )
+        run_transitions("default")
+        Campaign.objects.filter(pk=campaign.pk).update(is_running=False)
+
+        assert run_transitions("default").transitions == 0
+
+    def test_processes_all_due_campaigns_in_batches(self, test_user):
+        past = timezone.now() - timedelta(minutes=1)
+        for i in range(5):
+            make_campaign(test_user, f"Due {i}", start_at=past)
+
+        stats = run_transitions("default", batch_size=2)
+
+        assert stats.started == 5
+        assert Campaign.objects.filter(is_running=True).count() == 5
+
+    def test_idle_tick_queries_do_not_grow_with_campaigns(self, test_user):
+        future = timezone.now() + timedelta(days=1)
+        Campaign.objects.bulk_create(
+            Campaign(
+                account=test_user,
+                title=f"Waiting {i}",
+                landing_page_url="https://example.com",
+                start_at=future,
+            )
+            for i in range(50)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            run_transitions("default")
+
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        assert len(selects) == 2
+
+    def test_command_reports_transitions(self, test_user):
+        make_campaign(test_user, "Due", start_at=timezone.now() - timedelta(1))
+        out = StringIO()
+
+        call_command("schedule_campaigns", stdout=out)
+
+        assert "started 1, stopped 0" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestScheduleFields:
+    def test_rejects_end_before_start(self, auth_client, sample_campaign_data):
+        sample_campaign_data["start_at"] = "2030-01-02T00:00:00Z"
+        sample_campaign_data["end_at"] = "2030-01-01T00:00:00Z"
+
+        response = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        )
+
+        assert response.status_code == 400
+        assert "end_at" in response.data["error"]
+
+    def test_pending_start_is_not_archived(self, test_user):
+        campaign = make_campaign(
+            test_user, "Next season", start_at=timezone.now() + timedelta(days=200)
+        )
+        Campaign.objects.filter(pk=campaign.pk).update(
+            updated_at=timezone.now() - timedelta(days=120)
+        )
+
+        assert not archivable("default", timezone.now()).exists()
@@ -0,0 +1,135 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+
+from campaigns.models import AccountShard, Campaign, CampaignPayout
+from campaigns.sharding import SHARD_ID_SPACING, Placement, hash_shard, placement_for
+from server.databases import sqlite_database
+
+SHARD_ALIASES = ["shard1", "shard2"]
+
+
+SHARD_SETTINGS = {
+    "DATABASE_SHARDS": ["default", *SHARD_ALIASES],
+    "DATABASE_ROUTERS": ["server.db_routers.ShardRouter"],
+}
+
+
+@pytest.fixture(scope="module")
+def shard_databases(django_db_setup, django_db_blocker, tmp_path_factory):
+    """Two extra SQLite shard databases next to ``default``."""
+    directory = tmp_path_factory.mktemp("shards")
+    with django_db_blocker.unblock(), override_settings(**SHARD_SETTINGS):
+        for alias in SHARD_ALIASES:
+            config = {"default": connections.settings["default"]}
+            config[alias] = sqlite_database(directory / f"{alias}.sqlite3")
+            connections.settings[alias] = connections.configure_settings(config)[alias]
+            # pytest runs with --nomigrations, so tables come from syncdb
+            call_command("migrate", database=alias, run_syncdb=True, verbosity=0)
+    yield
+    for alias in SHARD_ALIASES:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+@pytest.fixture
+def sharded(shard_databases, settings):
+    for name, value in SHARD_SETTINGS.items():
+        setattr(settings, name, value)
+    return settings
+
+
+def place(account, alias):
+    AccountShard.objects.update_or_create(account=account, defaults={"alias": alias})
+
+
+@pytest.mark.django_db(databases=["default", *SHARD_ALIASES])
+class TestSharding:
+    def test_hash_placement_is_stable(self, sharded):
+        placements = {account_id: hash_shard(account_id) for account_id in range(300)}
+
+        assert placements == {i: hash_shard(i) for i in range(300)}
+        assert set(placements.values()) == {"default", *SHARD_ALIASES}
+
+    def test_new_accounts_are_placed(self, sharded, test_user):
+        assert placement_for(test_user.pk).alias == hash_shard(test_user.pk)
+
+    def test_shards_hold_only_campaign_tables(self, sharded):
+        tables = connections["shard1"].introspection.table_names()
+
+        assert Campaign._meta.db_table in tables
+        assert "accounts_account" not in tables
+
+    def test_campaigns_are_stored_on_account_shard(
+        self, sharded, test_user, auth_client, sample_campaign_data
+    ):
+        place(test_user, "shard1")
+
+        response = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        )
+        assert response.status_code == 201
+        assert response.data["id"] > SHARD_ID_SPACING
+        assert not Campaign.objects.using("default").exists()
+        assert CampaignPayout.objects.using("shard1").count() == 2
+
+        response = auth_client.get(reverse("campaign-list"))
+        assert [c["title"] for c in response.data] == [sample_campaign_data["title"]]
+
+    def test_reshard_moves_account_data(
+        self, sharded, test_user, auth_client, sample_campaign_data
+    ):
+        place(test_user, "shard1")
+        created = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        ).data
+
+        call_command(
+            "reshard_account", test_user.pk, "shard2", drain_seconds=0, verbosity=0
+        )
+
+        assert placement_for(test_user.pk).alias == "shard2"
+        assert not Campaign.objects.using("shard1").exists()
+        moved = Campaign.objects.using("shard2").get()
+        assert moved.id == created["id"]
+        assert (
+            moved.created_at.isoformat().replace("+00:00", "Z") == created["created_at"]
+        )
+        response = auth_client.get(reverse("campaign-detail", args=[created["id"]]))
+        assert response.status_code == 200
+        assert len(response.data["payouts"]) == 2
+
+    def test_reshard_refuses_id_conflicts(
+        self, sharded, test_user, auth_client, sample_campaign_data
+    ):
+        place(test_user, "shard1")
+        created = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        ).data
+        Campaign.objects.using("shard2").create(
+            id=created["id"],
+            account_id=test_user.pk + 1,
+            title="Other",
+            landing_page_url="https://example.com",
+        )
+
+        with pytest.raises(CommandError, match="already used"):
+            call_command("reshard_account", test_user.pk, "shard2", drain_seconds=0)
+
+        assert placement_for(test_user.pk) == Placement("shard1", moving=False)
+
+    def test_writes_are_refused_while_moving(
+        self, sharded, test_user, auth_client, sample_campaign_data
+    ):
+        AccountShard.objects.update_or_create(
+            account=test_user, defaults={"alias": "shard1", "moving": True}
+        )
+
+        response = auth_client.post(
+            reverse("campaign-list"), sample_campaign_data, format="json"
+        )
+        assert response.status_code == 503
+        assert auth_client.get(reverse("campaign-list")).status_code == 200
@@ -0,0 +1,113 @@
+import json
+import logging
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+
+from campaigns.streams import make_ticket
+from server import slow_queries
+
+
+class Entries(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+
+    def emit(self, record):
+        self.entries.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture
+def entries(settings):
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    slow_queries._explained.clear()
+    handler = Entries()
+    slow_queries.logger.addHandler(handler)
+    yield handler.entries
+    slow_queries.logger.removeHandler(handler)
+    slow_queries._explained.clear()
+
+
+def test_fingerprint_ignores_literals_and_list_lengths():
+    first = slow_queries.normalize_sql(
+        "SELECT * FROM t WHERE a = 'x'  AND id IN (%s, %s) LIMIT 21"
+    )
+    second = slow_queries.normalize_sql(
+        "SELECT * FROM t WHERE a = 'y' AND id IN (%s, %s, %s) LIMIT 5"
+    )
+
+    assert first == second == "SELECT * FROM t WHERE a = ? AND id IN (...) LIMIT ?"
+
+
+@pytest.mark.django_db
+class TestSlowQueryLog:
+    def test_records_view_call_site_and_plan(self, auth_client, entries):
+        auth_client.get(reverse("campaign-list"))
+
+        campaigns = [e for e in entries if '"campaigns_campaign"' in e["sql"]]
+        assert campaigns and all(e["view"] == "campaign-list" for e in campaigns)
+        assert any("campaigns/views.py" in frame for frame in campaigns[0]["stack"])
+        assert campaigns[0]["plan"]
+        # Explained once per fingerprint unless it gets much slower
+        fingerprints = [e["fingerprint"] for e in entries if e.get("plan")]
+        assert len(fingerprints) == len(set(fingerprints))
+
+    def test_records_queries_of_async_views(self, test_user, entries):
+        ticket = make_ticket(test_user)
+
+        response = async_to_sync(AsyncClient().get)(
+            reverse("campaign-events"), {"ticket": ticket}
+        )
+
+        assert response.status_code == 200
+        users = [e for e in entries if '"accounts_account"' in e["sql"]]
+        assert users and all(e["view"] == "campaign-events" for e in users)
+
+    def test_middleware_runs_on_the_event_loop_under_asgi(self):
+        async def get_response(request):
+            pass
+
+        middleware = slow_queries.SlowQueryViewMiddleware(get_response)
+
+        assert iscoroutinefunction(middleware)
+        assert iscoroutinefunction(middleware.process_view)
+
+    def test_fast_queries_are_not_recorded(self, auth_client, entries, settings):
+        settings.SLOW_QUERY_THRESHOLD_MS = 60_000
+
+        auth_client.get(reverse("campaign-list"))
+
+        assert entries == []
+
+    def test_command_ranks_fingerprints(self, tmp_path):
+        log = tmp_path / "slow.jsonl"
+        lines = [
+            {"fingerprint": "a", "sql": "SELECT a", "duration_ms": 300, "view": "x"},
+            {"fingerprint": "b", "sql": "SELECT b", "duration_ms": 250, "view": "y"},
+            {
+                "fingerprint": "b",
+                "sql": "SELECT b",
+                "duration_ms": 250,
+                "view": "y",
+                "plan": "SCAN b",
+            },
+        ]
+        log.write_text(
+            "".join(
+                json.dumps({"at": "2030-01-01T00:00:00+00:00", **line}) + "\n"
+                for line in lines
+            )
+            + "Could not record a slow query\n"
+        )
+        out = StringIO()
+
+        call_command("slow_queries", file=str(log), stdout=out)
+
+        report = out.getvalue()
+        assert report.startswith("2 slow query fingerprints, 3 entries")
+        assert report.index("#1 b: 2 runs") < report.index("#2 a: 1 runs")
+        assert "SCAN b" in report
@@ -0,0 +1,52 @@
+import importlib
+import sys
+
+import pytest
+
+from server import integrations
+from server.management.commands.startup_profile import parse_importtime
+
+
+class TestStartup:
+    def test_sentry_is_opt_in(self, settings, monkeypatch):
+        settings.SENTRY_DSN = ""
+        monkeypatch.setattr(integrations, "_initialized", False)
+
+        integrations.init_integrations()
+
+        assert integrations.init_sentry() is False
+        assert integrations._initialized is True
+
+    @pytest.mark.parametrize(
+        "entry_point, factory",
+        [
+            ("server.wsgi", "django.core.wsgi.get_wsgi_application"),
+            ("server.asgi", "django.core.asgi.get_asgi_application"),
+        ],
+    )
+    def test_integrations_start_before_the_middleware_loads(
+        self, monkeypatch, entry_point, factory
+    ):
+        calls = []
+        monkeypatch.setattr(
+            "server.integrations.init_integrations", lambda: calls.append("init")
+        )
+        monkeypatch.setattr(factory, lambda: calls.append("application"))
+        monkeypatch.delitem(sys.modules, entry_point, raising=False)
+        # Restored afterwards: server.asgi sets it for the process
+        monkeypatch.setenv("DJANGO_ASGI", "False")
+
+        importlib.import_module(entry_point)
+
+        assert calls == ["init", "application"]
+
+    def test_parse_importtime_sums_self_time(self):
+        stderr = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |   campaigns.models",
+                "import time:        30 |        150 | campaigns",
+                "INFO unrelated log line",
+            ]
+        )
+        assert parse_importtime(stderr) == {"campaigns.models": 120, "campaigns": 30}
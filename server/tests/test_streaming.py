@@ -0,0 +1,111 @@
+import asyncio
+import json
+from urllib.parse import urlencode
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.asgi import get_asgi_application
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from campaigns import views
+from campaigns.models import Campaign
+
+
+def asgi_get(user, path, params=None, log=None):
+    """GET ``path`` through the ASGI app; returns the status and body parts."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(params or {}).encode(),
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (
+                b"authorization",
+                f"Bearer {RefreshToken.for_user(user).access_token}".encode(),
+            ),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)  # The client never disconnects
+
+    async def send(message):
+        messages.append(message)
+        if log is not None and message.get("body"):
+            log.append("sent")
+
+    async_to_sync(get_asgi_application())(scope, receive, send)
+    return messages[0]["status"], [m["body"] for m in messages[1:] if m.get("body")]
+
+
+def make_campaigns(account, number):
+    Campaign.objects.bulk_create(
+        Campaign(
+            account=account,
+            title=f"Streamed {i}",
+            landing_page_url="https://example.com",
+        )
+        for i in range(number)
+    )
+
+
+# Committed rows: the ASGI app queries on its own thread and connection
+@pytest.mark.django_db(transaction=True)
+class TestStreamingUnderAsgi:
+    def test_export_is_sent_while_rows_are_read(self, test_user, monkeypatch):
+        make_campaigns(test_user, 6)
+        monkeypatch.setattr("server.streaming.ASYNC_STREAM_BATCH", 2)
+        log = []
+        export_rows = views.campaign_export_rows
+
+        def logged_rows(queryset):
+            for row in export_rows(queryset):
+                log.append("row")
+                yield row
+
+        monkeypatch.setattr(views, "campaign_export_rows", logged_rows)
+
+        status, parts = asgi_get(test_user, reverse("campaign-export"), log=log)
+
+        assert status == 200
+        lines = b"".join(parts).decode().splitlines()
+        assert lines[0].startswith("id,title") and len(lines) == 7
+        # Not buffered: the first lines go out before the last row is read
+        assert log.index("sent") < len(log) - 1 - log[::-1].index("row")
+
+    def test_list_is_sent_a_chunk_at_a_time(self, test_user, auth_client, monkeypatch):
+        make_campaigns(test_user, 5)
+        monkeypatch.setattr("campaigns.exports.STREAM_CHUNK_SIZE", 2)
+        log = []
+        stream_json_list = views.stream_json_list
+
+        def logged_chunks(queryset, serializer_class):
+            for part in stream_json_list(queryset, serializer_class):
+                log.append("chunk")
+                yield part
+
+        monkeypatch.setattr(views, "stream_json_list", logged_chunks)
+        url = reverse("campaign-list")
+
+        status, parts = asgi_get(test_user, url, {"stream": "true"}, log=log)
+
+        assert status == 200
+        assert json.loads(b"".join(parts)) == auth_client.get(url).json()
+        # "[", three chunks of campaigns and "]", each sent once rendered
+        assert log[:4] == ["chunk", "sent", "chunk", "sent"]
+        assert log.count("sent") == 5
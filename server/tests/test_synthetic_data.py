@@ -0,0 +1,47 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+from campaigns.models import Campaign, CampaignPayout
+
+
+@pytest.mark.django_db
+class TestGenerateCampaignData:
+    def test_generates_consistent_data(self):
+        call_command(
+            "generate_campaign_data",
+            accounts=5,
+            campaigns=400,
+            worldwide_ratio=0.3,
+            title_collision_ratio=0.8,
+            batch_size=100,
+            seed=7,
+        )
+
+        assert Campaign.objects.count() == 400
+        assert CampaignPayout.objects.count() >= 400
+
+        # Titles may repeat across accounts, never within one
+        duplicates = (
+            Campaign.objects.values("account", lowered=Lower("title"))
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+        )
+        assert not duplicates.exists()
+
+        # A campaign pays either worldwide or per country, never both
+        mixed = (
+            Campaign.objects.filter(payouts__country__isnull=True)
+            .filter(payouts__country__isnull=False)
+            .distinct()
+        )
+        assert not mixed.exists()
+
+        # Ids were assigned explicitly; new rows must still get fresh ones
+        campaign = Campaign.objects.create(
+            account=Campaign.objects.first().account,
+            title="Created after generation",
+            landing_page_url="https://example.com",
+        )
+        assert campaign.pk > 400